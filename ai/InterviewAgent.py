@@ -6,28 +6,21 @@ import os
 import uuid
 import json
 import sys
+import asyncio
+import weakref
+import functools
+
+from prompts import STATIC_SYSTEM_PROMPT, build_turn_context
+from session_models import InterviewSession, Role
+from session_store import InMemorySessionStore
+from context_window import ContextWindow, LLMSummarizer, render_messages
+from question_bank import QuestionBank, level_for
+from answer_filter import AnswerFilter
+import providers
 
 def check_dependencies():
-    """Check if required packages are installed"""
-    missing_packages = []
-    
-    try:
-        from dotenv import load_dotenv
-        print("✓ python-dotenv found")
-    except ImportError:
-        missing_packages.append("python-dotenv")
-    
-    try:
-        from langchain_groq import ChatGroq
-        print("✓ langchain-groq found")
-    except ImportError:
-        missing_packages.append("langchain-groq")
-    
-    try:
-        from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
-        print("✓ langchain-core found")
-    except ImportError:
-        missing_packages.append("langchain-core")
+    """Check if required packages are installed (located only; imported when first used)"""
+    missing_packages = providers.missing_packages()
     
     if missing_packages:
         print(f"\n❌ Missing packages: {', '.join(missing_packages)}")
@@ -57,50 +50,109 @@ def load_environment():
         print(f"❌ Error loading environment: {e}")
         return False
 
+@functools.lru_cache(maxsize=1)
+def _static_system_message():
+    """SystemMessage holding the shared prompt prefix, built once per process"""
+    from langchain_core.messages import SystemMessage
+    return SystemMessage(content=STATIC_SYSTEM_PROMPT)
+
+
 class TechInterviewer:
-    def __init__(self):
-        self.sessions = {}
+    def __init__(self, llm=None, session_store=None, transcript_log=None, context_window=None, metrics=None,
+                 response_cache=None, question_bank=None, incremental_evaluator=None, answer_filter=None):
+        # Bounded LRU/TTL store by default. To spill idle sessions to disk pass e.g.
+        # InMemorySessionStore(spill_store=SQLiteSessionStore(dumps=InterviewSession.dumps,
+        #                                                      loads=InterviewSession.loads))
+        self.sessions = session_store if session_store is not None else InMemorySessionStore()
         self.max_questions = 5
-        self.llm = None
-        
-        # Initialize LLM with error handling
-        try:
-            from langchain_groq import ChatGroq
-            self.llm = ChatGroq(
-                model="moonshotai/kimi-k2-instruct",
-                temperature=0.3,
-                max_retries=2
-            )
-            print("✓ LLM initialized successfully")
-        except Exception as e:
-            print(f"❌ Error initializing LLM: {e}")
-            raise
+        # Optional TranscriptLogWriter: every turn is appended to interviews/{session_id}.jsonl
+        self.transcripts = transcript_log
+        # One asyncio.Lock per live session; entries disappear once no turn holds them
+        self._session_locks = weakref.WeakValueDictionary()
+
+        # The LLM, context window and metrics are built on first use, so the opening
+        # question (which needs no LLM call) is served without importing a provider
+        self._llm = llm
+        self._context_window = context_window
+        self._metrics = metrics
+
+        # Greetings, "I don't know", gibberish and off-topic replies get a templated reply
+        # instead of an LLM call (answer_filter.py); pass answer_filter=False to disable
+        self.answer_filter = AnswerFilter() if answer_filter is None else answer_filter or None
+        if metrics is not None:
+            self._register_answer_filter()
+
+        # Pre-generated questions for the opening turn and for when generation fails
+        # (defaults to the shared bank at QUESTION_BANK_PATH; empty if it was never built)
+        self.question_bank = question_bank if question_bank is not None else QuestionBank.shared()
+
+        # Optional response_cache.SemanticResponseCache in front of next-question generation
+        self.response_cache = response_cache
+        if response_cache is not None:
+            self.metrics.add_collector("response_cache", response_cache.metric_samples)
+
+        # Optional incremental_evaluation.IncrementalEvaluator: every answer is scored in the
+        # background, so the evaluation is ready shortly after the last one
+        self.incremental_evaluator = incremental_evaluator
+        if incremental_evaluator is not None:
+            self.metrics.add_collector("incremental_evaluation", incremental_evaluator.metric_samples)
+
+    @property
+    def llm(self):
+        # Defaults to the process-wide model for the provider, which shares one HTTP connection pool
+        if self._llm is None:
+            # Initialize LLM with error handling
+            try:
+                from llm_clients import get_default_llm
+                self._llm = get_default_llm()
+                print("✓ LLM initialized successfully")
+            except Exception as e:
+                print(f"❌ Error initializing LLM: {e}")
+                raise
+        return self._llm
+
+    @property
+    def context_window(self):
+        # Recent turns verbatim within a token budget, older ones folded into a running summary
+        if self._context_window is None:
+            self._context_window = ContextWindow(summarizer=LLMSummarizer(self.llm, metrics=self.metrics))
+        return self._context_window
+
+    @property
+    def metrics(self):
+        # Latency/token/retry/fallback metrics for every LLM call (see llm_metrics.py)
+        if self._metrics is None:
+            from llm_metrics import metrics
+            self._metrics = metrics
+            self._register_answer_filter()
+        return self._metrics
+
+    def _register_answer_filter(self):
+        # Registered with the metrics object rather than at start-up, which would import llm_metrics
+        if self.answer_filter is not None:
+            self._metrics.add_collector("answer_filter", self.answer_filter.metric_samples)
 
     def start_interview(self, tech_stack="Python, JavaScript, React", position="Software Developer"):
         """Start a new interview session"""
         try:
             session_id = uuid.uuid4().hex[:8]
             
-            self.sessions[session_id] = {
-                "tech_stack": tech_stack,
-                "position": position,
-                "question_count": 0,
-                "difficulty": "beginner",
-                "conversation_history": [],
-                "is_complete": False
-            }
+            session = InterviewSession(tech_stack=tech_stack, position=position)
             
-            first_tech = tech_stack.split(',')[0].strip()
+            first_tech = session.primary_technology
+            opening = self.question_bank.pick(session_id, session.technologies[:1], kind="opening") or (
+                f"Can you explain what {first_tech} is and describe one project where you've used it effectively?"
+            )
             initial_message = f"""Hello! I'm your AI interviewer for today's {position} interview.
 
 I see your tech stack includes: {tech_stack}
 
-Let's start with something fundamental. Can you explain what {first_tech} is and describe one project where you've used it effectively?"""
+Let's start with something fundamental. {opening}"""
 
-            self.sessions[session_id]["conversation_history"].append({
-                "role": "interviewer", 
-                "content": initial_message
-            })
+            session.add_turn(Role.interviewer, initial_message)
+            self.sessions[session_id] = session
+            if self.transcripts is not None:
+                self.transcripts.start_session(session_id, session)
             
             return session_id, initial_message
             
@@ -108,270 +160,359 @@ Let's start with something fundamental. Can you explain what {first_tech} is and
             print(f"❌ Error starting interview: {e}")
             return None, f"Error: {e}"
 
+    async def astart_interview(self, tech_stack="Python, JavaScript, React", position="Software Developer"):
+        """Async counterpart of start_interview; the opening question needs no LLM call"""
+        return self.start_interview(tech_stack, position)
+
     def process_answer(self, session_id, answer):
         """Process candidate answer and generate next question"""
         try:
-            if session_id not in self.sessions:
-                return "❌ Session not found! Please start a new interview."
-            
-            session = self.sessions[session_id]
-            
-            if session["is_complete"]:
-                return "✅ Interview already completed! Type 'summary' for recap."
-            
-            # Validate answer
-            if not answer or len(answer.strip()) < 3:
-                return "🤔 I'd like to hear more from you. Please share your thoughts or ask for clarification if needed."
-            
-            # Add candidate's answer to history
-            session["conversation_history"].append({
-                "role": "candidate", 
-                "content": answer
-            })
-            
-            # Increment question count
-            session["question_count"] += 1
-            
-            # Check if interview should end
-            if session["question_count"] >= self.max_questions:
-                session["is_complete"] = True
-                return self._generate_completion_message(session_id)
+            early_reply = self._record_answer(session_id, answer)
+            if early_reply is not None:
+                return early_reply
             
             # Generate next question using simple prompting
             next_question = self._generate_next_question(session_id)
-            
-            session["conversation_history"].append({
-                "role": "interviewer", 
-                "content": next_question
-            })
-            
-            return next_question
+            return self._record_question(session_id, next_question)
             
         except Exception as e:
             print(f"❌ Error processing answer: {e}")
             return f"Error processing your answer: {e}"
 
-    def _generate_next_question(self, session_id):
-        """Generate the next interview question"""
+    async def aprocess_answer(self, session_id, answer):
+        """Async version of process_answer; turns of the same session are serialized"""
         try:
-            session = self.sessions[session_id]
-            
-            # Create conversation context
-            recent_conversation = ""
-            for msg in session["conversation_history"][-4:]:
-                recent_conversation += f"{msg['role'].title()}: {msg['content']}\n\n"
-            
-            # Create system prompt
-            system_content = f"""You are a technical interviewer for a {session['position']} role.
-
-            INTERVIEW CONTEXT:
-            - Tech Stack: {session['tech_stack']}
-            - Question Number: {session['question_count'] + 1} of {self.max_questions}
-            - Current Level: {session['difficulty']}
-
-            RECENT CONVERSATION:
-            {recent_conversation}
-
-            Your role as an interviewer:  
-            1. Ask ONE question at a time and wait for candidates response
-            2. Start with Basics and graudally increase difficulty
-            3. Ask follow-up questions based on candidates previous response
-            4. Probe deeper when answerd are imcomplete or need more clarification
-            5. Cover both theorotical knowledge or practicle implementation,
-            6. Ask about real world probllem scenarios and their probable solutions
-            7. Be encouraging through your questionning
-            8. Keep track of covered topics and explore uncovered topics
-
-
-            TASK: Generate the next interview question based on:
-            1. The candidate's previous response
-            2. Their demonstrated skill level
-            3. The tech stack focus areas
-
-            GUIDELINES:
-            - Ask ONE clear, specific question
-            - Adapt questions based on demonstrated knowledge level
-            - When candidate says "I don't know", offer hints or redirect to related simpler topics
-            - Keep questions focused and specific
-            - Maintain an empathetic, professional, and encouraging tone
-            - Always reference their previous response to show you're listening
-
-
-             Example One : 
-
-            [System]
-            Since you have experience with Next.js, Node.js, and PostgreSQL, let’s start with something simple —  
-            Can you explain how Next.js handles server-side rendering (SSR) and how it differs from static site generation (SSG)?
-
-            [Candidate]
-            SSR renders the page on each request at runtime, SSG builds it at build time...
-
-            [System]
-            That’s correct. In SSR, rendering happens per request, while SSG pre-builds pages.  
-            Follow-up: If your SSR endpoint has heavy data fetching, how would you optimize the response time?
-
-            [Candidate]
-            I’d use caching, like Redis...
-
-            [System]
-            Good. Now moving deeper — Suppose you have a high-traffic app with a PostgreSQL database. You notice slow queries.  
-            Walk me through a practical approach to identify and fix the issue.
-
-            [Candidate]
-            I’d start with EXPLAIN ANALYZE...
-
-            [System]
-            Great. Since you’ve shown strong fundamentals, let’s get more advanced:  
-            If your Next.js app needed real-time data updates from PostgreSQL, how would you implement it efficiently?
-
-
-            
-            
-            
-            Example Two:
-
-            [System]
-            Welcome! Let’s start with the basics:  
-            In Node.js, what’s the difference between synchronous and asynchronous operations?
-
-            [Candidate]
-            Async is non-blocking, sync is blocking...
-
-            [System]
-            That’s right. Can you give me an example in code where asynchronous processing would be essential?
-
-            [Candidate]
-            Maybe file reading...
-
-            [System]
-            Good. Let’s move forward — In MongoDB, how would you design a schema for storing user posts and comments?
-
-            [Candidate]
-            I’d use embedded documents for comments...
-
-            [System]
-            That’s a reasonable choice. Why embedded instead of referencing?
-
-            [Candidate]
-            Hmm... I’m not sure.
-
-            [System]
-            That’s okay. Embedding reduces the need for joins, but can increase document size.  
-            Now, suppose you need to fetch posts along with comments but also filter by recent comments. How would you query that in MongoDB?
-
-
-            
-            
-            Example Three:
-
-            [System]
-            Hi, let’s start easy:  
-            What is the difference between a class component and a functional component in React?
-
-            [Candidate]
-            I don’t know...
-
-            [System]
-            No problem — Class components are older, use `this.state`, while functional ones use hooks like `useState`.  
-            Can you tell me what a React hook is?
-
-            [Candidate]
-            Is it like a function?
-
-            [System]
-            Yes, it’s a special function to manage state or lifecycle in functional components.  
-            Here’s an example: `useEffect` runs code after rendering.  
-            Now, can you give me a case where `useEffect` might be used?
-
-            
-            
-            
-            Example Four :
-
-            [System]
-            How would you configure a Kubernetes deployment to auto-scale based on CPU usage?
-
-            [Candidate]
-            I don’t know.
-
-            [System]
-            Alright, here’s a hint — Kubernetes has something called HPA. Do you know what HPA stands for?
-
-            [Candidate]
-            No.
-
-            [System]
-            It’s Horizontal Pod Autoscaler. It automatically adjusts pod count based on CPU/memory usage.  
-            Let’s try something simpler: Can you tell me what a Kubernetes pod is?
-
-            
+            async with self._session_lock(session_id):
+                early_reply = self._record_answer(session_id, answer)
+                if early_reply is not None:
+                    return early_reply
+                
+                next_question = await self._agenerate_next_question(session_id)
+                return self._record_question(session_id, next_question)
             
-            Example Five:
-
-            [System]
-            Can you explain how Spark processes data across a cluster?
-
-            [Candidate]
-            It splits data and processes it in parallel.
-
-            [System]
-            That’s a good start — Can you walk me through what happens after Spark splits the data? For example, how does it track progress or handle failures?
-
-            [Candidate]
-            Not sure.
+        except Exception as e:
+            print(f"❌ Error processing answer: {e}")
+            return f"Error processing your answer: {e}"
 
-            [System]
-            No worries — Spark uses DAG scheduling, keeps track of transformations, and can recompute lost partitions from lineage.  
-            Now, if one node fails mid-job, what happens?
+    def process_answer_stream(self, session_id, answer):
+        """Process candidate answer and yield the next question as it is generated.
 
+        The full question is appended to the conversation history once the
+        stream is exhausted.
+        """
+        try:
+            early_reply = self._record_answer(session_id, answer)
+            if early_reply is not None:
+                yield early_reply
+                return
 
+            session = self.sessions[session_id]
+            key, context, cached = self._cached_question(session)
+            if cached is not None:
+                yield cached
+                self._record_question(session_id, cached)
+                return
+
+            parts = []
+            messages = self._build_question_messages(session_id, session)
+            with self.metrics.track("next_question", session_id) as call:
+                config = {"callbacks": [call]}
+                try:
+                    for chunk in self.llm.stream(messages, config=config):
+                        text = self._stream_text(chunk, parts)
+                        if text:
+                            parts.append(text)
+                            yield text
+                except Exception as e:
+                    print(f"\n❌ Error generating question: {e}")
+                    if not parts:
+                        call.fallback = True
+                        parts.append(self._fallback_question(session_id, session))
+                        yield parts[0]
 
-            -----------------------------------------------------------------------
+            question = "".join(parts).strip()
+            if not call.fallback and not call.failed:
+                self._cache_question(key, context, question)
+            self._record_question(session_id, question)
 
+        except Exception as e:
+            print(f"❌ Error processing answer: {e}")
+            yield f"Error processing your answer: {e}"
 
-            Current interview session : Focus on {session['tech_stack']} technologies
-            Interview Style : Professional, emphathatic, encouraging and thorough  
+    async def aprocess_answer_stream(self, session_id, answer):
+        """Async version of process_answer_stream"""
+        try:
+            async with self._session_lock(session_id):
+                early_reply = self._record_answer(session_id, answer)
+                if early_reply is not None:
+                    yield early_reply
+                    return
+
+                session = self.sessions[session_id]
+                key, context, cached = self._cached_question(session)
+                if cached is not None:
+                    yield cached
+                    self._record_question(session_id, cached)
+                    return
+
+                parts = []
+                messages = await self._abuild_question_messages(session_id, session)
+                with self.metrics.track("next_question", session_id) as call:
+                    config = {"callbacks": [call]}
+                    try:
+                        async for chunk in self.llm.astream(messages, config=config):
+                            text = self._stream_text(chunk, parts)
+                            if text:
+                                parts.append(text)
+                                yield text
+                    except Exception as e:
+                        print(f"\n❌ Error generating question: {e}")
+                        if not parts:
+                            call.fallback = True
+                            parts.append(self._fallback_question(session_id, session))
+                            yield parts[0]
+
+                question = "".join(parts).strip()
+                if not call.fallback and not call.failed:
+                    self._cache_question(key, context, question)
+                self._record_question(session_id, question)
 
-            Remember : You are evaluating technical competency, problem solving skilss and in depth understaning of chosen tech stack.
+        except Exception as e:
+            print(f"❌ Error processing answer: {e}")
+            yield f"Error processing your answer: {e}"
+
+    @staticmethod
+    def _stream_text(chunk, parts):
+        """Text of a streamed chunk, dropping leading whitespace before the first token"""
+        text = chunk.content
+        if not isinstance(text, str):
+            return ""
+        return text if parts else text.lstrip()
+
+    def _session_lock(self, session_id):
+        """Get (or create) the asyncio lock guarding a session"""
+        lock = self._session_locks.get(session_id)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._session_locks[session_id] = lock
+        return lock
+
+    def _record_answer(self, session_id, answer):
+        """Validate and store the candidate's answer.
+
+        Returns a reply to send straight back to the candidate, or None when
+        the next question has to be generated.
+        """
+        if session_id not in self.sessions:
+            return "❌ Session not found! Please start a new interview."
+        
+        session = self.sessions[session_id]
+        
+        if session.is_complete:
+            return "✅ Interview already completed! Type 'summary' for recap."
+        
+        # Validate answer
+        if not answer or len(answer.strip()) < 3:
+            return "🤔 I'd like to hear more from you. Please share your thoughts or ask for clarification if needed."
+        
+        # Non-answers are redirected locally; the question stays open
+        if self.answer_filter is not None:
+            question = session.open_question()
+            verdict = self.answer_filter.check(answer, question, session.tech_stack, session_id)
+            if verdict is not None:
+                return self._record_filtered(session_id, session, answer, question, verdict)
+        
+        # Add candidate's answer to history
+        session.add_turn(Role.candidate, answer)
+        
+        # Increment question count
+        session.question_count += 1
+        
+        # Check if interview should end
+        if session.question_count >= self.max_questions:
+            session.is_complete = True
+        
+        self.sessions[session_id] = session
+        if self.transcripts is not None:
+            self.transcripts.append_turn(session_id, Role.candidate, answer, session)
+        if self.incremental_evaluator is not None:
+            self._evaluate_turn(session_id, session, answer)
+        
+        if session.is_complete:
+            self.question_bank.forget(session_id)
+            return self._generate_completion_message(session_id)
+        
+        return None
+
+    def _record_filtered(self, session_id, session, answer, question, verdict):
+        """Keep a filtered non-answer and the local reply in the transcript; question_count does not move"""
+        session.add_turn(Role.candidate, answer, filtered=True)
+        session.add_turn(Role.interviewer, verdict.reply, filtered=True)
+        self.sessions[session_id] = session
+        if self.transcripts is not None:
+            self.transcripts.append_turn(session_id, Role.candidate, answer, filtered=True)
+            self.transcripts.append_turn(session_id, Role.interviewer, verdict.reply, filtered=True)
+        # An honest "I don't know" says something about the question; small talk does not
+        if self.incremental_evaluator is not None and verdict.category == "dont_know":
+            self.incremental_evaluator.submit(session_id, question, answer, session.position, session.tech_stack)
+        return verdict.reply
+
+    def _evaluate_turn(self, session_id, session, answer):
+        """Hand the answered question to the incremental evaluator (and finish it after the last answer)"""
+        question = session.open_question()
+        self.incremental_evaluator.submit(session_id, question, answer, session.position, session.tech_stack)
+        if session.is_complete:
+            self.incremental_evaluator.finish(session_id, session.to_dict())
+
+    def evaluation(self, session_id, timeout=None):
+        """EvaluationWorkFlowState of a completed interview (needs an incremental_evaluator)"""
+        if self.incremental_evaluator is None:
+            raise RuntimeError("TechInterviewer was created without an incremental_evaluator")
+        return self.incremental_evaluator.result(session_id, timeout)
+
+    def _record_question(self, session_id, next_question):
+        """Append the interviewer's next question to the session history"""
+        session = self.sessions[session_id]
+        session.add_turn(Role.interviewer, next_question)
+        self.sessions[session_id] = session
+        if self.transcripts is not None:
+            self.transcripts.append_turn(session_id, Role.interviewer, next_question)
+        return next_question
 
-            Generate only the next question, nothing else."""
+    def _generate_next_question(self, session_id):
+        """Generate the next interview question"""
+        session = self.sessions[session_id]
+        key, context, cached = self._cached_question(session)
+        if cached is not None:
+            return cached
+
+        messages = self._build_question_messages(session_id, session)
+        with self.metrics.track("next_question", session_id) as call:
+            config = {"callbacks": [call]}
+            try:
+                response = self.llm.invoke(messages, config=config)
+                question = response.content.strip()
+                self._cache_question(key, context, question)
+                return question
+                
+            except Exception as e:
+                print(f"❌ Error generating question: {e}")
+                call.fallback = True
+                return self._fallback_question(session_id, session)
 
-            from langchain_core.messages import SystemMessage, HumanMessage
-            
-            messages = [
-                SystemMessage(content=system_content),
-                HumanMessage(content="Generate the next interview question.")
-            ]
-            
-            response = self.llm.invoke(messages)
-            return response.content.strip()
-            
-        except Exception as e:
-            print(f"❌ Error generating question: {e}")
-            # Fallback questions based on progress
-            fallback_questions = [
-                f"Can you explain a key concept in {session['tech_stack'].split(',')[0].strip()}?",
-                "How would you approach debugging a performance issue?",
-                "Describe a challenging problem you solved recently.",
-                "What best practices do you follow in your development process?",
-                "How do you stay updated with new technologies?"
-            ]
-            return fallback_questions[min(session["question_count"], len(fallback_questions)-1)]
+    async def _agenerate_next_question(self, session_id):
+        """Generate the next interview question without blocking the event loop"""
+        session = self.sessions[session_id]
+        key, context, cached = self._cached_question(session)
+        if cached is not None:
+            return cached
+
+        messages = await self._abuild_question_messages(session_id, session)
+        with self.metrics.track("next_question", session_id) as call:
+            config = {"callbacks": [call]}
+            try:
+                response = await self.llm.ainvoke(messages, config=config)
+                question = response.content.strip()
+                self._cache_question(key, context, question)
+                return question
+                
+            except Exception as e:
+                print(f"❌ Error generating question: {e}")
+                call.fallback = True
+                return self._fallback_question(session_id, session)
+
+    def _cached_question(self, session):
+        """(cache key, lookup texts, cached question or None); all None without a response cache"""
+        if self.response_cache is None:
+            return None, None, None
+        key = self.response_cache.make_key(
+            session.position, session.tech_stack, session.difficulty, session.question_count
+        )
+        # The last question and the answer to it decide what comes next
+        context = (session.open_question(), session.conversation_history[-1].content)
+        return key, context, self.response_cache.lookup(key, context)
+
+    def _cache_question(self, key, context, question):
+        if key is not None and question:
+            self.response_cache.store(key, context, question)
+
+    def _build_question_messages(self, session_id, session):
+        """
+        Build the chat messages asking the LLM for the next question. Called
+        before the next_question call is tracked: a summary update is its own
+        "summarize" call.
+        """
+        summary, recent = self.context_window.fit(session_id, session.conversation_history,
+                                                  {"metadata": {"session_id": session_id}})
+        return self._question_messages(session, summary, recent)
+
+    async def _abuild_question_messages(self, session_id, session):
+        """Async version of _build_question_messages (summary updates don't block the loop)"""
+        summary, recent = await self.context_window.afit(session_id, session.conversation_history,
+                                                         {"metadata": {"session_id": session_id}})
+        return self._question_messages(session, summary, recent)
+
+    def _question_messages(self, session, summary, recent):
+        from langchain_core.messages import HumanMessage
+        
+        # Static few-shot prefix first, per-turn context last
+        turn_context = build_turn_context(
+            position=session.position,
+            tech_stack=session.tech_stack,
+            question_number=session.question_count + 1,
+            max_questions=self.max_questions,
+            difficulty=session.difficulty,
+            recent_conversation=render_messages(recent),
+            conversation_summary=summary,
+        )
+        return [_static_system_message(), HumanMessage(content=turn_context)]
+
+    def _fallback_question(self, session_id, session):
+        """Question served when the LLM call fails: from the question bank, else a static one"""
+        question = self.question_bank.pick(
+            session_id,
+            session.technologies,
+            level_for(session.difficulty, session.question_count, self.max_questions),
+            rotation=session.question_count,
+        )
+        if question is not None:
+            return question
+
+        # Fallback questions based on progress
+        fallback_questions = [
+            f"Can you explain a key concept in {session.primary_technology}?",
+            "How would you approach debugging a performance issue?",
+            "Describe a challenging problem you solved recently.",
+            "What best practices do you follow in your development process?",
+            "How do you stay updated with new technologies?"
+        ]
+        return fallback_questions[min(session.question_count, len(fallback_questions)-1)]
 
     def _generate_completion_message(self, session_id):
         """Generate interview completion message"""
         session = self.sessions[session_id]
         return f"""🏁 **Interview Complete!**
 
-Thank you for participating in this {session['position']} interview!
+Thank you for participating in this {session.position} interview!
 
 📊 **Session Summary:**
-- Questions Answered: {session['question_count']}/{self.max_questions}
-- Tech Stack Covered: {session['tech_stack']}
-- Final Difficulty: {session['difficulty'].title()}
+- Questions Answered: {session.question_count}/{self.max_questions}
+- Tech Stack Covered: {session.tech_stack}
+- Final Difficulty: {session.difficulty.title()}
 
 Type 'summary' for detailed conversation history."""
 
+    def save_transcript(self, session_id):
+        """Write interviews/{session_id}.json; compacts the turn log when one is kept"""
+        if self.transcripts is not None:
+            return self.transcripts.export(session_id)
+        
+        os.makedirs("interviews", exist_ok=True)
+        filename = f"interviews/{session_id}.json"
+        with open(filename, 'w') as f:
+            json.dump(self.sessions[session_id].to_dict(), f, indent=2)
+        return filename
+
     def get_summary(self, session_id):
         """Get detailed session summary"""
         if session_id not in self.sessions:
@@ -384,18 +525,18 @@ Type 'summary' for detailed conversation history."""
 ═══════════════════════════════════════════════════════════════════
 
 🆔 Session ID: {session_id}
-📋 Position: {session['position']}
-🛠️  Tech Stack: {session['tech_stack']}
-❓ Questions: {session['question_count']}/{self.max_questions}
-📈 Difficulty: {session['difficulty'].title()}
-✅ Status: {'Complete' if session['is_complete'] else 'In Progress'}
+📋 Position: {session.position}
+🛠️  Tech Stack: {session.tech_stack}
+❓ Questions: {session.question_count}/{self.max_questions}
+📈 Difficulty: {session.difficulty.title()}
+✅ Status: {'Complete' if session.is_complete else 'In Progress'}
 
 📝 **FULL CONVERSATION:**
 """
         
-        for i, msg in enumerate(session["conversation_history"], 1):
-            role_emoji = "🎤" if msg["role"] == "interviewer" else "👤"
-            summary += f"\n{i}. {role_emoji} {msg['role'].title()}:\n{msg['content']}\n{'-'*40}\n"
+        for i, turn in enumerate(session.conversation_history, 1):
+            role_emoji = "🎤" if turn.role is Role.interviewer else "👤"
+            summary += f"\n{i}. {role_emoji} {turn.role.value.title()}:\n{turn.content}\n{'-'*40}\n"
         
         return summary
 
@@ -418,9 +559,19 @@ def main():
             print("\n❌ Please check your .env file and try again.")
             return
         
-        # Initialize interviewer
+        # Initialize interviewer; the provider is imported in the background meanwhile
         print("\n🤖 Initializing interviewer...")
-        interviewer = TechInterviewer()
+        providers.preload()
+        from transcript_log import TranscriptLogWriter
+        incremental_evaluator = None
+        if os.getenv("INCREMENTAL_EVALUATION"):
+            from incremental_evaluation import IncrementalEvaluator
+            incremental_evaluator = IncrementalEvaluator()
+        interviewer = TechInterviewer(transcript_log=TranscriptLogWriter("interviews"),
+                                      incremental_evaluator=incremental_evaluator)
+        if os.getenv("LLM_METRICS_PORT"):
+            interviewer.metrics.serve(int(os.getenv("LLM_METRICS_PORT")))
+            print(f"📈 LLM metrics on http://127.0.0.1:{os.getenv('LLM_METRICS_PORT')}/metrics")
         
         print("\n🎯 Welcome to Prep Piper - Technical Interview Simulator!")
         print("This AI conducts structured technical interviews based on your tech stack.\n")
@@ -456,6 +607,7 @@ def main():
         print("-" * 80)
         
         # Main interview loop
+        reported = False
         while True:
             print("\n" + "-" * 50)
             user_input = input("\n👤 Your Response: ").strip()
@@ -463,6 +615,7 @@ def main():
             if user_input.lower() == 'exit':
                 print("\n🏁 Interview Ended")
                 print(interviewer.get_summary(session_id))
+                interviewer.transcripts.close()
                 print("\nThank you for using Prep Piper!")
                 break
                 
@@ -471,12 +624,9 @@ def main():
                 continue
                 
             elif user_input.lower() == 'save':
-                # Simple save to file
+                # Turns are already on disk; this only compacts the log into JSON
                 try:
-                    os.makedirs("interviews", exist_ok=True)
-                    filename = f"interviews/{session_id}.json"
-                    with open(filename, 'w') as f:
-                        json.dump(interviewer.sessions[session_id], f, indent=2)
+                    filename = interviewer.save_transcript(session_id)
                     print(f"✅ Session saved to {filename}")
                 except Exception as e:
                     print(f"❌ Save error: {e}")
@@ -488,8 +638,25 @@ def main():
             
             # Process the answer and get next question
             print("🔄 Processing your answer...")
-            response = interviewer.process_answer(session_id, user_input)
-            print(f"\n🎤 Interviewer: {response}")
+            print("\n🎤 Interviewer: ", end="", flush=True)
+            for chunk in interviewer.process_answer_stream(session_id, user_input):
+                print(chunk, end="", flush=True)
+            print()
+            
+            if incremental_evaluator is not None and interviewer.sessions[session_id].is_complete and not reported:
+                reported = True
+                try:
+                    state = interviewer.evaluation(session_id, timeout=120)
+                    if state.current_step != "completed":
+                        print("❌ Evaluation incomplete: " + "; ".join(state.errors or ["no overall score"]))
+                    else:
+                        print(f"\n📊 Overall score: {state.overall_score}/10")
+                        for strength in state.key_strengths:
+                            print(f"  ✓ {strength}")
+                        for weakness in state.critical_weaknesses:
+                            print(f"  ✗ {weakness}")
+                except Exception as e:
+                    print(f"❌ Evaluation error: {e}")
             
     except KeyboardInterrupt:
         print("\n\n⏸️  Interview interrupted by user")
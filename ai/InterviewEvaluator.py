@@ -1,8 +1,62 @@
 """
 An rag workflow for evaluating the performance of Performed interview.
+
+The stages come from evaluator_schema/evaluator.ipynb: a technical evaluator,
+a problem-solving evaluator and an aggregator that turns both into an overall
+score. The result is a validated EvaluationWorkFlowState.
+
+Batch entry point for the interviews/ archive: every transcript in a directory
+(or every line of a JSONL archive) is evaluated with bounded concurrency,
+results are appended to a JSONL file as each one completes, and transcripts
+already evaluated there are skipped, so a nightly re-run only pays for new or
+previously failed interviews. Sessions are streamed by iter_sessions, which
+reads memory-mapped files and keeps conversation_history out of memory until needed.
+Completed stages are checkpointed (evaluation_checkpoints.py), so a re-run after
+a failure repeats only the stages that failed, and finished evaluations are
+cached by content (evaluation_cache.py), so unchanged transcripts cost no LLM call:
+
+    python InterviewEvaluator.py batch interviews --output evaluations.jsonl --concurrency 8
+    python InterviewEvaluator.py batch archive.jsonl --output evaluations.jsonl
+    python InterviewEvaluator.py evaluate interviews/627dc248.json
 """
+import argparse
+import asyncio
+import functools
+import hashlib
+import itertools
 import json
+import mmap
 import os
+import sys
+import time
+from datetime import datetime
+
+from pydantic import ValidationError
+
+import evaluation_cache
+import evaluation_checkpoints
+from evaluation_cache import EvaluationCache, cache_key
+from evaluation_checkpoints import EvaluationCheckpoints, transcript_hash
+from evaluator_schema.schema import EvaluationWorkFlowState
+from prompts import (
+    AGGREGATOR_HUMAN,
+    AGGREGATOR_PROMPT,
+    PROBLEM_SOLVING_EVALUATOR_HUMAN,
+    PROBLEM_SOLVING_EVALUATOR_PROMPT,
+    TECHNICAL_EVALUATOR_HUMAN,
+    TECHNICAL_EVALUATOR_PROMPT,
+)
+
+# Evaluation yields to live interview turns in llm_scheduler
+LLM_CONFIG = {"metadata": {"llm_priority": "evaluation"}}
+
+# Bump when stage logic changes; edits to the prompts change the version by themselves
+WORKFLOW_REVISION = 1
+WORKFLOW_VERSION = f"{WORKFLOW_REVISION}-" + hashlib.sha256("\0".join((
+    TECHNICAL_EVALUATOR_PROMPT, TECHNICAL_EVALUATOR_HUMAN,
+    PROBLEM_SOLVING_EVALUATOR_PROMPT, PROBLEM_SOLVING_EVALUATOR_HUMAN,
+    AGGREGATOR_PROMPT, AGGREGATOR_HUMAN,
+)).encode("utf-8")).hexdigest()[:12]
 
 
 def load_transcripts(file_path):
@@ -11,10 +65,10 @@ def load_transcripts(file_path):
 
     Args:
         file_path (str): The path to the JSON file containing the transcripts.
-    
+
     Returns:
         dict: A dictionary containing the transcripts.
-    
+
     Raises:
         FileNotFoundError: If the file doesn't exist.
         json.JSONDecodeError: If the file contains invalid JSON.
@@ -22,11 +76,11 @@ def load_transcripts(file_path):
     try:
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"File not found: {file_path}")
-        
+
         with open(file_path, 'r', encoding='utf-8') as f:
             transcripts = json.load(f)
             return transcripts
-    
+
     except json.JSONDecodeError as e:
         print(f"Error parsing JSON: {e}")
         raise
@@ -34,5 +88,503 @@ def load_transcripts(file_path):
         print(f"Error loading transcripts: {e}")
         raise
 
-print(load_transcripts(r'interviews\627dc248.json'))
 
+@functools.lru_cache(maxsize=1)
+def get_llm():
+    """Shared chat model for evaluation (deterministic, pooled, rate-limited)"""
+    from llm_clients import get_chat_model
+    return get_chat_model(temperature=0)
+
+
+def initial_state(interview_data, candidate_id=None):
+    return {
+        "interview_data": interview_data,
+        "current_step": "start",
+        "errors": [],
+        "candidate_id": candidate_id or interview_data.get("candidate_id"),
+    }
+
+
+async def _ask(llm, system_prompt, human_prompt):
+    from langchain_core.messages import HumanMessage, SystemMessage
+    from langchain_core.output_parsers import JsonOutputParser
+
+    response = await llm.ainvoke(
+        [SystemMessage(content=system_prompt), HumanMessage(content=human_prompt)], config=LLM_CONFIG
+    )
+    return JsonOutputParser().parse(response.content)
+
+
+# Stages read the state and return only the fields they produce (or
+# {"errors": [...]}), so independent stages can run concurrently and their
+# results are merged afterwards.
+
+async def technical_evaluator(state, llm):
+    """LLM 1: Technical Skills Evaluator - the technical fields of the state"""
+    try:
+        result = await _ask(llm, TECHNICAL_EVALUATOR_PROMPT, TECHNICAL_EVALUATOR_HUMAN.format(
+            interview_data=json.dumps(state["interview_data"], ensure_ascii=False)))
+        return {
+            "position_evaluated_for": result.get(
+                "position_evaluated_for", state["interview_data"].get("position", "Frontend Developer")),
+            "technical_skills": result.get("technical_skills", []),
+            "technical_consistency_score": result.get("technical_consistency_score", 0),
+            "technical_depth_score": result.get("technical_depth_score", 0),
+            "technical_knowledge_gaps": result.get("technical_knowledge_gaps", []),
+            "technical_strengths": result.get("technical_strengths", []),
+        }
+    except Exception as e:
+        return {"errors": [f"LLM1 Technical Evaluator error: {e}"]}
+
+
+async def problem_solving_evaluator(state, llm):
+    """LLM 2: Problem solving skill Evaluator"""
+    try:
+        result = await _ask(llm, PROBLEM_SOLVING_EVALUATOR_PROMPT, PROBLEM_SOLVING_EVALUATOR_HUMAN.format(
+            interview_data=json.dumps(state["interview_data"], ensure_ascii=False)))
+        return {
+            "problem_solving_instances": result.get("problem_solving_instances", []),
+            "analytical_thinking_score": result.get("analytical_thinking_score", 0),
+            "problem_solving_score": result.get("problem_solving_score", 0),
+            "debugging_potential_score": result.get("debugging_potential_score", 0),
+            "problem_solving_approach": result.get("problem_solving_approach", ""),
+            "comments_on_clarity_of_communication": result.get("comments_on_clarity_of_communication", ""),
+        }
+    except Exception as e:
+        return {"errors": [f"LLM2 Problem Solving Evaluator error: {e}"]}
+
+
+async def aggregator(state, llm):
+    """Aggregator: Synthesizes all evaluations into final comprehensive assessment"""
+    try:
+        if not state.get("technical_skills") or not state.get("technical_consistency_score"):
+            return {"errors": ["Aggregator: Not all LLM evaluations completed successfully"]}
+
+        evaluation_summary = {
+            "technical_evaluation": {
+                "position": state["position_evaluated_for"],
+                "skills": state["technical_skills"],
+                "consistency_score": state["technical_consistency_score"],
+                "depth_score": state["technical_depth_score"],
+                "gaps": state["technical_knowledge_gaps"],
+                "strengths": state["technical_strengths"],
+            },
+            "problem_solving_evaluation": {
+                "instances": state.get("problem_solving_instances", []),
+                "analytical_score": state.get("analytical_thinking_score", 0),
+                "debugging_score": state.get("debugging_potential_score", 0),
+                "approach": state.get("problem_solving_approach", ""),
+                "overall_score": state.get("problem_solving_score", 0),
+                "comments_on_clarity_of_communication": state.get("comments_on_clarity_of_communication", ""),
+            },
+            "original_interview": state["interview_data"],
+            "position": state["position_evaluated_for"],
+        }
+        result = await _ask(llm, AGGREGATOR_PROMPT, AGGREGATOR_HUMAN.format(
+            evaluation_summary=json.dumps(evaluation_summary, indent=2, ensure_ascii=False),
+            position=state["position_evaluated_for"],
+        ))
+        return {
+            "overall_score": result.get("overall_score", 0.0),
+            "key_strengths": result.get("key_strengths", []),
+            "critical_weaknesses": result.get("critical_weaknesses", []),
+            "evaluation_timestamp": datetime.now().isoformat(),
+            "candidate_id": state.get("candidate_id") or "unknown",
+        }
+    except Exception as e:
+        return {"errors": [f"Aggregator error: {e}"]}
+
+
+# Independent sections of EvaluationWorkFlowState, evaluated concurrently
+PARALLEL_STAGES = (technical_evaluator, problem_solving_evaluator)
+
+
+def stage_output_error(state, stage, partial):
+    """None if a stage's fields validate on top of the state, else an error message for the state"""
+    fields = {key: value for key, value in partial.items() if key != "errors"}
+    try:
+        EvaluationWorkFlowState.model_validate(dict(state, **fields))
+    except ValidationError as e:
+        first = e.errors()[0]
+        location = ".".join(str(part) for part in first["loc"])
+        return f"{stage} returned invalid output ({e.error_count()} errors; {location}: {first['msg']})"
+    return None
+
+
+def merge_states(state, partials, step):
+    """
+    Apply stage results to a copy of the state. Errors are concatenated; any
+    other field may come from one stage only. A stage whose fields do not
+    validate is recorded in errors and its fields are left unset. current_step
+    becomes `step` only while no stage so far has failed.
+    """
+    merged = dict(state, errors=list(state["errors"]))
+    owners = {}
+    for stage, partial in partials:
+        merged["errors"].extend(partial.get("errors", ()))
+        error = stage_output_error(merged, stage, partial)
+        if error is not None:
+            merged["errors"].append(error)
+            continue
+        for key, value in partial.items():
+            if key == "errors":
+                continue
+            if key in owners:
+                raise ValueError(f"{stage} and {owners[key]} both set {key!r}")
+            owners[key] = stage
+            merged[key] = value
+    if not merged["errors"]:
+        merged["current_step"] = step
+    EvaluationWorkFlowState.model_validate(merged)
+    return merged
+
+
+async def aevaluate_interview(interview_data, llm=None, candidate_id=None, checkpoints=None, cache=None):
+    """
+    Evaluate one transcript: the independent stages run concurrently, then the
+    aggregator scores their merged result. Latency is the slowest stage plus
+    the aggregator rather than the sum of all stages. Returns a validated
+    EvaluationWorkFlowState.
+
+    With `checkpoints` (EvaluationCheckpoints), every stage that succeeds with
+    schema-valid output is stored and stages stored by an earlier, failed run
+    are not called again; a stored aggregator result is only reused when every
+    stage before it was.
+    With `cache` (EvaluationCache), an unchanged transcript evaluated by the
+    same workflow and schema is answered from disk without any LLM call.
+    """
+    if cache is not None:
+        cached_key = cache_key(interview_data, WORKFLOW_VERSION)
+        cached = cache.get(cached_key)
+        if cached is not None:
+            # Same content, possibly another file: keep this transcript's own data and id
+            return cached.model_copy(update={
+                "interview_data": interview_data,
+                "candidate_id": candidate_id or interview_data.get("candidate_id") or cached.candidate_id,
+            })
+
+    llm = llm or get_llm()
+    state = initial_state(interview_data, candidate_id)
+    key = transcript_hash(interview_data) if checkpoints is not None else None
+    completed = checkpoints.load(key, WORKFLOW_VERSION) if checkpoints is not None else {}
+
+    ran = []
+
+    async def run(stage, state):
+        name = stage.__name__
+        # A checkpoint that no longer validates (e.g. stored before the check below) is re-run, not
+        # resumed; the aggregator's only matches the stage results it was computed from, so it is
+        # re-run too once any stage has been called again
+        if (name in completed and stage_output_error(state, name, completed[name]) is None
+                and (name != aggregator.__name__ or not ran)):
+            return name, completed[name]
+        ran.append(name)
+        result = await stage(state, llm)
+        if (checkpoints is not None and not result.get("errors") and not state["errors"]
+                and stage_output_error(state, name, result) is None):
+            checkpoints.save(key, WORKFLOW_VERSION, name, result)
+        return name, result
+
+    partials = await asyncio.gather(*(run(stage, state) for stage in PARALLEL_STAGES))
+    state = merge_states(state, partials, "evaluators_completed")
+    # Aggregating incomplete stage results would pay for a score built on missing data
+    if not state["errors"]:
+        state = merge_states(state, [await run(aggregator, state)], "completed")
+    result = EvaluationWorkFlowState.model_validate(state)
+    if result.current_step == "completed":
+        if checkpoints is not None:
+            checkpoints.clear(key, WORKFLOW_VERSION)
+        # Only an aggregate computed in this call, from this call's stage results, is served to later ones
+        if cache is not None and aggregator.__name__ in ran:
+            cache.put(cached_key, result)
+    return result
+
+
+def evaluate_interview(interview_data, llm=None, candidate_id=None, checkpoints=None, cache=None):
+    return asyncio.run(aevaluate_interview(interview_data, llm, candidate_id, checkpoints, cache))
+
+
+# Streaming transcript reader
+#
+# Sessions are read from memory-mapped files one at a time (a JSONL archive is
+# split on newlines inside the map). Each one is decoded by the C JSON parser,
+# which is far faster than skipping conversation_history in Python, but only
+# its small fields and the byte span of the session are kept: the history is
+# decoded again from the map when a stage asks for it. Memory stays constant
+# however large the archive is.
+
+# Fields not kept on a SessionRecord; decoded again on access
+LAZY_FIELDS = ("conversation_history",)
+
+
+def _read_span(path, start, end):
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        return buf[start:end]
+
+
+class SessionRecord:
+    """
+    Metadata of one saved interview; conversation_history is read from the
+    source file on access (and not kept), so records stay small.
+    """
+
+    __slots__ = ("session_id", "source", "start", "end", "fields", "turn_count")
+
+    def __init__(self, session_id, source, start, end, fields, turn_count):
+        self.session_id = session_id
+        self.source = source
+        self.start = start
+        self.end = end
+        self.fields = fields
+        self.turn_count = turn_count
+
+    def __getattr__(self, name):
+        # position, tech_stack, difficulty, question_count, is_complete, ...
+        try:
+            return self.fields[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    @property
+    def conversation_history(self):
+        return self.to_dict().get("conversation_history", [])
+
+    def to_dict(self):
+        """The full saved-interview dict, as load_transcripts would return it"""
+        return json.loads(_read_span(self.source, self.start, self.end))
+
+    def __repr__(self):
+        return f"SessionRecord({self.session_id!r}, turns={self.turn_count})"
+
+
+def transcript_id(path):
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def find_transcripts(directory):
+    """Transcript files (interviews/{session_id}.json) in a directory, in name order"""
+    with os.scandir(directory) as entries:
+        return sorted(entry.path for entry in entries if entry.is_file() and entry.name.endswith(".json"))
+
+
+def _scan_file(path):
+    """(map, start, end) of each session in a .json file (one session) or a .jsonl archive (one per line)"""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            if not path.endswith(".jsonl"):
+                yield buf, 0, len(buf)
+                return
+            pos = 0
+            while pos < len(buf):
+                end = buf.find(b"\n", pos)
+                end = len(buf) if end == -1 else end
+                if buf[pos:end].strip():
+                    yield buf, pos, end
+                pos = end + 1
+
+
+def iter_sessions(source, on_error=None):
+    """
+    Yield a SessionRecord per interview in `source`: a directory of saved
+    transcripts, a single transcript, or a JSONL archive with one transcript
+    per line. JSONL sessions are identified by their "session_id" field, or
+    by "<archive name>:<line>" when there is none.
+
+    A malformed session raises ValueError, or is passed to
+    on_error(session_id, path, error) and skipped.
+    """
+    paths = find_transcripts(source) if os.path.isdir(source) else [source]
+    for path in paths:
+        archive = path.endswith(".jsonl")
+        for number, (buf, start, end) in enumerate(_scan_file(path), 1):
+            session_id = f"{transcript_id(path)}:{number}" if archive else transcript_id(path)
+            try:
+                data = json.loads(buf[start:end])
+                if not isinstance(data, dict):
+                    raise ValueError("transcript is not a JSON object")
+            except ValueError as e:
+                if on_error is None:
+                    raise
+                on_error(session_id, path, e)
+                continue
+            history = data.get("conversation_history") or ()
+            fields = {key: value for key, value in data.items() if key not in LAZY_FIELDS}
+            if archive and fields.get("session_id"):
+                session_id = str(fields["session_id"])
+            yield SessionRecord(session_id, path, start, end, fields, len(history))
+
+
+# Batch evaluation
+
+
+def evaluated_ids(output_path):
+    """Transcripts with a completed evaluation in an existing results file"""
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+    with open(output_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # A line cut short by an interrupted run
+                continue
+            if (record.get("state") or {}).get("current_step") == "completed":
+                done.add(record["transcript"])
+    return done
+
+
+class BatchProgress:
+    """Completed/failed counts, throughput and ETA (when `total` is known), printed every `every` seconds"""
+
+    def __init__(self, total, every=5.0, out=sys.stdout):
+        self.total = total
+        self.every = every
+        self.out = out
+        self.completed = 0
+        self.failed = 0
+        self.started = time.perf_counter()
+        self._last_report = self.started
+
+    @property
+    def done(self):
+        return self.completed + self.failed
+
+    @property
+    def rate(self):
+        elapsed = time.perf_counter() - self.started
+        return self.done / elapsed if elapsed else 0.0
+
+    def update(self, ok):
+        if ok:
+            self.completed += 1
+        else:
+            self.failed += 1
+        now = time.perf_counter()
+        if now - self._last_report >= self.every or self.done == self.total:
+            self._last_report = now
+            self.report()
+
+    def report(self):
+        rate = self.rate
+        if self.total is None:
+            print(f"[{self.done}] {self.completed} evaluated, {self.failed} failed, {rate:.2f} interviews/s",
+                  file=self.out, flush=True)
+            return
+        eta = (self.total - self.done) / rate if rate else float("inf")
+        print(f"[{self.done}/{self.total}] {self.completed} evaluated, {self.failed} failed, "
+              f"{rate:.2f} interviews/s, eta {eta:.0f}s", file=self.out, flush=True)
+
+    def to_dict(self):
+        return {
+            "total": self.total,
+            "completed": self.completed,
+            "failed": self.failed,
+            "seconds": round(time.perf_counter() - self.started, 3),
+            "interviews_per_second": round(self.rate, 3),
+        }
+
+
+async def evaluate_archive(source, output_path, concurrency=4, llm=None, limit=None, progress_every=5.0,
+                           checkpoints=None, cache=None):
+    """
+    Evaluate every not-yet-evaluated session in `source` (see iter_sessions),
+    appending one JSON line per session to `output_path` as it completes:
+
+        {"transcript": id, "path": ..., "state": {...}}     validated state
+        {"transcript": id, "path": ..., "error": "..."}      read/validation failure
+
+    A state whose current_step is not "completed" (a stage failed) is written
+    too but not skipped next time; with `checkpoints` the next run only
+    repeats its failed stages. Sessions are streamed, so memory does not
+    grow with the archive. Returns the BatchProgress counters.
+    """
+    llm = llm or get_llm()
+    done = evaluated_ids(output_path)
+    # Known up front for a directory; a JSONL archive is not read twice just to count it
+    total = (sum(transcript_id(path) not in done for path in find_transcripts(source))
+             if os.path.isdir(source) else None)
+    if limit is not None:
+        total = limit if total is None else min(total, limit)
+    progress = BatchProgress(total, every=progress_every)
+    print(f"Evaluating {source} ({len(done)} already evaluated) with concurrency {concurrency}", flush=True)
+
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    with open(output_path, "a", encoding="utf-8") as out:
+
+        def write(record, ok):
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+            progress.update(ok)
+
+        def unreadable(session_id, path, error):
+            write({"transcript": session_id, "path": path, "error": f"{type(error).__name__}: {error}"}, False)
+
+        sessions = (record for record in iter_sessions(source, on_error=unreadable) if record.session_id not in done)
+        if limit is not None:
+            sessions = itertools.islice(sessions, limit)
+
+        async def worker():
+            # Workers pull sessions one at a time, so only `concurrency` transcripts are in memory
+            for session in sessions:
+                record = {"transcript": session.session_id, "path": session.source}
+                try:
+                    interview_data = await asyncio.to_thread(session.to_dict)
+                    state = await aevaluate_interview(interview_data, llm, session.session_id, checkpoints, cache)
+                    record["state"] = state.model_dump(mode="json")
+                    ok = state.current_step == "completed"
+                except Exception as e:
+                    record["error"] = f"{type(e).__name__}: {e}"
+                    ok = False
+                write(record, ok)
+
+        await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+    return progress
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    batch_parser = commands.add_parser("batch", help="evaluate every transcript in a directory or JSONL archive")
+    batch_parser.add_argument("source", nargs="?", default="interviews")
+    batch_parser.add_argument("--output", default="evaluations/evaluations.jsonl")
+    batch_parser.add_argument("--concurrency", type=int, default=4)
+    batch_parser.add_argument("--limit", type=int, default=None, help="evaluate at most this many transcripts")
+    batch_parser.add_argument("--progress-every", type=float, default=5.0, help="seconds between progress lines")
+    batch_parser.add_argument("--checkpoints", default=evaluation_checkpoints.DEFAULT_PATH,
+                              help="stage checkpoint database")
+    batch_parser.add_argument("--no-checkpoints", action="store_true", help="do not resume or store stage results")
+    batch_parser.add_argument("--cache", default=evaluation_cache.DEFAULT_PATH, help="evaluation cache database")
+    batch_parser.add_argument("--cache-max-mb", type=float, default=evaluation_cache.DEFAULT_MAX_BYTES / 2 ** 20)
+    batch_parser.add_argument("--no-cache", action="store_true", help="always run the workflow")
+
+    evaluate_parser = commands.add_parser("evaluate", help="evaluate one transcript and print the state")
+    evaluate_parser.add_argument("path")
+    args = parser.parse_args()
+
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    if args.command == "batch":
+        checkpoints = None if args.no_checkpoints else EvaluationCheckpoints(args.checkpoints)
+        cache = None if args.no_cache else EvaluationCache(args.cache, max_bytes=int(args.cache_max_mb * 2 ** 20))
+        progress = asyncio.run(evaluate_archive(
+            args.source, args.output, concurrency=args.concurrency, limit=args.limit,
+            progress_every=args.progress_every, checkpoints=checkpoints, cache=cache,
+        ))
+        summary = progress.to_dict()
+        if checkpoints is not None:
+            summary["checkpoints"] = checkpoints.stats()
+        if cache is not None:
+            summary["cache"] = cache.stats()
+        print(json.dumps(summary, indent=2))
+    else:
+        state = evaluate_interview(load_transcripts(args.path), candidate_id=transcript_id(args.path))
+        print(state.model_dump_json(indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,369 @@
+"""
+Local pre-filter for non-answers, checked before the next-question LLM call.
+
+The only guard used to be the answer's length, so replies such as "how are
+you" or "i love you" (both in the sample transcript in evaluator_schema) each
+paid for a full few-shot generation just to have the model steer the
+candidate back. AnswerFilter recognises four kinds of non-answer from
+keyword/phrase rules and cheap text features, with no model and no network:
+
+  * greeting:   small talk and acknowledgements ("hi", "how are you", "ok thanks");
+  * dont_know:  "I don't know", "no idea", "skip", unless the candidate goes on to reason;
+  * gibberish:  keyboard mashing, repeated characters, no letters or digits at all;
+  * off_topic:  short personal/chit-chat replies unrelated to the question.
+
+and answers with a templated redirect or hint that repeats the question. An
+optional tiny linear model (LinearAnswerModel, trained with `python
+answer_filter.py train examples.jsonl`) catches what the rules miss. After
+`max_consecutive` filtered replies in a row the next one goes to the LLM, which
+can rephrase or simplify the question for a candidate who is stuck.
+
+    verdict = answer_filter.check(answer, question, tech_stack, session_id)
+    if verdict is not None:
+        return verdict.reply        # no LLM call
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import re
+import threading
+from collections import OrderedDict, namedtuple
+
+from text_features import embed, normalize_text
+
+CATEGORIES = ("greeting", "dont_know", "gibberish", "off_topic")
+ANSWER = "answer"
+
+Verdict = namedtuple("Verdict", ["category", "reply", "confidence"])
+
+# The open question is repeated after the reply when it is known
+REPLIES = {
+    "greeting": "👋 Hi! I'm doing well, thanks for asking. Let's keep going with the interview.",
+    "dont_know": "That's okay, nobody knows everything! 💡 Try to reason it out loud: what do you know about "
+                 "{topic} that relates to this? A partial answer or a similar problem you've solved helps too.",
+    "gibberish": "🤔 I couldn't quite follow that. Could you put your answer into a sentence or two?",
+    "off_topic": "Let's keep our focus on the interview question. 🙂",
+}
+
+_GREETINGS = (
+    "hi", "hii", "hello", "hey", "heya", "yo", "sup", "hi there", "hello there", "hey there",
+    "good morning", "good afternoon", "good evening", "how are you", "how are you doing", "how r u",
+    "hows it going", "whats up", "nice to meet you", "thanks", "thank you", "thanks a lot", "thank you so much",
+    "ok", "okay", "cool", "great", "nice", "alright", "sure", "fine",
+)
+# Words that may surround a greeting without making it an answer
+_GREETING_FILLER = frozenset(
+    "i im am and doing well good fine great you too sir maam there so much very again all ok okay its".split())
+_GREETING_RE = re.compile(r"\b(?:" + "|".join(sorted(map(re.escape, _GREETINGS), key=len, reverse=True)) + r")\b")
+
+_DONT_KNOW_RE = re.compile(
+    r"\b(?:(?:i )?(?:really )?(?:dont|do not|didnt|did not) (?:really )?(?:know|remember|understand|get it)"
+    r"|no idea|not sure|idk|no clue|dunno|(?:i )?(?:have )?never (?:used|heard|worked|tried)"
+    r"|(?:i )?(?:cant|cannot) (?:answer|remember|recall|explain)|no experience)\b"
+)
+# Only as the whole reply: "pass" and "next" are also words of real answers ("pass by reference")
+_SKIP_RE = re.compile(r"(?:(?:can we |lets |please )?(?:skip|pass)(?: this)?(?: one| question)?(?: please)?"
+                      r"|next(?: question)?(?: please)?)")
+# The candidate goes on to reason despite the opener: let the LLM see it
+_REASONING = frozenset(
+    "but think guess maybe probably would could might because use using so if when like try".split())
+
+# Phrases rather than topics: "music" or "weather" can be what the candidate built
+_OFF_TOPIC_RE = re.compile(
+    r"\b(?:i love you|love you|marry me|date me|whats your name|who are you|are you (?:a )?(?:bot|robot|human|real)"
+    r"|tell me a joke|im (?:hungry|bored|sleepy)|lol|lmao|haha+|hehe+|you are (?:cute|beautiful|pretty|funny))\b"
+)
+
+_KEYBOARD_ROWS = ("qwertyuiop", "asdfghjkl", "zxcvbnm")
+_VOWELS = frozenset("aeiouy")
+_STOPWORDS = frozenset(
+    "a an the is are was were be to of and or in on at for with it this that what how why do you your i me my "
+    "we can could would should about from as by have has had not no yes".split())
+
+# Replies longer than this are never filtered by the rules
+MAX_WORDS = 12
+
+
+def _junk_token(token):
+    """A token that looks like keyboard mashing rather than a word or identifier"""
+    letters = re.sub(r"[^a-z]", "", token)
+    if len(letters) < 4:
+        return False
+    if any(letters in row for row in _KEYBOARD_ROWS):
+        return True
+    if len(set(letters)) / len(letters) < 0.35:
+        return True
+    vowels = sum(char in _VOWELS for char in letters)
+    # Short vowel-less tokens are acronyms: html, https, grpc, npm
+    if (vowels == 0 and len(letters) > 5) or vowels / len(letters) > 0.8:
+        return True
+    run = longest = 0
+    for char in letters:
+        run = 0 if char in _VOWELS else run + 1
+        longest = max(longest, run)
+    return longest >= 6
+
+
+def _content_words(text):
+    return {word for word in normalize_text(text).split() if word not in _STOPWORDS and len(word) > 2}
+
+
+def features(answer, question="", tech_stack=""):
+    """Named numeric features of a reply (shared by the rules and LinearAnswerModel)"""
+    normalized = normalize_text(answer)
+    words = normalized.split()
+    context = _content_words(question) | _content_words(tech_stack.replace(",", " "))
+    content = _content_words(answer)
+    junk = sum(_junk_token(word) for word in words)
+    return {
+        "words": len(words),
+        "alnum": sum(char.isalnum() for char in answer),
+        "junk_share": junk / len(words) if words else 1.0,
+        "context_overlap": len(content & context),
+        "content_words": len(content),
+        "greeting": bool(_GREETING_RE.search(normalized)),
+        "dont_know": bool(_DONT_KNOW_RE.search(normalized) or _SKIP_RE.fullmatch(normalized)),
+        "off_topic": bool(_OFF_TOPIC_RE.search(normalized)),
+        "reasoning": any(word in _REASONING for word in words),
+        "question_mark": answer.strip().endswith("?"),
+    }
+
+
+def classify(answer, question="", tech_stack=""):
+    """
+    (category, confidence) from the rules: one of CATEGORIES, or ANSWER when
+    the reply should go to the LLM.
+    """
+    normalized = normalize_text(answer)
+    f = features(answer, question, tech_stack)
+    if not f["alnum"] or (f["words"] and f["junk_share"] >= 0.6 and not f["context_overlap"]):
+        return "gibberish", 0.95
+    if f["words"] > MAX_WORDS:
+        return ANSWER, 1.0
+    if f["greeting"]:
+        rest = _GREETING_RE.sub(" ", normalized).split()
+        if all(word in _GREETING_FILLER for word in rest):
+            return "greeting", 0.95
+    # What is left once the matched phrase is removed decides whether there is an answer around it
+    if f["dont_know"] and not f["reasoning"] and len(_content_words(_DONT_KNOW_RE.sub(" ", normalized))) <= 2:
+        return "dont_know", 0.9
+    if f["off_topic"] and not f["context_overlap"] and len(_content_words(_OFF_TOPIC_RE.sub(" ", normalized))) <= 2:
+        return "off_topic", 0.9
+    return ANSWER, 0.5
+
+
+def _sparse(answer, question="", tech_stack=""):
+    """Sparse feature vector for LinearAnswerModel: text_features buckets plus the named features"""
+    vector = {str(index): weight for index, weight in embed(answer).items()}
+    for name, value in features(answer, question, tech_stack).items():
+        if name == "words":
+            vector[f"words<={min(int(value), MAX_WORDS + 1)}"] = 1.0
+        elif name in ("alnum", "content_words"):
+            vector[name] = math.log1p(float(value))
+        else:
+            vector[name] = float(value)
+    return vector
+
+
+class LinearAnswerModel:
+    """
+    Multinomial logistic regression over sparse text features; small enough to
+    train and run in pure Python.
+
+    Args:
+        labels (list[str]): Classes, usually ANSWER plus CATEGORIES.
+        weights (dict): {label: {feature: weight}}.
+        bias (dict): {label: bias}.
+    """
+
+    def __init__(self, labels, weights=None, bias=None):
+        self.labels = list(labels)
+        self.weights = weights or {label: {} for label in self.labels}
+        self.bias = bias or {label: 0.0 for label in self.labels}
+
+    def probabilities(self, answer, question="", tech_stack=""):
+        return self._softmax(_sparse(answer, question, tech_stack))
+
+    def _softmax(self, vector):
+        scores = {
+            label: self.bias[label] + sum(self.weights[label].get(key, 0.0) * value for key, value in vector.items())
+            for label in self.labels
+        }
+        top = max(scores.values())
+        exps = {label: math.exp(score - top) for label, score in scores.items()}
+        total = sum(exps.values())
+        return {label: value / total for label, value in exps.items()}
+
+    def predict(self, answer, question="", tech_stack=""):
+        """(label, probability) of the most likely class"""
+        probabilities = self.probabilities(answer, question, tech_stack)
+        label = max(probabilities, key=probabilities.get)
+        return label, probabilities[label]
+
+    @classmethod
+    def fit(cls, examples, epochs=20, learning_rate=0.5, l2=1e-4, seed=0):
+        """
+        Train on [{"text", "label", "question"?, "tech_stack"?}] with SGD.
+        Labels are ANSWER or one of CATEGORIES.
+        """
+        labels = [ANSWER] + [label for label in CATEGORIES if any(e["label"] == label for e in examples)]
+        model = cls(labels)
+        data = [(_sparse(e["text"], e.get("question", ""), e.get("tech_stack", "")), e["label"]) for e in examples]
+        rng = random.Random(seed)
+        for epoch in range(epochs):
+            rng.shuffle(data)
+            rate = learning_rate / (1 + epoch)
+            for vector, target in data:
+                probabilities = model._softmax(vector)
+                for label in labels:
+                    gradient = probabilities[label] - (label == target)
+                    weights = model.weights[label]
+                    for key, value in vector.items():
+                        weights[key] = weights.get(key, 0.0) * (1 - rate * l2) - rate * gradient * value
+                    model.bias[label] -= rate * gradient
+        for label in labels:
+            model.weights[label] = {key: w for key, w in model.weights[label].items() if abs(w) > 1e-4}
+        return model
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"labels": self.labels, "weights": self.weights, "bias": self.bias}, f)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data["labels"], data["weights"], data["bias"])
+
+
+def _topic(question, tech_stack):
+    """Technology of the stack named in the question, else the first one"""
+    technologies = [tech.strip() for tech in tech_stack.split(",") if tech.strip()]
+    lowered = question.lower()
+    for tech in technologies:
+        if tech.lower() in lowered:
+            return tech
+    return technologies[0] if technologies else "the topic"
+
+
+def _last_paragraph(question):
+    # The opening message wraps its question in a greeting; repeat only the question
+    paragraphs = [p.strip() for p in question.strip().split("\n\n") if p.strip()]
+    return paragraphs[-1] if paragraphs else ""
+
+
+class AnswerFilter:
+    """
+    Args:
+        model (LinearAnswerModel | None): Consulted when the rules pass a reply;
+            defaults to the file at $ANSWER_FILTER_MODEL, if set.
+        threshold (float): Model probability needed to filter a reply.
+        max_consecutive (int): Filtered replies in a row per session before the next goes to the LLM.
+        max_sessions (int): Sessions whose streak is tracked (least recently seen dropped).
+    """
+
+    def __init__(self, model=None, threshold=0.9, max_consecutive=2, max_sessions=10000):
+        if model is None and os.getenv("ANSWER_FILTER_MODEL"):
+            model = LinearAnswerModel.load(os.getenv("ANSWER_FILTER_MODEL"))
+        self.model = model
+        self.threshold = threshold
+        self.max_consecutive = max_consecutive
+        self.max_sessions = max_sessions
+        self._streaks = OrderedDict()
+        self._lock = threading.Lock()
+        self.checked = 0
+        self.filtered = {category: 0 for category in CATEGORIES}
+        self.escalated = 0
+
+    def classify(self, answer, question="", tech_stack=""):
+        """(category, confidence): the rules first, then the model for replies they pass"""
+        category, confidence = classify(answer, question, tech_stack)
+        if category == ANSWER and self.model is not None and len(answer.split()) <= 3 * MAX_WORDS:
+            label, probability = self.model.predict(answer, question, tech_stack)
+            if label != ANSWER and probability >= self.threshold:
+                return label, probability
+        return category, confidence
+
+    def check(self, answer, question="", tech_stack="", session_id=None):
+        """
+        A Verdict with the reply to send instead of calling the LLM, or None
+        when the answer should go to the LLM.
+        """
+        category, confidence = self.classify(answer, question, tech_stack)
+        with self._lock:
+            self.checked += 1
+            streak = self._streaks.pop(session_id, 0) if session_id is not None else 0
+            if category == ANSWER:
+                return None
+            if streak >= self.max_consecutive:
+                # Stuck: let the LLM rephrase or simplify the question
+                self.escalated += 1
+                return None
+            if session_id is not None:
+                self._streaks[session_id] = streak + 1
+                while len(self._streaks) > self.max_sessions:
+                    self._streaks.popitem(last=False)
+            self.filtered[category] += 1
+        reply = REPLIES[category].format(topic=_topic(question, tech_stack))
+        question = _last_paragraph(question)
+        if question:
+            reply += "\n\n" + question
+        return Verdict(category, reply, confidence)
+
+    @property
+    def llm_calls_saved(self):
+        return sum(self.filtered.values())
+
+    def stats(self):
+        return {
+            "checked": self.checked,
+            "filtered": dict(self.filtered),
+            "llm_calls_saved": self.llm_calls_saved,
+            "escalated": self.escalated,
+        }
+
+    def metric_samples(self):
+        """Samples for LLMMetrics.add_collector"""
+        samples = [("answer_filter_checked_total", "counter", "Candidate replies checked by the answer filter", {},
+                    self.checked)]
+        for category, count in self.filtered.items():
+            samples.append(("answer_filter_llm_calls_saved_total", "counter",
+                            "Next-question LLM calls replaced by a templated reply", {"category": category}, count))
+        samples.append(("answer_filter_escalated_total", "counter",
+                        "Non-answers passed to the LLM after repeated redirects", {}, self.escalated))
+        return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local non-answer filter")
+    commands = parser.add_subparsers(dest="command", required=True)
+    train_parser = commands.add_parser("train", help="fit a LinearAnswerModel on labelled replies")
+    train_parser.add_argument("examples", help='JSONL of {"text", "label", "question"?, "tech_stack"?}')
+    train_parser.add_argument("--output", default="answer_filter_model.json")
+    train_parser.add_argument("--epochs", type=int, default=20)
+    check_parser = commands.add_parser("check", help="classify replies given on the command line")
+    check_parser.add_argument("answers", nargs="+")
+    check_parser.add_argument("--question", default="")
+    check_parser.add_argument("--tech-stack", default="")
+    args = parser.parse_args()
+
+    if args.command == "train":
+        with open(args.examples, "r", encoding="utf-8") as f:
+            examples = [json.loads(line) for line in f if line.strip()]
+        model = LinearAnswerModel.fit(examples, epochs=args.epochs)
+        correct = sum(model.predict(e["text"], e.get("question", ""), e.get("tech_stack", ""))[0] == e["label"]
+                      for e in examples)
+        model.save(args.output)
+        print(f"Trained on {len(examples)} replies ({correct / len(examples):.1%} training accuracy) -> {args.output}")
+    else:
+        answer_filter = AnswerFilter()
+        for answer in args.answers:
+            category, confidence = answer_filter.classify(answer, args.question, args.tech_stack)
+            print(f"{category:>10} {confidence:.2f}  {answer}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Throughput of the sync vs asyncio TechInterviewer APIs against a simulated chat model.
+
+Every LLM call sleeps for a fixed latency (no network), so the numbers show how
+many interview turns one process can push through while waiting on the provider.
+
+Usage:
+    python benchmarks/bench_async_sessions.py --sessions 200 --latency 0.25
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from InterviewAgent import TechInterviewer  # noqa: E402
+
+
+ANSWERS = [
+    "I used it to build a REST API with background workers and a Postgres database.",
+    "I would profile first, then add caching and fix the slowest queries.",
+    "Closures capture variables from the enclosing scope, which is handy for callbacks.",
+    "I would add an index and check the query plan with EXPLAIN ANALYZE.",
+]
+
+
+class SimulatedLLM:
+    """Minimal chat model stand-in with a fixed response latency"""
+
+    def __init__(self, latency):
+        self.latency = latency
+
+    def invoke(self, messages, config=None):
+        time.sleep(self.latency)
+        return SimpleNamespace(content="Can you walk me through how you would test that?")
+
+    async def ainvoke(self, messages, config=None):
+        await asyncio.sleep(self.latency)
+        return SimpleNamespace(content="Can you walk me through how you would test that?")
+
+
+def run_sync(interviewer, sessions):
+    """Drive sessions one after another through the blocking API"""
+    turns = 0
+    start = time.perf_counter()
+    for _ in range(sessions):
+        session_id, _ = interviewer.start_interview()
+        for answer in ANSWERS:
+            interviewer.process_answer(session_id, answer)
+            turns += 1
+    return turns, time.perf_counter() - start
+
+
+async def run_async(interviewer, sessions):
+    """Drive all sessions concurrently on one event loop"""
+    async def candidate():
+        session_id, _ = await interviewer.astart_interview()
+        for answer in ANSWERS:
+            await interviewer.aprocess_answer(session_id, answer)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(candidate() for _ in range(sessions)))
+    return sessions * len(ANSWERS), time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=200, help="concurrent sessions for the async run")
+    parser.add_argument("--sync-sessions", type=int, default=5, help="sessions for the sequential baseline")
+    parser.add_argument("--latency", type=float, default=0.25, help="simulated LLM latency in seconds")
+    args = parser.parse_args()
+
+    llm = SimulatedLLM(args.latency)
+
+    turns, elapsed = run_sync(TechInterviewer(llm=llm), args.sync_sessions)
+    print(f"sync : {args.sync_sessions:4d} sessions  {turns:5d} turns  {elapsed:7.2f}s  {turns / elapsed:8.1f} turns/s")
+
+    turns, elapsed = asyncio.run(run_async(TechInterviewer(llm=llm), args.sessions))
+    print(f"async: {args.sessions:4d} sessions  {turns:5d} turns  {elapsed:7.2f}s  {turns / elapsed:8.1f} turns/s")
+
+
+if __name__ == "__main__":
+    main()
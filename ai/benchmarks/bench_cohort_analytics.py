@@ -0,0 +1,114 @@
+"""
+Cohort statistics over N candidates: CohortTable (NumPy columns) vs a Python loop.
+
+Synthetic evaluations (positions, tech stacks, skills, knowledge gaps and
+scores) are packed once with CohortTable.from_states; the timings then compare
+percentile ranks, per-position distributions and gap frequencies against the
+equivalent per-candidate Python code.
+
+Usage:
+    python benchmarks/bench_cohort_analytics.py --candidates 100000
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from collections import Counter, defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cohort_analytics import CONFIDENCE_LEVELS, PROFICIENCY_LEVELS, SCORE_FIELDS, CohortTable  # noqa: E402
+
+POSITIONS = ["Frontend Developer", "Backend Developer", "Full Stack Developer", "Data Engineer", "DevOps Engineer"]
+TECHNOLOGIES = ["Python", "JavaScript", "React", "Node.js", "SQL", "Docker", "Kubernetes", "Go", "AWS", "TypeScript"]
+GAPS = [f"Gap {i}" for i in range(200)]
+
+
+def build_states(n, seed=7):
+    rng = random.Random(seed)
+    states = []
+    for i in range(n):
+        stack = rng.sample(TECHNOLOGIES, 3)
+        state = {
+            "current_step": "completed",
+            "candidate_id": f"candidate-{i}",
+            "position_evaluated_for": rng.choice(POSITIONS),
+            "interview_data": {"tech_stack": ", ".join(stack)},
+            "technical_skills": [
+                {"skill_name": tech, "proficiency_level": rng.choice(PROFICIENCY_LEVELS),
+                 "confidence": rng.choice(CONFIDENCE_LEVELS)}
+                for tech in stack
+            ],
+            "technical_knowledge_gaps": rng.sample(GAPS, rng.randint(0, 4)),
+        }
+        for name in SCORE_FIELDS:
+            state[name] = rng.randint(0, 10) if name != "overall_score" else round(rng.uniform(0, 10), 1)
+        states.append(state)
+    return states
+
+
+def python_stats(states):
+    # Percentile ranks: the per-candidate loop the columns replace (bisect on a sorted copy)
+    import bisect
+    scores = [s["overall_score"] for s in states]
+    ordered = sorted(scores)
+    ranks = [(bisect.bisect_left(ordered, v) + bisect.bisect_right(ordered, v)) * 50.0 / len(ordered)
+             for v in scores]
+    by_position = defaultdict(list)
+    for s in states:
+        by_position[s["position_evaluated_for"]].append(s["technical_depth_score"])
+    distribution = {p: (len(v), statistics.fmean(v), statistics.median(v)) for p, v in by_position.items()}
+    gaps = Counter(gap for s in states for gap in set(s["technical_knowledge_gaps"])).most_common(10)
+    return ranks, distribution, gaps
+
+
+def columnar_stats(table):
+    ranks = table.percentile_rank("overall_score")
+    distribution = table.distribution("technical_depth_score", by="position")
+    gaps = table.skill_gap_frequency(top=10)
+    return ranks, distribution, gaps
+
+
+def timed(fn, *args, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--candidates", type=int, default=100000)
+    args = parser.parse_args()
+
+    states = build_states(args.candidates)
+    start = time.perf_counter()
+    table = CohortTable.from_states(states)
+    print(f"{len(table)} candidates packed in {time.perf_counter() - start:.2f}s "
+          f"({len(table.skills['skill'])} skill rows, {len(table.gaps['gap'])} gap rows)")
+
+    loop_time, (loop_ranks, loop_distribution, loop_gaps) = timed(python_stats, states, repeat=3)
+    column_time, (ranks, distribution, gaps) = timed(columnar_stats, table)
+    print(f"python loop: {loop_time * 1000:8.1f} ms")
+    print(f"columnar:    {column_time * 1000:8.1f} ms")
+
+    rank_time, _ = timed(table.percentile_rank, "overall_score")
+    print(f"percentile ranks alone: {rank_time * 1000:.1f} ms")
+    by_technology_time, _ = timed(table.skill_gap_frequency, 10, "technology")
+    print(f"gap frequency per technology: {by_technology_time * 1000:.1f} ms")
+
+    assert max(abs(a - b) for a, b in zip(loop_ranks, ranks)) < 1e-6
+    assert [(gap, count) for gap, count, _ in gaps] == loop_gaps
+    for position, (count, mean, median) in loop_distribution.items():
+        summary = distribution[position]
+        assert summary["count"] == count and abs(summary["mean"] - mean) < 1e-6 and summary["p50"] == median
+    print("results match")
+
+
+if __name__ == "__main__":
+    main()
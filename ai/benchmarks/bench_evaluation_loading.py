@@ -0,0 +1,104 @@
+"""
+Records/sec loading stored evaluations with evaluator_schema.bulk, per mode.
+
+Writes N batch records ({"transcript", "path", "state"}) shaped like the batch
+evaluator's output to a temporary JSONL file, then times iter_states in each
+mode and checks that all modes load the same states.
+
+Usage:
+    python benchmarks/bench_evaluation_loading.py --records 20000
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from evaluator_schema.bulk import MODES, iter_states  # noqa: E402
+from evaluator_schema.schema import (  # noqa: E402
+    ConfidenceLevel,
+    EvaluationWorkFlowState,
+    ProblemSolvingInstance,
+    ProficiencyLevel,
+    TechnicalSkillAssessment,
+)
+
+SKILLS = ["Python", "JavaScript", "React", "SQL", "Docker", "REST APIs"]
+
+
+def build_state(i):
+    levels = list(ProficiencyLevel)
+    confidences = list(ConfidenceLevel)
+    return EvaluationWorkFlowState(
+        interview_data={"tech_stack": "Python, JavaScript, React", "position": "Software Developer"},
+        current_step="completed",
+        technical_skills=[
+            TechnicalSkillAssessment(
+                skill_name=skill,
+                proficiency_level=levels[(i + k) % len(levels)],
+                evidence=["Explained the trade-offs clearly", "Gave a concrete example"],
+                confidence=confidences[(i + k) % len(confidences)],
+            )
+            for k, skill in enumerate(SKILLS[:4])
+        ],
+        problem_solving_instances=[
+            ProblemSolvingInstance(
+                problem_statement="Design a caching layer for a read-heavy API",
+                solution="Redis in front of the database with write-through invalidation",
+                approach_quality=1 + (i + k) % 10,
+                solution_effectiveness=1 + (i + 2 * k) % 10,
+                reasoning_clarity=1 + (i + 3 * k) % 10,
+            )
+            for k in range(2)
+        ],
+        problem_solving_score=i % 11,
+        technical_depth_score=(i * 7) % 11,
+        technical_knowledge_gaps=["Concurrency", "Indexing"],
+        technical_strengths=["API design"],
+        overall_score=(i % 100) / 10,
+        key_strengths=["Communication"],
+        candidate_id=f"candidate-{i}",
+    )
+
+
+def write_records(path, n):
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(n):
+            state = build_state(i)
+            record = {"transcript": f"t{i}", "path": f"interviews/t{i}.json", "state": state.model_dump(mode="json")}
+            f.write(json.dumps(record) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--records", type=int, default=20000)
+    parser.add_argument("--chunk-size", type=int, default=32)
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per mode; the best is reported")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "evaluations.jsonl")
+        write_records(path, args.records)
+        print(f"{args.records} records, {os.path.getsize(path) / 2**20:.1f} MB")
+
+        for mode in MODES:
+            best = float("inf")
+            for _ in range(args.repeat):
+                gc.collect()
+                start = time.perf_counter()
+                count = sum(1 for _ in iter_states(path, mode=mode, chunk_size=args.chunk_size))
+                best = min(best, time.perf_counter() - start)
+            print(f"{mode:>9}: {best:6.2f}s  {count / best:10,.0f} records/s")
+
+        sample = {mode: [s.model_dump() for s in iter_states(path, mode=mode)][:1000] for mode in MODES}
+    assert all(sample[mode] == sample[MODES[0]] for mode in MODES), "modes disagree"
+    print("all modes load identical states")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Per-turn prompt assembly cost, before and after splitting out the static prefix.
+
+"before" reproduces the old _generate_next_question layout: one indented f-string
+with the session header, the five few-shot examples and the footer re-formatted
+into a new SystemMessage on every turn. "after" is the current
+TechInterviewer._question_messages given the same last 4 messages, so the two
+rows compare prompt assembly alone. The context window (context_window.py,
+added later) is measured separately: "fit" is ContextWindow.fit on its own and
+"windowed" the whole _build_question_messages, which keeps every message that
+fits the token budget (all 12 here) rather than the last 4, so it renders more
+conversation per turn. Token counts use prompts.estimate_tokens (~4
+chars/token); the "cacheable" column is the part of the prompt that is
+byte-identical across turns and sessions.
+
+Usage:
+    python benchmarks/bench_prompt_assembly.py --turns 20000
+"""
+
+import argparse
+import os
+import sys
+import textwrap
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from InterviewAgent import TechInterviewer  # noqa: E402
+from session_models import InterviewSession  # noqa: E402
+from prompts import FEW_SHOT_EXAMPLES, INTERVIEW_STYLE, INTERVIEWER_ROLE, STATIC_SYSTEM_PROMPT, estimate_tokens  # noqa: E402
+
+_LEGACY_ROLE = textwrap.indent(INTERVIEWER_ROLE, " " * 12)
+_LEGACY_EXAMPLES = textwrap.indent(FEW_SHOT_EXAMPLES, " " * 12)
+_LEGACY_STYLE = textwrap.indent(INTERVIEW_STYLE, " " * 12)
+
+
+def legacy_prompt(session, max_questions):
+    """The pre-split prompt: everything rebuilt into one string per turn"""
+    recent_conversation = ""
+    for msg in session["conversation_history"][-4:]:
+        recent_conversation += f"{msg['role'].title()}: {msg['content']}\n\n"
+
+    return f"""You are a technical interviewer for a {session['position']} role.
+
+            INTERVIEW CONTEXT:
+            - Tech Stack: {session['tech_stack']}
+            - Question Number: {session['question_count'] + 1} of {max_questions}
+            - Current Level: {session['difficulty']}
+
+            RECENT CONVERSATION:
+            {recent_conversation}
+{_LEGACY_ROLE}
+{_LEGACY_EXAMPLES}
+
+            Current interview session : Focus on {session['tech_stack']} technologies
+{_LEGACY_STYLE}
+            Generate only the next question, nothing else."""
+
+
+def legacy_messages(session, max_questions):
+    """Old message list: a fresh 6 KB SystemMessage plus a fixed HumanMessage"""
+    from langchain_core.messages import HumanMessage, SystemMessage
+    return [
+        SystemMessage(content=legacy_prompt(session, max_questions)),
+        HumanMessage(content="Generate the next interview question."),
+    ]
+
+
+def make_session():
+    history = []
+    for i in range(6):
+        history.append({"role": "interviewer", "content": f"Question {i}: how does the event loop schedule callbacks?"})
+        history.append({"role": "candidate", "content": "It keeps a queue of ready callbacks and runs them in order. " * 3})
+    return {
+        "tech_stack": "Python, JavaScript, React",
+        "position": "Software Developer",
+        "question_count": 3,
+        "difficulty": "beginner",
+        "conversation_history": history,
+        "is_complete": False,
+    }
+
+
+def timed(fn, turns, repeat=5):
+    """Best per-call time in microseconds over `repeat` runs of `turns` calls"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(turns):
+            fn()
+        best = min(best, time.perf_counter() - start)
+    return best / turns * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=20000)
+    args = parser.parse_args()
+
+    session = make_session()
+    resident = InterviewSession.from_dict(session)
+    interviewer = TechInterviewer(llm=SimpleNamespace())
+    last_four = resident.conversation_history[-4:]
+
+    before = legacy_prompt(session, interviewer.max_questions)
+    after = interviewer._question_messages(resident, "", last_four)
+    windowed = interviewer._build_question_messages("bench", resident)
+
+    before_us = timed(lambda: legacy_messages(session, interviewer.max_questions), args.turns)
+    after_us = timed(lambda: interviewer._question_messages(resident, "", last_four), args.turns)
+    fit_us = timed(lambda: interviewer.context_window.fit("bench", resident.conversation_history), args.turns)
+    windowed_us = timed(lambda: interviewer._build_question_messages("bench", resident), args.turns)
+
+    static_tokens = estimate_tokens(STATIC_SYSTEM_PROMPT)
+    dynamic_tokens = estimate_tokens(after[1].content)
+    windowed_tokens = estimate_tokens(windowed[1].content)
+
+    print(f"{'':8s} {'assembly/turn':>14s} {'prompt tokens':>14s} {'cacheable':>10s} {'rebuilt':>8s}")
+    print(f"{'before':8s} {before_us:11.2f} us {estimate_tokens(before):14d} {0:10d} {estimate_tokens(before):8d}")
+    print(f"{'after':8s} {after_us:11.2f} us {static_tokens + dynamic_tokens:14d} {static_tokens:10d} {dynamic_tokens:8d}")
+    print(f"{'fit':8s} {fit_us:11.2f} us")
+    print(f"{'windowed':8s} {windowed_us:11.2f} us {static_tokens + windowed_tokens:14d} {static_tokens:10d} "
+          f"{windowed_tokens:8d}")
+
+if __name__ == "__main__":
+    main()
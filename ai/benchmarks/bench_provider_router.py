@@ -0,0 +1,105 @@
+"""
+Tail latency and failover of ProviderRouter against local fake providers.
+
+Scenarios (all offline, FakeChatModel):
+  * tail:    a heavy-tailed primary (lognormal) and a steadier secondary;
+             compares p50/p99 of the primary alone, routed without hedging,
+             and routed with p95 hedging.
+  * outage:  the primary fails every request; shows the circuit opening so
+             later calls go straight to the secondary instead of paying for
+             a failed attempt each time.
+
+Usage:
+    python benchmarks/bench_provider_router.py --calls 300 --concurrency 20
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+AI_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, AI_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_chat_model import FakeChatModel  # noqa: E402
+from provider_router import ProviderRouter  # noqa: E402
+
+
+async def run(llm, calls, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, errors = [], 0
+
+    async def one(i):
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await llm.ainvoke(f"question {i}")
+            except Exception:
+                errors += 1
+                return
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(one(i) for i in range(calls)))
+    return latencies, errors
+
+
+def report(name, latencies, errors):
+    ordered = sorted(latencies) or [0.0]
+    p99 = ordered[min(len(ordered) - 1, int(0.99 * len(ordered)))]
+    print(f"{name:<22} p50 {statistics.median(ordered) * 1000:7.1f} ms   p99 {p99 * 1000:7.1f} ms"
+          f"   max {ordered[-1] * 1000:7.1f} ms   errors {errors}")
+
+
+def providers(seed, primary_failure_rate=0.0):
+    primary = FakeChatModel(latency="lognormal", latency_mean=0.05, latency_spread=1.0,
+                            failure_rate=primary_failure_rate, seed=seed, model_name="primary")
+    secondary = FakeChatModel(latency="uniform", latency_mean=0.08, latency_spread=0.02,
+                              seed=seed + 1, model_name="secondary")
+    return primary, secondary
+
+
+async def tail(args):
+    print("== tail latency ==")
+    primary, _ = providers(args.seed)
+    report("primary only", *await run(primary, args.calls, args.concurrency))
+
+    router = ProviderRouter(list(zip(("primary", "secondary"), providers(args.seed))), hedge=False)
+    report("routed, no hedge", *await run(router, args.calls, args.concurrency))
+
+    router = ProviderRouter(list(zip(("primary", "secondary"), providers(args.seed))),
+                            initial_hedge_delay=args.initial_hedge_delay)
+    # Warm the latency window so the hedge delay comes from the primary's p95
+    await run(router, 50, args.concurrency)
+    report("routed, hedged", *await run(router, args.calls, args.concurrency))
+    for name, stats in router.stats().items():
+        print(f"  {name}: {stats}")
+
+
+async def outage(args):
+    print("== primary outage ==")
+    router = ProviderRouter(list(zip(("primary", "secondary"), providers(args.seed, primary_failure_rate=1.0))),
+                            reset_timeout=60)
+    report("routed, failing primary", *await run(router, args.calls, args.concurrency))
+    for name, stats in router.stats().items():
+        print(f"  {name}: {stats}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--initial-hedge-delay", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    asyncio.run(tail(args))
+    print()
+    asyncio.run(outage(args))
+
+
+if __name__ == "__main__":
+    main()
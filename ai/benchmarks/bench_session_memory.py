@@ -0,0 +1,74 @@
+"""
+Memory held by N resident interview sessions: dict-of-dicts vs __slots__ records.
+
+Each session carries a full 5-question transcript (11 turns). Message text is
+shared between sessions so the numbers isolate the per-object container
+overhead that the session representation controls.
+
+Usage:
+    python benchmarks/bench_session_memory.py --sessions 10000
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from session_models import InterviewSession, Role  # noqa: E402
+
+QUESTION = "Can you explain how you would design a caching layer for this API?"
+ANSWER = "I would put Redis in front of the database and invalidate keys on writes."
+
+
+def build_dict_session():
+    history = [{"role": "interviewer", "content": QUESTION}]
+    for _ in range(5):
+        history.append({"role": "candidate", "content": ANSWER})
+        history.append({"role": "interviewer", "content": QUESTION})
+    return {
+        "tech_stack": "Python, JavaScript, React",
+        "position": "Software Developer",
+        "question_count": 5,
+        "difficulty": "beginner",
+        "conversation_history": history,
+        "is_complete": True,
+    }
+
+
+def build_slots_session():
+    session = InterviewSession("Python, JavaScript, React", "Software Developer", question_count=5, is_complete=True)
+    session.add_turn(Role.interviewer, QUESTION)
+    for _ in range(5):
+        session.add_turn(Role.candidate, ANSWER)
+        session.add_turn(Role.interviewer, QUESTION)
+    return session
+
+
+def measure(builder, count):
+    gc.collect()
+    tracemalloc.start()
+    sessions = {f"{i:08x}": builder() for i in range(count)}
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del sessions
+    return current
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=10000)
+    args = parser.parse_args()
+
+    before = measure(build_dict_session, args.sessions)
+    after = measure(build_slots_session, args.sessions)
+
+    for label, size in (("dict", before), ("slots", after)):
+        print(f"{label:6s} {size / 2**20:8.2f} MiB total  {size / args.sessions:8.0f} B/session")
+    print(f"saved  {(before - after) / 2**20:8.2f} MiB ({1 - after / before:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Cold-start cost of the interview agents, measured in fresh interpreters.
+
+For each agent this reports:
+  * import time of the agent module, from `python -X importtime` (top-level
+    imports summed, plus the slowest modules), and
+  * wall time from launching the interpreter until the first question is
+    printed (import, TechInterviewer(), start_interview()).
+
+--eager also imports the LLM provider up front, which is what the agents used
+to do at import/construction time, so the two numbers can be compared.
+
+Usage:
+    python benchmarks/bench_startup.py --runs 5
+    python benchmarks/bench_startup.py --runs 5 --eager --top 15
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+AI_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_SNIPPETS = {
+    "interview": "import InterviewAgent as agent",
+    "questions": (
+        "import importlib.util, sys\n"
+        "spec = importlib.util.spec_from_file_location('questions_agent', 'questions-agent.py')\n"
+        "agent = importlib.util.module_from_spec(spec)\n"
+        "sys.modules['questions_agent'] = agent\n"
+        "spec.loader.exec_module(agent)"
+    ),
+}
+
+EAGER_SNIPPET = "import providers\nproviders.chat_model_class()\nproviders.retry_errors()\n"
+
+# questions-agent prints the opening question itself; InterviewAgent returns it
+FIRST_QUESTION_SNIPPET = """
+{eager}{import_agent}
+interviewer = agent.TechInterviewer()
+session_id, first = interviewer.start_interview("Python, Go", "Backend Developer")
+if isinstance(first, str):
+    print("Interviewer:", first)
+"""
+
+FIRST_QUESTION_MARKER = "Interviewer:"
+
+
+def _env():
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1", PYTHONIOENCODING="utf-8")
+    env.setdefault("GROQ_API_KEY", "offline-startup-benchmark")
+    return env
+
+
+def run_python(code, *flags):
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        cwd=AI_DIR, env=_env(), capture_output=True, text=True, check=True,
+    )
+
+
+def import_profile(code):
+    """(total microseconds, [(cumulative us, module), ...]) from -X importtime"""
+    result = run_python(code, "-X", "importtime")
+    total = 0
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        cumulative = int(cumulative_us)
+        if not name.startswith("  "):
+            # Top-level import of the snippet (nested ones are indented)
+            total += cumulative
+            modules.append((cumulative, name.strip()))
+    return total, sorted(modules, reverse=True)
+
+
+def first_question_seconds(code, runs):
+    """Median wall time, interpreter start included, until the first question is printed"""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        process = subprocess.Popen(
+            [sys.executable, "-u", "-c", code],
+            cwd=AI_DIR, env=_env(), stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+        )
+        elapsed = None
+        for line in process.stdout:
+            if elapsed is None and FIRST_QUESTION_MARKER in line:
+                elapsed = time.perf_counter() - start
+        if process.wait() != 0 or elapsed is None:
+            raise RuntimeError("agent exited without printing the first question")
+        times.append(elapsed)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--agent", choices=("interview", "questions", "both"), default="both")
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per measurement")
+    parser.add_argument("--top", type=int, default=8, help="slowest top-level imports to list")
+    parser.add_argument("--eager", action="store_true", help="also measure with the provider imported up front")
+    args = parser.parse_args()
+
+    agents = ("interview", "questions") if args.agent == "both" else (args.agent,)
+    variants = [("lazy", "")] + ([("eager", EAGER_SNIPPET)] if args.eager else [])
+
+    for name in agents:
+        for variant, eager in variants:
+            code = FIRST_QUESTION_SNIPPET.format(eager=eager, import_agent=IMPORT_SNIPPETS[name])
+            total_us, modules = import_profile(eager + IMPORT_SNIPPETS[name])
+            seconds = first_question_seconds(code, args.runs)
+            print(f"{name:9s} {variant:5s}  imports {total_us / 1000:8.1f} ms   "
+                  f"to first question {seconds * 1000:8.1f} ms (median of {args.runs})")
+            for cumulative, module in modules[:args.top]:
+                print(f"    {cumulative / 1000:8.1f} ms  {module}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+Deterministic offline chat model for benchmarks and load tests.
+
+FakeChatModel is a real LangChain BaseChatModel, so it goes through the same
+invoke/ainvoke/stream/astream machinery, callbacks (llm_metrics) and
+with_retry wrappers as ChatGroq, but it never touches the network:
+
+    llm = FakeChatModel(latency="lognormal", latency_mean=0.4, tokens_per_second=80,
+                        failure_rate=0.02, seed=7)
+
+Latency is the time to first token, drawn from the configured distribution;
+the rest of the response is then paced at `tokens_per_second`. Responses,
+latencies and injected failures come from a seeded RNG, so a run is
+reproducible for a given seed and call order.
+"""
+
+import asyncio
+import math
+import random
+import threading
+import time
+from typing import Any, List
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from pydantic import PrivateAttr
+
+DEFAULT_RESPONSES = (
+    "Good. Can you walk me through how you would test that?",
+    "That makes sense. How would you handle the same problem under heavy load?",
+    "Interesting choice. What trade-offs did you consider against the alternatives?",
+    "Let's go a bit deeper: how would you debug it if it failed only in production?",
+    "Nice. How would you structure that code so another engineer can extend it?",
+)
+
+
+class FakeLLMError(RuntimeError):
+    """Injected provider failure"""
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    Args:
+        responses (list[str]): Replies, picked at random per call.
+        latency (str): "fixed", "uniform", "exponential" or "lognormal".
+        latency_mean (float): Mean time to first token in seconds.
+        latency_spread (float): Half-width for "uniform", sigma for "lognormal".
+        tokens_per_second (float): Output pacing after the first token; 0 disables it.
+        failure_rate (float): Probability that a call raises FakeLLMError before answering.
+        seed (int): RNG seed.
+    """
+
+    responses: List[str] = list(DEFAULT_RESPONSES)
+    latency: str = "fixed"
+    latency_mean: float = 0.25
+    latency_spread: float = 0.5
+    tokens_per_second: float = 0.0
+    failure_rate: float = 0.0
+    seed: int = 0
+    model_name: str = "fake-chat"
+
+    _rng: Any = PrivateAttr(default=None)
+    _rng_lock: Any = PrivateAttr(default=None)
+
+    def model_post_init(self, __context):
+        self._rng = random.Random(self.seed)
+        self._rng_lock = threading.Lock()
+
+    @property
+    def _llm_type(self):
+        return "fake-chat"
+
+    @property
+    def _identifying_params(self):
+        return {"model_name": self.model_name, "latency": self.latency, "latency_mean": self.latency_mean}
+
+    def _get_ls_params(self, stop=None, **kwargs):
+        params = super()._get_ls_params(stop=stop, **kwargs)
+        params["ls_provider"] = "fake"
+        params["ls_model_name"] = self.model_name
+        return params
+
+    # Call plan: everything random is drawn up front under one lock
+
+    def _plan(self):
+        with self._rng_lock:
+            rng = self._rng
+            if self.latency == "uniform":
+                delay = rng.uniform(self.latency_mean - self.latency_spread, self.latency_mean + self.latency_spread)
+            elif self.latency == "exponential":
+                delay = rng.expovariate(1 / self.latency_mean) if self.latency_mean > 0 else 0.0
+            elif self.latency == "lognormal":
+                # mu chosen so that the distribution mean equals latency_mean
+                sigma = self.latency_spread
+                mu = math.log(self.latency_mean) - sigma * sigma / 2 if self.latency_mean > 0 else 0.0
+                delay = rng.lognormvariate(mu, sigma) if self.latency_mean > 0 else 0.0
+            else:
+                delay = self.latency_mean
+            fail = rng.random() < self.failure_rate
+            text = rng.choice(self.responses)
+        return max(delay, 0.0), fail, text
+
+    def _tokens(self, text):
+        # Whitespace-split "tokens" that join back to the original text
+        words = text.split(" ")
+        return [word if i == 0 else " " + word for i, word in enumerate(words)]
+
+    def _token_delay(self):
+        return 1 / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+
+    def _usage(self, messages, text):
+        input_tokens = sum((len(str(m.content)) + 3) // 4 for m in messages)
+        output_tokens = len(self._tokens(text))
+        return {"input_tokens": input_tokens, "output_tokens": output_tokens,
+                "total_tokens": input_tokens + output_tokens}
+
+    def _result(self, messages, text):
+        message = AIMessage(content=text, usage_metadata=self._usage(messages, text))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    # BaseChatModel hooks
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        delay, fail, text = self._plan()
+        time.sleep(delay)
+        if fail:
+            raise FakeLLMError("injected failure")
+        time.sleep(self._token_delay() * max(len(self._tokens(text)) - 1, 0))
+        return self._result(messages, text)
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        delay, fail, text = self._plan()
+        await asyncio.sleep(delay)
+        if fail:
+            raise FakeLLMError("injected failure")
+        await asyncio.sleep(self._token_delay() * max(len(self._tokens(text)) - 1, 0))
+        return self._result(messages, text)
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        delay, fail, text = self._plan()
+        time.sleep(delay)
+        if fail:
+            raise FakeLLMError("injected failure")
+        for chunk in self._chunks(messages, text):
+            if run_manager:
+                run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+            time.sleep(self._token_delay())
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        delay, fail, text = self._plan()
+        await asyncio.sleep(delay)
+        if fail:
+            raise FakeLLMError("injected failure")
+        for chunk in self._chunks(messages, text):
+            if run_manager:
+                await run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+            await asyncio.sleep(self._token_delay())
+
+    def _chunks(self, messages, text):
+        tokens = self._tokens(text)
+        usage = self._usage(messages, text)
+        for i, token in enumerate(tokens):
+            # Usage is reported once, on the last chunk, like the OpenAI-compatible providers
+            last = i == len(tokens) - 1
+            yield ChatGenerationChunk(message=AIMessageChunk(content=token, usage_metadata=usage if last else None))
@@ -0,0 +1,325 @@
+"""
+Offline load test for both interview agents against FakeChatModel.
+
+Scripted candidates answer every question of an interview across N concurrent
+sessions; no network or API key is needed. Reports turns/s, per-turn latency
+percentiles, LLM fallbacks, peak RSS and allocation counts, so regressions in
+the Python hot path show up without a live provider. Use --latency-mean 0 to
+measure pure agent overhead.
+
+Usage:
+    python benchmarks/load_test.py --agent interview --sessions 200 --mode async
+    python benchmarks/load_test.py --agent questions --sessions 20 --latency lognormal
+    python benchmarks/load_test.py --latency-mean 0 --json > baseline.json
+    python benchmarks/load_test.py --latency-mean 0 --baseline baseline.json --tolerance 0.2
+
+Peak RSS is the process high-water mark, so run one --agent per process when
+comparing it between runs.
+"""
+
+import argparse
+import asyncio
+import gc
+import importlib.util
+import json
+import os
+import resource
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+AI_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, AI_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_chat_model import FakeChatModel  # noqa: E402
+from llm_metrics import LLMMetrics  # noqa: E402
+
+# One scripted candidate per entry, cycled across sessions
+CANDIDATES = [
+    [
+        "I have four years of Python, mostly Django services and some data pipelines.",
+        "A generator yields values lazily, so you can stream a large file without loading it.",
+        "I would profile with cProfile first, then cache the hot queries in Redis.",
+        "Threads share memory but the GIL limits CPU work; processes avoid that at a copy cost.",
+        "I would add an index on the filtered column and confirm it with EXPLAIN ANALYZE.",
+    ],
+    [
+        "I mostly work on React frontends with a small Node.js backend.",
+        "I don't know.",
+        "Maybe useEffect with an empty dependency list?",
+        "I would memoize the expensive component and avoid re-creating callbacks.",
+        "Not sure, probably by splitting the bundle.",
+    ],
+    [
+        "Backend developer, Go and PostgreSQL, previously some Java.",
+        "Channels pass ownership of data between goroutines, so you avoid shared locks. " * 6,
+        "I'd use context cancellation and a worker pool with bounded concurrency.",
+        "Connection pooling and prepared statements, then look at the slow query log.",
+        "Blue/green deploys with health checks and an automatic rollback.",
+    ],
+]
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(q * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def peak_rss_mib():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class Recorder:
+    """Per-turn latencies, collected from any thread"""
+
+    def __init__(self):
+        self.latencies = []
+        self._lock = threading.Lock()
+
+    def add(self, seconds):
+        with self._lock:
+            self.latencies.append(seconds)
+
+
+# Scenarios
+
+def run_interview_agent(llm, args, recorder):
+    from InterviewAgent import TechInterviewer
+    from context_window import ContextWindow, LLMSummarizer
+
+    metrics = LLMMetrics()
+    response_cache = None
+    if args.response_cache:
+        from response_cache import SemanticResponseCache
+        response_cache = SemanticResponseCache()
+    # The answer filter is off: candidate 2's "I don't know." would be answered locally, leaving
+    # that interview a question short and the turn out of the LLM-path latencies
+    interviewer = TechInterviewer(
+        llm=llm, metrics=metrics, context_window=ContextWindow(summarizer=LLMSummarizer(llm, metrics=metrics)),
+        response_cache=response_cache, answer_filter=False,
+    )
+
+    def candidate_sync(index):
+        session_id, _ = interviewer.start_interview("Python, Go, PostgreSQL", "Backend Developer")
+        for answer in script(index, args.turns):
+            start = time.perf_counter()
+            if args.mode == "stream":
+                for _ in interviewer.process_answer_stream(session_id, answer):
+                    pass
+            else:
+                interviewer.process_answer(session_id, answer)
+            recorder.add(time.perf_counter() - start)
+
+    async def candidate_async(index):
+        session_id, _ = await interviewer.astart_interview("Python, Go, PostgreSQL", "Backend Developer")
+        for answer in script(index, args.turns):
+            start = time.perf_counter()
+            if args.mode == "astream":
+                async for _ in interviewer.aprocess_answer_stream(session_id, answer):
+                    pass
+            else:
+                await interviewer.aprocess_answer(session_id, answer)
+            recorder.add(time.perf_counter() - start)
+
+    if args.mode in ("async", "astream"):
+        async def run_all():
+            await asyncio.gather(*(candidate_async(i) for i in range(args.sessions)))
+        asyncio.run(run_all())
+    else:
+        with ThreadPoolExecutor(max_workers=args.threads or args.sessions) as pool:
+            list(pool.map(candidate_sync, range(args.sessions)))
+    return metrics
+
+
+def load_questions_agent():
+    """Import questions-agent.py (hyphenated file name) as a module"""
+    spec = importlib.util.spec_from_file_location("questions_agent", os.path.join(AI_DIR, "questions-agent.py"))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["questions_agent"] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def run_questions_agent(llm, args, recorder):
+    from context_window import ContextWindow, LLMSummarizer
+
+    agent = load_questions_agent()
+    metrics = LLMMetrics()
+    interviewer = agent.TechInterviewer(
+        llm=llm, metrics=metrics, context_window=ContextWindow(summarizer=LLMSummarizer(llm, metrics=metrics)),
+        answer_filter=False,
+    )
+
+    def candidate(index):
+        session_id, chain = interviewer.start_interview("Python, Go, PostgreSQL", "Backend Developer")
+        for answer in script(index, args.turns):
+            start = time.perf_counter()
+            interviewer.ask_question(session_id, chain, answer)
+            recorder.add(time.perf_counter() - start)
+
+    with ThreadPoolExecutor(max_workers=args.threads or args.sessions) as pool:
+        list(pool.map(candidate, range(args.sessions)))
+    agent.transcript_logs().close()
+    return metrics
+
+
+def script(index, turns):
+    answers = CANDIDATES[index % len(CANDIDATES)]
+    return [answers[i % len(answers)] for i in range(turns)]
+
+
+def silence_stdout():
+    """The agents print banners on every session; keep the report readable"""
+    sys.stdout.flush()
+    saved = os.dup(1)
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, 1)
+    os.close(devnull)
+    return saved
+
+
+def restore_stdout(saved):
+    sys.stdout.flush()
+    os.dup2(saved, 1)
+    os.close(saved)
+
+
+def run(args):
+    llm = FakeChatModel(
+        latency=args.latency,
+        latency_mean=args.latency_mean,
+        latency_spread=args.latency_spread,
+        tokens_per_second=args.tokens_per_second,
+        failure_rate=args.failure_rate,
+        seed=args.seed,
+    )
+    scenario = run_interview_agent if args.agent == "interview" else run_questions_agent
+    recorder = Recorder()
+
+    workdir = tempfile.TemporaryDirectory(prefix="load_test_")
+    cwd = os.getcwd()
+    os.chdir(workdir.name)
+    if args.tracemalloc:
+        tracemalloc.start()
+    gc.collect()
+    blocks_before = sys.getallocatedblocks()
+    collections_before = sum(stat["collections"] for stat in gc.get_stats())
+
+    saved = silence_stdout() if not args.verbose else None
+    start = time.perf_counter()
+    try:
+        metrics = scenario(llm, args, recorder)
+    finally:
+        elapsed = time.perf_counter() - start
+        if saved is not None:
+            restore_stdout(saved)
+        os.chdir(cwd)
+
+    traced_peak = tracemalloc.get_traced_memory()[1] if args.tracemalloc else None
+    if args.tracemalloc:
+        tracemalloc.stop()
+    calls = metrics.to_dict()["series"]
+    latencies = sorted(recorder.latencies)
+    report = {
+        "agent": args.agent,
+        "mode": args.mode if args.agent == "interview" else "threads",
+        "sessions": args.sessions,
+        "turns": len(latencies),
+        "elapsed_seconds": round(elapsed, 4),
+        "turns_per_second": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            name: round(percentile(latencies, q) * 1000, 3)
+            for name, q in (("p50", 0.5), ("p90", 0.9), ("p95", 0.95), ("p99", 0.99), ("max", 1.0))
+        },
+        "llm_calls": sum(series["calls"] for series in calls),
+        "llm_retries": sum(series["retries"] for series in calls),
+        "llm_fallbacks": sum(series["fallbacks"] for series in calls),
+        "response_cache_hits": sum(
+            sample["value"] for sample in metrics.to_dict().get("response_cache", ())
+            if sample["metric"] == "response_cache_hits_total"
+        ),
+        "peak_rss_mib": round(peak_rss_mib(), 1),
+        "allocated_blocks_delta": sys.getallocatedblocks() - blocks_before,
+        "gc_collections": sum(stat["collections"] for stat in gc.get_stats()) - collections_before,
+        "tracemalloc_peak_mib": round(traced_peak / (1024 * 1024), 2) if traced_peak is not None else None,
+    }
+    workdir.cleanup()
+    return report
+
+
+def print_report(report):
+    latency = report["latency_ms"]
+    print(f"{report['agent']} agent ({report['mode']}): {report['sessions']} sessions, {report['turns']} turns "
+          f"in {report['elapsed_seconds']:.2f}s -> {report['turns_per_second']:.1f} turns/s")
+    print(f"  turn latency ms  p50 {latency['p50']:.2f}  p90 {latency['p90']:.2f}  p95 {latency['p95']:.2f}"
+          f"  p99 {latency['p99']:.2f}  max {latency['max']:.2f}")
+    print(f"  llm calls {report['llm_calls']}  retries {report['llm_retries']}  fallbacks {report['llm_fallbacks']}"
+          f"  response cache hits {report['response_cache_hits']}")
+    print(f"  peak RSS {report['peak_rss_mib']:.1f} MiB  allocated blocks +{report['allocated_blocks_delta']}"
+          f"  gc collections {report['gc_collections']}")
+    if report["tracemalloc_peak_mib"] is not None:
+        print(f"  tracemalloc peak {report['tracemalloc_peak_mib']:.2f} MiB")
+
+
+def compare(report, baseline, tolerance):
+    """Regressions beyond `tolerance` (fraction) against a previous --json report"""
+    problems = []
+    if report["turns_per_second"] < baseline["turns_per_second"] * (1 - tolerance):
+        problems.append(f"turns/s {report['turns_per_second']} < baseline {baseline['turns_per_second']}")
+    for name in ("p50", "p95", "p99"):
+        limit = baseline["latency_ms"][name] * (1 + tolerance)
+        if report["latency_ms"][name] > limit:
+            problems.append(f"{name} {report['latency_ms'][name]} ms > baseline {baseline['latency_ms'][name]} ms")
+    if report["peak_rss_mib"] > baseline["peak_rss_mib"] * (1 + tolerance):
+        problems.append(f"peak RSS {report['peak_rss_mib']} MiB > baseline {baseline['peak_rss_mib']} MiB")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--agent", choices=("interview", "questions"), default="interview")
+    parser.add_argument("--mode", choices=("async", "astream", "threads", "stream"), default="async",
+                        help="InterviewAgent API to drive (questions-agent always uses threads)")
+    parser.add_argument("--sessions", type=int, default=100, help="concurrent candidate sessions")
+    parser.add_argument("--turns", type=int, default=5, help="answers per session")
+    parser.add_argument("--threads", type=int, default=0, help="worker threads for sync modes (default: one per session)")
+    parser.add_argument("--latency", choices=("fixed", "uniform", "exponential", "lognormal"), default="fixed")
+    parser.add_argument("--latency-mean", type=float, default=0.05, help="mean time to first token in seconds")
+    parser.add_argument("--latency-spread", type=float, default=0.5)
+    parser.add_argument("--tokens-per-second", type=float, default=0.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--response-cache", action="store_true",
+                        help="put a SemanticResponseCache in front of InterviewAgent question generation")
+    parser.add_argument("--tracemalloc", action="store_true", help="also trace Python allocations (slower)")
+    parser.add_argument("--verbose", action="store_true", help="keep the agents' console output")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    parser.add_argument("--baseline", help="JSON report to compare against; exits 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    report = run(args)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            problems = compare(report, json.load(f), args.tolerance)
+        for problem in problems:
+            print(f"REGRESSION: {problem}", file=sys.stderr)
+        if problems:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
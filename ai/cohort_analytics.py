@@ -0,0 +1,406 @@
+"""
+Columnar cohort analytics over evaluation results.
+
+An EvaluationWorkFlowState is one nested object per candidate, so cohort
+questions ("where does this candidate rank on technical depth?", "which gaps
+come up most for backend candidates?") meant a Python loop over every state.
+CohortTable packs many evaluations once into NumPy arrays:
+
+  * candidates:   one row per candidate: id, position and the score fields;
+  * skills:       long table (candidate, skill, proficiency, confidence);
+  * technologies: long table (candidate, technology) from the tech stack;
+  * gaps:         long table (candidate, gap) from technical_knowledge_gaps.
+
+Text columns are dictionary-encoded (int32 codes + a label list), so ranks,
+distributions and frequencies are sorts and bincounts over whole columns.
+
+    table = CohortTable.from_jsonl("evaluations/evaluations.jsonl")
+    table.percentile_rank("overall_score")        # one value per candidate
+    table.distribution("technical_depth_score", by="position")
+    table.skill_gap_frequency(top=10)
+    table.write_parquet("evaluations/cohort")     # needs pyarrow
+
+    python cohort_analytics.py evaluations/evaluations.jsonl --parquet evaluations/cohort
+"""
+
+import argparse
+import json
+import os
+
+import numpy as np
+
+from evaluator_schema.schema import ConfidenceLevel, ProficiencyLevel
+
+SCORE_FIELDS = (
+    "overall_score",
+    "technical_depth_score",
+    "technical_consistency_score",
+    "problem_solving_score",
+    "analytical_thinking_score",
+    "debugging_potential_score",
+)
+
+PROFICIENCY_LEVELS = [level.value for level in ProficiencyLevel]
+CONFIDENCE_LEVELS = [level.value for level in ConfidenceLevel]
+
+# Tables and the label list their code columns index into
+_CODED = {
+    ("candidates", "position"): "position",
+    ("skills", "skill"): "skill",
+    ("technologies", "technology"): "technology",
+    ("gaps", "gap"): "gap",
+}
+
+
+class _Encoder:
+    """Dictionary-encodes free text; spellings differing only in case/spacing share a code"""
+
+    def __init__(self):
+        self.codes = {}
+        self.labels = []
+
+    def __call__(self, text):
+        key = " ".join(str(text).split()).casefold()
+        code = self.codes.get(key)
+        if code is None:
+            code = self.codes[key] = len(self.labels)
+            self.labels.append(" ".join(str(text).split()))
+        return code
+
+
+def _field(state, name, default=None):
+    return state.get(name, default) if isinstance(state, dict) else getattr(state, name, default)
+
+
+def _value(level):
+    return getattr(level, "value", level)
+
+
+class CohortTable:
+    """
+    Evaluations of a cohort as NumPy columns.
+
+    Args:
+        tables (dict): {"candidates" | "skills" | "technologies" | "gaps": {column: array}};
+            candidate columns in the long tables are row indexes into "candidates".
+        labels (dict): {"position" | "skill" | "technology" | "gap": [label, ...]}.
+    """
+
+    def __init__(self, tables, labels):
+        self.tables = tables
+        self.labels = labels
+        self.candidates = tables["candidates"]
+        self.skills = tables["skills"]
+        self.technologies = tables["technologies"]
+        self.gaps = tables["gaps"]
+
+    @classmethod
+    def from_states(cls, states, completed_only=True):
+        """
+        Pack EvaluationWorkFlowState objects (or their dicts). This is the one
+        pass over Python objects; everything after it works on the arrays.
+        """
+        positions, skills, technologies, gaps = _Encoder(), _Encoder(), _Encoder(), _Encoder()
+        proficiency = {level: i for i, level in enumerate(PROFICIENCY_LEVELS)}
+        confidence = {level: i for i, level in enumerate(CONFIDENCE_LEVELS)}
+
+        ids, position_codes = [], []
+        scores = {name: [] for name in SCORE_FIELDS}
+        skill_rows, technology_rows, gap_rows = [], [], []
+        for state in states:
+            if completed_only and _field(state, "current_step") != "completed":
+                continue
+            row = len(ids)
+            interview_data = _field(state, "interview_data") or {}
+            ids.append(_field(state, "candidate_id") or interview_data.get("session_id") or str(row))
+            position_codes.append(positions(
+                _field(state, "position_evaluated_for") or interview_data.get("position") or "unknown"))
+            for name in SCORE_FIELDS:
+                scores[name].append(_field(state, name, 0) or 0)
+
+            for skill in _field(state, "technical_skills") or ():
+                skill_rows.append((
+                    row,
+                    skills(_field(skill, "skill_name")),
+                    proficiency.get(_value(_field(skill, "proficiency_level")), -1),
+                    confidence.get(_value(_field(skill, "confidence")), -1),
+                ))
+            stack = interview_data.get("tech_stack") or ""
+            for code in {technologies(tech) for tech in stack.split(",") if tech.strip()}:
+                technology_rows.append((row, code))
+            # A gap listed twice by the same evaluation is counted once
+            for code in {gaps(gap) for gap in _field(state, "technical_knowledge_gaps") or () if str(gap).strip()}:
+                gap_rows.append((row, code))
+
+        def columns(rows, names, dtypes):
+            data = np.array(rows, dtype=np.int64).reshape(-1, len(names))
+            return {name: data[:, i].astype(dtype) for i, (name, dtype) in enumerate(zip(names, dtypes))}
+
+        candidates = {"candidate_id": np.array(ids, dtype=str), "position": np.array(position_codes, dtype=np.int32)}
+        candidates.update({name: np.array(values, dtype=np.float64) for name, values in scores.items()})
+        tables = {
+            "candidates": candidates,
+            "skills": columns(skill_rows, ("candidate", "skill", "proficiency", "confidence"),
+                              (np.int32, np.int32, np.int8, np.int8)),
+            "technologies": columns(technology_rows, ("candidate", "technology"), (np.int32, np.int32)),
+            "gaps": columns(gap_rows, ("candidate", "gap"), (np.int32, np.int32)),
+        }
+        labels = {
+            "position": positions.labels,
+            "skill": skills.labels,
+            "technology": technologies.labels,
+            "gap": gaps.labels,
+        }
+        return cls(tables, labels)
+
+    @classmethod
+    def from_jsonl(cls, path, completed_only=True):
+        """From a JSONL file of states or batch records (see evaluator_schema.bulk)"""
+        from evaluator_schema.bulk import iter_states
+        return cls.from_states(iter_states(path), completed_only=completed_only)
+
+    def __len__(self):
+        return len(self.candidates["candidate_id"])
+
+    def index_of(self, candidate_id):
+        """Row of a candidate; KeyError if it is not in the cohort"""
+        rows = np.flatnonzero(self.candidates["candidate_id"] == candidate_id)
+        if not len(rows):
+            raise KeyError(candidate_id)
+        return int(rows[0])
+
+    def _groups(self, by):
+        """(candidate rows, group codes, group labels) of a grouping column"""
+        if by == "position":
+            return np.arange(len(self), dtype=np.int32), self.candidates["position"], self.labels["position"]
+        if by == "technology":
+            return self.technologies["candidate"], self.technologies["technology"], self.labels["technology"]
+        raise ValueError(f"Unknown grouping {by!r}; expected 'position' or 'technology'")
+
+    def percentile_rank(self, field):
+        """
+        Percentile rank (0-100) of every candidate on a score: the share of the
+        cohort scoring below, plus half of those tied with it.
+        """
+        values = self.candidates[field]
+        n = len(values)
+        if not n:
+            return np.zeros(0)
+        # Sort once; a run of equal values spans [start, end) of the sorted order
+        order = np.argsort(values)
+        ordered = values[order]
+        new_run = np.empty(n, dtype=bool)
+        new_run[0] = True
+        np.not_equal(ordered[1:], ordered[:-1], out=new_run[1:])
+        starts = np.flatnonzero(new_run)
+        ends = np.append(starts[1:], n)
+        ranks = np.empty(n)
+        ranks[order] = (starts + ends)[np.cumsum(new_run) - 1] * (50.0 / n)
+        return ranks
+
+    def rank_of(self, candidate_id, fields=SCORE_FIELDS):
+        """{field: percentile rank} of one candidate"""
+        row = self.index_of(candidate_id)
+        ranks = {}
+        for field in fields:
+            values = self.candidates[field]
+            value = values[row]
+            ranks[field] = float(((values < value).sum() + (values <= value).sum()) * 50.0 / len(values))
+        return ranks
+
+    def top(self, field, n=10):
+        """(candidate_id, score) of the n best candidates on a score"""
+        values = self.candidates[field]
+        n = min(n, len(values))
+        if not n:
+            return []
+        best = np.argpartition(-values, n - 1)[:n]
+        best = best[np.argsort(-values[best], kind="stable")]
+        return [(str(self.candidates["candidate_id"][i]), float(values[i])) for i in best]
+
+    def distribution(self, field, by="position", quantiles=(0.25, 0.5, 0.75)):
+        """
+        Summary of a score per group:
+        {label: {"count", "mean", "std", "min", "max", "p25", "p50", "p75"}}.
+        """
+        rows, groups, labels = self._groups(by)
+        values = self.candidates[field][rows].astype(np.float64)
+        counts = np.bincount(groups, minlength=len(labels))
+        sums = np.bincount(groups, weights=values, minlength=len(labels))
+        squares = np.bincount(groups, weights=values * values, minlength=len(labels))
+
+        # Sort by (group, value) once; every group is then a sorted slice
+        order = np.lexsort((values, groups))
+        ordered = values[order]
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+        result = {}
+        for code, label in enumerate(labels):
+            count = int(counts[code])
+            if not count:
+                continue
+            mean = sums[code] / count
+            segment = ordered[starts[code]:starts[code] + count]
+            summary = {
+                "count": count,
+                "mean": float(mean),
+                "std": float(np.sqrt(max(squares[code] / count - mean * mean, 0.0))),
+                "min": float(segment[0]),
+                "max": float(segment[-1]),
+            }
+            for q, value in zip(quantiles, np.quantile(segment, quantiles)):
+                summary[f"p{round(q * 100)}"] = float(value)
+            result[label] = summary
+        return result
+
+    def histogram(self, field, by="position", bins=None):
+        """
+        (group labels, bin edges, counts[group, bin]) of a score; the default
+        bins are one per integer score 0..10.
+        """
+        rows, groups, labels = self._groups(by)
+        bins = np.arange(0, 12, dtype=np.float64) if bins is None else np.asarray(bins, dtype=np.float64)
+        index = np.clip(np.searchsorted(bins, self.candidates[field][rows], side="right") - 1, 0, len(bins) - 2)
+        nbins = len(bins) - 1
+        counts = np.bincount(groups.astype(np.int64) * nbins + index, minlength=len(labels) * nbins).reshape(len(labels), nbins)
+        return labels, bins, counts
+
+    def skill_gap_frequency(self, top=20, by=None):
+        """
+        Most frequent knowledge gaps as [(gap, candidates, share of cohort)];
+        with by="position"/"technology", {group label: [...]} within each group.
+        """
+        gap_labels = self.labels["gap"]
+        if by is None:
+            counts = np.bincount(self.gaps["gap"], minlength=len(gap_labels))
+            return self._ranked(counts, gap_labels, len(self), top)
+
+        rows, groups, labels = self._groups(by)
+        ngaps = len(gap_labels)
+        group_sizes = np.bincount(groups, minlength=len(labels))
+
+        # Join (candidate, gap) with (candidate, group) on the candidate: group rows
+        # sorted by candidate, each gap row repeated once per group of its candidate
+        order = np.argsort(rows, kind="stable")
+        per_candidate = np.bincount(rows, minlength=len(self))
+        offsets = np.concatenate(([0], np.cumsum(per_candidate)[:-1]))
+        repeats = per_candidate[self.gaps["candidate"]]
+        first = np.cumsum(repeats) - repeats
+        within = np.arange(repeats.sum()) - np.repeat(first, repeats)
+        joined_groups = groups[order][np.repeat(offsets[self.gaps["candidate"]], repeats) + within]
+        joined_gaps = np.repeat(self.gaps["gap"], repeats)
+        counts = np.bincount(
+            joined_groups.astype(np.int64) * ngaps + joined_gaps, minlength=len(labels) * ngaps,
+        ).reshape(len(labels), ngaps)
+        return {
+            label: self._ranked(counts[code], gap_labels, int(group_sizes[code]), top)
+            for code, label in enumerate(labels) if group_sizes[code]
+        }
+
+    @staticmethod
+    def _ranked(counts, labels, size, top):
+        order = np.argsort(-counts, kind="stable")[:top]
+        return [(labels[i], int(counts[i]), float(counts[i]) / size if size else 0.0) for i in order if counts[i]]
+
+    def proficiency_distribution(self, top=None):
+        """{skill: {proficiency level: assessments}} for the most assessed skills"""
+        skill_labels = self.labels["skill"]
+        known = self.skills["proficiency"] >= 0
+        nlevels = len(PROFICIENCY_LEVELS)
+        counts = np.bincount(
+            self.skills["skill"][known] * nlevels + self.skills["proficiency"][known],
+            minlength=len(skill_labels) * nlevels,
+        ).reshape(len(skill_labels), nlevels)
+        order = np.argsort(-counts.sum(axis=1), kind="stable")[:top]
+        return {
+            skill_labels[i]: dict(zip(PROFICIENCY_LEVELS, counts[i].tolist()))
+            for i in order if counts[i].any()
+        }
+
+    def save(self, path):
+        """Write the arrays to one .npz file"""
+        arrays = {f"{table}.{column}": values for table, columns in self.tables.items()
+                  for column, values in columns.items()}
+        arrays["labels"] = np.array(json.dumps(self.labels))
+        np.savez_compressed(path, **arrays)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            tables = {}
+            for key in data.files:
+                if key != "labels":
+                    table, column = key.split(".", 1)
+                    tables.setdefault(table, {})[column] = data[key]
+            labels = json.loads(data["labels"].item())
+        return cls(tables, labels)
+
+    def to_arrow(self):
+        """{table name: pyarrow.Table}; code columns become dictionary arrays"""
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise ImportError("Arrow/Parquet output needs pyarrow: pip install pyarrow") from None
+
+        result = {}
+        for table, columns in self.tables.items():
+            arrays = {}
+            for column, values in columns.items():
+                label_key = _CODED.get((table, column))
+                if label_key is not None:
+                    arrays[column] = pa.DictionaryArray.from_arrays(values, pa.array(self.labels[label_key]))
+                elif (table, column) == ("skills", "proficiency"):
+                    arrays[column] = _level_array(pa, values, PROFICIENCY_LEVELS)
+                elif (table, column) == ("skills", "confidence"):
+                    arrays[column] = _level_array(pa, values, CONFIDENCE_LEVELS)
+                else:
+                    arrays[column] = pa.array(values)
+            result[table] = pa.table(arrays)
+        return result
+
+    def write_parquet(self, directory):
+        """Write <table>.parquet files (candidates, skills, technologies, gaps) to a directory"""
+        tables = self.to_arrow()
+        import pyarrow.parquet as pq
+
+        os.makedirs(directory, exist_ok=True)
+        paths = []
+        for table, data in tables.items():
+            path = os.path.join(directory, f"{table}.parquet")
+            pq.write_table(data, path)
+            paths.append(path)
+        return paths
+
+
+def _level_array(pa, codes, levels):
+    # -1 (an unknown level) becomes null
+    return pa.DictionaryArray.from_arrays(pa.array(codes, mask=codes < 0), pa.array(levels))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cohort statistics over stored evaluations")
+    parser.add_argument("source", help="JSONL of evaluation states or batch records")
+    parser.add_argument("--top", type=int, default=10, help="Knowledge gaps to list")
+    parser.add_argument("--npz", help="Also save the arrays to this .npz file")
+    parser.add_argument("--parquet", help="Also write Parquet tables to this directory (needs pyarrow)")
+    args = parser.parse_args()
+
+    table = CohortTable.from_jsonl(args.source)
+    print(f"{len(table)} evaluated candidates")
+    if not len(table):
+        return
+    for label, summary in table.distribution("overall_score").items():
+        print(f"  {label}: n={summary['count']} mean={summary['mean']:.2f} "
+              f"p25={summary['p25']:.1f} median={summary['p50']:.1f} p75={summary['p75']:.1f}")
+    print("Most frequent knowledge gaps:")
+    for gap, count, share in table.skill_gap_frequency(top=args.top):
+        print(f"  {share:6.1%}  {gap}")
+    if args.npz:
+        table.save(args.npz)
+    if args.parquet:
+        for path in table.write_parquet(args.parquet):
+            print(f"Wrote {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+"""
+Token-budgeted conversation context for the interview agents.
+
+questions-agent used to replay the whole history on every turn, while
+InterviewAgent kept only the last 4 messages. ContextWindow keeps as many
+recent messages verbatim as fit in a token budget and folds everything older
+into a running summary. The summary is cached per session and only extended
+when more messages fall out of the window, so a turn normally costs no extra
+LLM call.
+
+Messages can be session_models.Turn objects or LangChain messages; anything
+with a `.content` works.
+"""
+
+import contextlib
+import threading
+from collections import OrderedDict
+
+from prompts import estimate_tokens
+
+
+# Role -> display name, filled on first use (the roles are a handful of enum members or strings)
+_SPEAKERS = {}
+
+
+def speaker(message):
+    """Display name for a Turn or a LangChain message"""
+    role = getattr(message, "role", None)
+    if role is not None:
+        name = _SPEAKERS.get(role)
+        if name is None:
+            name = _SPEAKERS[role] = getattr(role, "value", role).title()
+        return name
+    return "Candidate" if getattr(message, "type", None) == "human" else "Interviewer"
+
+
+def render_messages(messages):
+    return "".join(f"{speaker(m)}: {m.content}\n\n" for m in messages)
+
+
+class ExtractiveSummarizer:
+    """
+    LLM-free summarizer: appends the first sentence of each folded message and
+    keeps the most recent `max_tokens` worth of lines.
+    """
+
+    def __init__(self, max_tokens=300):
+        self.max_tokens = max_tokens
+
+    def summarize(self, summary, messages, config=None):
+        lines = summary.splitlines() if summary else []
+        for message in messages:
+            first_sentence = message.content.strip().split("\n")[0].split(". ")[0][:200]
+            lines.append(f"- {speaker(message)}: {first_sentence}")
+        while len(lines) > 1 and estimate_tokens("\n".join(lines)) > self.max_tokens:
+            lines.pop(0)
+        return "\n".join(lines)
+
+    async def asummarize(self, summary, messages, config=None):
+        return self.summarize(summary, messages)
+
+
+class LLMSummarizer:
+    """
+    Updates the running summary with a chat model, falling back to ExtractiveSummarizer on errors.
+
+    With `metrics` (llm_metrics.LLMMetrics) every update is tracked as its own
+    "summarize" call, so its tokens, retries and fallbacks are not counted in
+    the question call that needed it. The session id is read from
+    config["metadata"]["session_id"].
+    """
+
+    SYSTEM_PROMPT = (
+        "You maintain a running summary of a technical interview. Merge the new messages into the "
+        "current summary. Keep the topics covered, what the candidate explained well, what they "
+        "struggled with or could not answer, and their apparent level. Use at most {max_words} words. "
+        "Return only the summary."
+    )
+
+    def __init__(self, llm, max_tokens=300, fallback=None, metrics=None):
+        self.llm = llm
+        self.max_tokens = max_tokens
+        self.fallback = fallback if fallback is not None else ExtractiveSummarizer(max_tokens)
+        self.metrics = metrics
+
+    def _messages(self, summary, messages):
+        from langchain_core.messages import HumanMessage, SystemMessage
+        return [
+            SystemMessage(content=self.SYSTEM_PROMPT.format(max_words=self.max_tokens * 3 // 4)),
+            HumanMessage(content=f"Current summary:\n{summary or '(empty)'}\n\nNew messages:\n{render_messages(messages)}"),
+        ]
+
+    def _track(self, config):
+        if self.metrics is None:
+            return contextlib.nullcontext()
+        session_id = ((config or {}).get("metadata") or {}).get("session_id")
+        return self.metrics.track("summarize", session_id)
+
+    @staticmethod
+    def _call_config(config, call):
+        # Explicit callbacks stop a chain's callbacks (e.g. a question call's tracker) from being
+        # inherited inside a Runnable, so the update is never counted as part of that call
+        if call is None:
+            return {"callbacks": [], **(config or {})}
+        return dict(config or {}, callbacks=[call])
+
+    def summarize(self, summary, messages, config=None):
+        with self._track(config) as call:
+            try:
+                response = self.llm.invoke(self._messages(summary, messages), config=self._call_config(config, call))
+                return response.content.strip()
+            except Exception as e:
+                print(f"❌ Error summarizing conversation: {e}")
+                if call is not None:
+                    call.fallback = True
+                return self.fallback.summarize(summary, messages)
+
+    async def asummarize(self, summary, messages, config=None):
+        with self._track(config) as call:
+            try:
+                response = await self.llm.ainvoke(self._messages(summary, messages),
+                                                  config=self._call_config(config, call))
+                return response.content.strip()
+            except Exception as e:
+                print(f"❌ Error summarizing conversation: {e}")
+                if call is not None:
+                    call.fallback = True
+                return self.fallback.summarize(summary, messages)
+
+
+class ContextWindow:
+    """
+    Args:
+        token_budget (int): Estimated tokens allowed for summary + verbatim messages.
+        summary_tokens (int): Part of the budget reserved for the running summary.
+        min_recent (int): Messages always kept verbatim, even over budget.
+        summarizer: Object with summarize(summary, messages, config) / asummarize(...).
+        max_sessions (int): Cached summaries kept (least recently used are dropped).
+    """
+
+    def __init__(self, token_budget=1200, summary_tokens=300, min_recent=2, summarizer=None,
+                 max_sessions=1000, count_tokens=estimate_tokens):
+        if summary_tokens >= token_budget:
+            raise ValueError("summary_tokens must be smaller than token_budget")
+        self.token_budget = token_budget
+        self.summary_tokens = summary_tokens
+        self.min_recent = min_recent
+        self.summarizer = summarizer if summarizer is not None else ExtractiveSummarizer(summary_tokens)
+        self.max_sessions = max_sessions
+        self.count_tokens = count_tokens
+        # session_id -> (number of leading messages folded into the summary, summary)
+        self._summaries = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.summary_updates = 0
+
+    def fit(self, session_id, messages, config=None):
+        """
+        Return (summary, recent_messages) for the conversation so far.
+
+        `config` (e.g. metadata with the session_id) is passed to the summarizer.
+        """
+        folded, summary, split = self._plan(session_id, messages)
+        if split > folded:
+            summary = self.summarizer.summarize(summary, messages[folded:split], config)
+            self._store(session_id, split, summary)
+        return summary, messages[split:]
+
+    async def afit(self, session_id, messages, config=None):
+        """Async version of fit; summary updates await the summarizer"""
+        folded, summary, split = self._plan(session_id, messages)
+        if split > folded:
+            summary = await self.summarizer.asummarize(summary, messages[folded:split], config)
+            self._store(session_id, split, summary)
+        return summary, messages[split:]
+
+    def forget(self, session_id):
+        with self._lock:
+            self._summaries.pop(session_id, None)
+
+    def _plan(self, session_id, messages):
+        with self._lock:
+            folded, summary = self._summaries.get(session_id, (0, ""))
+            if session_id in self._summaries:
+                self._summaries.move_to_end(session_id)
+        if folded > len(messages):
+            # History was cleared or replaced; start over
+            folded, summary = 0, ""
+
+        if not folded and sum(self.count_tokens(m.content) for m in messages) <= self.token_budget:
+            return folded, summary, 0
+
+        # Walk back from the newest message until the verbatim share of the budget is used up
+        available = self.token_budget - self.summary_tokens
+        split = len(messages)
+        used = 0
+        while split > folded:
+            cost = self.count_tokens(messages[split - 1].content)
+            if len(messages) - split >= self.min_recent and used + cost > available:
+                break
+            used += cost
+            split -= 1
+        return folded, summary, split
+
+    def _store(self, session_id, folded, summary):
+        with self._lock:
+            self._summaries[session_id] = (folded, summary)
+            self._summaries.move_to_end(session_id)
+            self.summary_updates += 1
+            while len(self._summaries) > self.max_sessions:
+                self._summaries.popitem(last=False)
@@ -0,0 +1,150 @@
+"""
+Content-addressed cache of finished evaluations.
+
+Dashboards re-run the evaluator over transcripts that have not changed, and
+every run paid the full LLM cost again. The cache key is a hash of what the
+evaluation depends on:
+
+  * the transcript content (conversation_history, tech_stack, position),
+  * the evaluator workflow version (stage logic and prompts), and
+  * the EvaluationWorkFlowState schema,
+
+so an identical re-evaluation is a disk read, while a transcript, prompt or
+schema change misses. Values are the zlib-compressed state JSON in a SQLite
+file; the least recently used entries are evicted beyond `max_bytes`.
+
+    cache = EvaluationCache("evaluations/cache.db", max_bytes=512 * 2**20)
+    state = await aevaluate_interview(interview_data, cache=cache)
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+from evaluation_checkpoints import canonical_json, transcript_hash
+from evaluator_schema.schema import EvaluationWorkFlowState
+
+DEFAULT_PATH = os.getenv("EVALUATION_CACHE_PATH", "evaluations/cache.db")
+DEFAULT_MAX_BYTES = 512 * 2 ** 20
+
+# Transcript fields an evaluation depends on
+KEY_FIELDS = ("conversation_history", "tech_stack", "position")
+
+SCHEMA_VERSION = hashlib.sha256(
+    canonical_json(EvaluationWorkFlowState.model_json_schema()).encode("utf-8")).hexdigest()[:12]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS evaluations (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_evaluations_accessed ON evaluations (accessed_at);
+"""
+
+
+def cache_key(interview_data, workflow_version):
+    return hashlib.sha256("\0".join((
+        transcript_hash(interview_data, KEY_FIELDS), workflow_version, SCHEMA_VERSION,
+    )).encode("utf-8")).hexdigest()
+
+
+class EvaluationCache:
+    """
+    Args:
+        path (str): SQLite file, created on first use.
+        max_bytes (int): Compressed bytes kept; least recently read entries go first.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, max_bytes=DEFAULT_MAX_BYTES, clock=time.time):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+        self._bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM evaluations").fetchone()[0]
+
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """The cached EvaluationWorkFlowState for a key, or None"""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM evaluations WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE evaluations SET accessed_at = ? WHERE key = ?", (self._clock(), key))
+            self.hits += 1
+        return EvaluationWorkFlowState.model_validate_json(zlib.decompress(row[0]))
+
+    def put(self, key, state):
+        value = zlib.compress(state.model_dump_json().encode("utf-8"))
+        now = self._clock()
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM evaluations WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO evaluations VALUES (?, ?, ?, ?, ?)", (key, value, len(value), now, now))
+            self._bytes += len(value) - (old[0] if old else 0)
+            self.stores += 1
+            self._evict()
+
+    def _evict(self):
+        while self._bytes > self.max_bytes:
+            rows = self._conn.execute(
+                "SELECT key, size FROM evaluations ORDER BY accessed_at LIMIT 64").fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                self._conn.execute("DELETE FROM evaluations WHERE key = ?", (key,))
+                self._bytes -= size
+                self.evictions += 1
+                if self._bytes <= self.max_bytes:
+                    break
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM evaluations")
+            self._bytes = 0
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM evaluations").fetchone()[0]
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "stores": self.stores,
+            "evictions": self.evictions,
+        }
+
+    def metric_samples(self):
+        """Samples for LLMMetrics.add_collector"""
+        stats = self.stats()
+        return [
+            ("evaluation_cache_entries", "gauge", "Cached evaluations", {}, stats["entries"]),
+            ("evaluation_cache_bytes", "gauge", "Compressed size of cached evaluations", {}, stats["bytes"]),
+            ("evaluation_cache_hits_total", "counter", "Evaluations served from the cache", {}, stats["hits"]),
+            ("evaluation_cache_misses_total", "counter", "Evaluations that ran the workflow", {}, stats["misses"]),
+            ("evaluation_cache_evictions_total", "counter", "Entries evicted for size", {}, stats["evictions"]),
+        ]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
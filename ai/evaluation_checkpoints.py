@@ -0,0 +1,111 @@
+"""
+Per-stage checkpoints of the evaluation workflow (InterviewEvaluator.py).
+
+Each stage's result is stored as soon as it succeeds, keyed by the transcript
+hash and the workflow version, so when a later stage fails, re-running the
+evaluator (or the batch command) only pays for the stages that did not
+complete. Checkpoints of a transcript are dropped once its evaluation
+completes; a prompt change bumps the workflow version, so stale results are
+never resumed.
+
+    checkpoints = EvaluationCheckpoints("interviews/evaluation_checkpoints.db")
+    state = await aevaluate_interview(interview_data, checkpoints=checkpoints)
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+DEFAULT_PATH = os.getenv("EVALUATION_CHECKPOINTS_PATH", "interviews/evaluation_checkpoints.db")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    transcript_hash TEXT NOT NULL,
+    workflow_version TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    result TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (transcript_hash, workflow_version, stage)
+) WITHOUT ROWID;
+"""
+
+
+def canonical_json(data):
+    """Byte-stable JSON: sorted keys, no whitespace, non-ASCII kept as is"""
+    return json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def transcript_hash(interview_data, fields=None):
+    """sha256 of the canonical transcript, or of only `fields` of it"""
+    if fields is not None:
+        interview_data = {field: interview_data.get(field) for field in fields}
+    return hashlib.sha256(canonical_json(interview_data).encode("utf-8")).hexdigest()
+
+
+class EvaluationCheckpoints:
+    """
+    SQLite store of completed stage results.
+
+    Args:
+        path (str): Database file, created on first use.
+    """
+
+    def __init__(self, path=DEFAULT_PATH):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+        self.resumed = 0
+        self.saved = 0
+
+    def load(self, transcript_hash, workflow_version):
+        """{stage name: stage result} checkpointed for a transcript"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT stage, result FROM checkpoints WHERE transcript_hash = ? AND workflow_version = ?",
+                (transcript_hash, workflow_version),
+            ).fetchall()
+            self.resumed += len(rows)
+        return {stage: json.loads(result) for stage, result in rows}
+
+    def save(self, transcript_hash, workflow_version, stage, result):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?)",
+                (transcript_hash, workflow_version, stage, json.dumps(result, ensure_ascii=False), time.time()),
+            )
+            self.saved += 1
+
+    def clear(self, transcript_hash, workflow_version=None):
+        """Drop a transcript's checkpoints (of one workflow version, or all)"""
+        with self._lock:
+            if workflow_version is None:
+                self._conn.execute("DELETE FROM checkpoints WHERE transcript_hash = ?", (transcript_hash,))
+            else:
+                self._conn.execute(
+                    "DELETE FROM checkpoints WHERE transcript_hash = ? AND workflow_version = ?",
+                    (transcript_hash, workflow_version),
+                )
+
+    def prune(self, workflow_version):
+        """Drop checkpoints written by other workflow versions; returns how many"""
+        with self._lock:
+            return self._conn.execute(
+                "DELETE FROM checkpoints WHERE workflow_version != ?", (workflow_version,)
+            ).rowcount
+
+    def stats(self):
+        with self._lock:
+            stored, transcripts = self._conn.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT transcript_hash) FROM checkpoints"
+            ).fetchone()
+        return {"stored": stored, "transcripts": transcripts, "saved": self.saved, "resumed": self.resumed}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
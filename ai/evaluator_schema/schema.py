@@ -47,6 +47,7 @@ class EvaluationWorkFlowState(BaseModel):
     analytical_thinking_score: int = Field(default=0, ge=0, le=10, description="Overall score on analytical thinking")
     debugging_potential_score: int = Field(default=0, ge=0, le=10, description="debugging skill")
     problem_solving_approach: str = Field(default="", description="Overall approach taken on problem solving")
+    comments_on_clarity_of_communication: str = Field(default="", description="How clearly the candidate communicates")
 
 
     technical_skills: List[TechnicalSkillAssessment] = Field(default_factory=list, description="List of technical skill assessments")
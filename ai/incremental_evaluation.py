@@ -0,0 +1,308 @@
+"""
+Incremental evaluation of live interviews.
+
+InterviewEvaluator.py runs once the transcript is saved: two evaluator calls
+over the whole conversation, then the aggregator, so the report is ready only
+after the slowest evaluator plus the aggregator. Here every answer is scored
+as soon as it arrives (one small call per question/answer pair, at
+"evaluation" priority so it never delays the next question), and the partial
+TechnicalSkillAssessment / ProblemSolvingInstance entries accumulate per
+session. When the last answer comes in, the turns are merged into an
+EvaluationWorkFlowState and only the aggregator is left to run.
+
+    evaluator = IncrementalEvaluator()
+    interviewer = TechInterviewer(incremental_evaluator=evaluator)
+    ...                                        # answers are scored in the background
+    state = evaluator.result(session_id)       # EvaluationWorkFlowState, once complete
+
+Work runs on a private event loop thread, so it is started the same way from
+the sync and the async interviewer paths.
+"""
+
+import asyncio
+import statistics
+import threading
+from collections import OrderedDict
+
+from evaluator_schema.schema import (
+    ConfidenceLevel,
+    EvaluationWorkFlowState,
+    ProblemSolvingInstance,
+    TechnicalSkillAssessment,
+)
+from prompts import TURN_EVALUATOR_HUMAN, TURN_EVALUATOR_PROMPT
+
+# Per-turn scores averaged over the turns that reported them
+TURN_SCORES = ("technical_depth_score", "analytical_thinking_score", "problem_solving_score",
+               "debugging_potential_score")
+
+_CONFIDENCE_RANK = {level.value: rank for rank, level in enumerate(ConfidenceLevel)}
+
+
+async def evaluate_turn(question, answer, position, tech_stack, llm):
+    """
+    Score one question/answer pair. Returns the turn evaluator's JSON with
+    skills and the problem-solving instance validated; entries that do not
+    validate are dropped rather than failing the turn.
+    """
+    from InterviewEvaluator import _ask
+
+    result = await _ask(llm, TURN_EVALUATOR_PROMPT, TURN_EVALUATOR_HUMAN.format(
+        position=position, tech_stack=tech_stack, question=question, answer=answer))
+    skills = []
+    for skill in result.get("technical_skills") or ():
+        try:
+            skills.append(TechnicalSkillAssessment.model_validate(skill).model_dump(mode="json"))
+        except ValueError:
+            continue
+    instance = result.get("problem_solving_instance")
+    try:
+        instance = ProblemSolvingInstance.model_validate(instance).model_dump(mode="json") if instance else None
+    except ValueError:
+        instance = None
+    return dict(result, technical_skills=skills, problem_solving_instance=instance)
+
+
+def _unique(items):
+    seen = set()
+    result = []
+    for item in items:
+        key = str(item).strip().casefold()
+        if key and key not in seen:
+            seen.add(key)
+            result.append(str(item).strip())
+    return result
+
+
+def _mean_score(values):
+    values = [value for value in values if isinstance(value, (int, float)) and not isinstance(value, bool)]
+    if not values:
+        return 0
+    return max(0, min(10, round(statistics.fmean(values))))
+
+
+def merge_turns(turns, position):
+    """
+    EvaluationWorkFlowState fields of the evaluator stages, built from per-turn
+    results (in turn order):
+
+      * technical_skills: one entry per skill; evidence from every turn, the
+        level and comments of the most confident (then latest) assessment;
+      * problem_solving_instances: every instance, in order;
+      * scores: mean over the turns that reported them; consistency falls as
+        the per-turn depth scores spread;
+      * gaps, strengths, approach and communication notes: de-duplicated.
+    """
+    skills = {}
+    for turn in turns:
+        for skill in turn.get("technical_skills") or ():
+            key = skill["skill_name"].strip().casefold()
+            merged = skills.get(key)
+            if merged is None:
+                skills[key] = dict(skill, evidence=list(skill["evidence"]))
+                continue
+            evidence = _unique(merged["evidence"] + list(skill["evidence"]))
+            if _CONFIDENCE_RANK.get(skill["confidence"], 0) >= _CONFIDENCE_RANK.get(merged["confidence"], 0):
+                merged.update(skill)
+            merged["evidence"] = evidence
+
+    depths = [turn["technical_depth_score"] for turn in turns
+              if isinstance(turn.get("technical_depth_score"), (int, float))]
+    # 10 for an even performance, two points off per point of standard deviation
+    consistency = max(1, min(10, round(10 - 2 * statistics.pstdev(depths)))) if depths else 0
+
+    fields = {
+        "position_evaluated_for": position,
+        "technical_skills": list(skills.values()),
+        "technical_consistency_score": consistency,
+        "technical_knowledge_gaps": _unique(gap for turn in turns for gap in turn.get("knowledge_gaps") or ()),
+        "technical_strengths": _unique(item for turn in turns for item in turn.get("strengths") or ()),
+        "problem_solving_instances": [turn["problem_solving_instance"] for turn in turns
+                                      if turn.get("problem_solving_instance")],
+        "problem_solving_approach": "; ".join(_unique(turn.get("problem_solving_approach") or "" for turn in turns)),
+        "comments_on_clarity_of_communication": "; ".join(_unique(turn.get("communication") or "" for turn in turns)),
+    }
+    for name in TURN_SCORES:
+        fields[name] = _mean_score(turn.get(name) for turn in turns)
+    return fields
+
+
+class _Session:
+    __slots__ = ("position", "tech_stack", "turns", "futures", "result")
+
+    def __init__(self, position, tech_stack):
+        self.position = position
+        self.tech_stack = tech_stack
+        # [question, answer, result or None] per answered question, in order
+        self.turns = []
+        self.futures = []
+        self.result = None
+
+
+class IncrementalEvaluator:
+    """
+    Scores interview turns in the background and finishes the evaluation with
+    the aggregator alone.
+
+    Args:
+        llm: Chat model; defaults to InterviewEvaluator.get_llm() (pooled, rate-limited).
+        max_concurrency (int): Turn evaluations in flight across all sessions.
+        max_sessions (int): Sessions (live or finished) kept; the least recently
+            used are dropped beyond it.
+    """
+
+    def __init__(self, llm=None, max_concurrency=8, max_sessions=10000):
+        self._llm = llm
+        self.max_concurrency = max_concurrency
+        self.max_sessions = max_sessions
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+        self._loop = None
+        self._loop_lock = threading.Lock()
+        self._semaphore = None
+
+        self.turns_scored = 0
+        self.turns_failed = 0
+        self.turns_retried = 0
+        self.finished = 0
+
+    @property
+    def llm(self):
+        if self._llm is None:
+            from InterviewEvaluator import get_llm
+            self._llm = get_llm()
+        return self._llm
+
+    def _event_loop(self):
+        # A private loop on a daemon thread: both the sync and the async interviewer paths can submit to it
+        with self._loop_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="incremental-evaluation", daemon=True).start()
+                self._loop = loop
+            return self._loop
+
+    def _session(self, session_id, position=None, tech_stack=None):
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                session = self._sessions[session_id] = _Session(position, tech_stack)
+                while len(self._sessions) > self.max_sessions:
+                    self._sessions.popitem(last=False)
+            else:
+                self._sessions.move_to_end(session_id)
+            return session
+
+    def submit(self, session_id, question, answer, position, tech_stack):
+        """Start scoring an answer in the background; returns a concurrent.futures.Future"""
+        session = self._session(session_id, position, tech_stack)
+        turn = [question, answer, None]
+        with self._lock:
+            session.turns.append(turn)
+            future = asyncio.run_coroutine_threadsafe(self._score(session, turn), self._event_loop())
+            session.futures.append(future)
+        return future
+
+    async def _score(self, session, turn):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        question, answer, _ = turn
+        async with self._semaphore:
+            try:
+                turn[2] = await evaluate_turn(question, answer, session.position, session.tech_stack, self.llm)
+                self.turns_scored += 1
+            except Exception as e:
+                self.turns_failed += 1
+                print(f"⚠️ Turn evaluation failed (retried when the interview ends): {e}")
+
+    def finish(self, session_id, interview_data):
+        """
+        Start the final step once the last answer has been submitted: wait for
+        the pending turns (retrying failed ones once), merge them and run the
+        aggregator. Returns a concurrent.futures.Future of the EvaluationWorkFlowState;
+        if a turn still could not be scored, its current_step is not "completed"
+        and `errors` says which.
+        """
+        session = self._session(session_id, interview_data.get("position"), interview_data.get("tech_stack"))
+        with self._lock:
+            if session.result is None:
+                session.result = asyncio.run_coroutine_threadsafe(
+                    self._finish(session_id, session, interview_data), self._event_loop())
+            return session.result
+
+    async def _finish(self, session_id, session, interview_data):
+        from InterviewEvaluator import aggregator, initial_state, merge_states
+
+        with self._lock:
+            pending = list(session.futures)
+        await asyncio.gather(*(asyncio.wrap_future(future) for future in pending))
+        failed = [turn for turn in session.turns if turn[2] is None]
+        if failed:
+            self.turns_retried += len(failed)
+            await asyncio.gather(*(self._score(session, turn) for turn in failed))
+
+        state = initial_state(interview_data, session_id)
+        partial = merge_turns([turn[2] for turn in session.turns if turn[2] is not None],
+                              session.position or interview_data.get("position") or "Frontend Developer")
+        errors = [f"Turn evaluator failed for question: {turn[0][:80]}" for turn in session.turns if turn[2] is None]
+        if errors:
+            partial["errors"] = errors
+        state = merge_states(state, [("turns", partial)], "evaluators_completed")
+        # With unscored turns the state keeps its errors and no overall score; the aggregator is not called
+        if not state["errors"]:
+            state = merge_states(state, [("aggregator", await aggregator(state, self.llm))], "completed")
+            self.finished += 1
+        return EvaluationWorkFlowState.model_validate(state)
+
+    def result(self, session_id, timeout=None):
+        """The finished evaluation, waiting up to `timeout` seconds; KeyError if finish() was never called"""
+        with self._lock:
+            session = self._sessions.get(session_id)
+        if session is None or session.result is None:
+            raise KeyError(session_id)
+        return session.result.result(timeout)
+
+    async def aresult(self, session_id):
+        with self._lock:
+            session = self._sessions.get(session_id)
+        if session is None or session.result is None:
+            raise KeyError(session_id)
+        return await asyncio.wrap_future(session.result)
+
+    def partial_state(self, session_id):
+        """Fields merged from the turns scored so far (a live view; no LLM call)"""
+        with self._lock:
+            session = self._sessions.get(session_id)
+        if session is None:
+            raise KeyError(session_id)
+        return merge_turns([turn[2] for turn in session.turns if turn[2] is not None], session.position)
+
+    def discard(self, session_id):
+        """Forget a session (e.g. an abandoned interview)"""
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def stats(self):
+        with self._lock:
+            sessions = len(self._sessions)
+        return {
+            "sessions": sessions,
+            "turns_scored": self.turns_scored,
+            "turns_failed": self.turns_failed,
+            "turns_retried": self.turns_retried,
+            "finished": self.finished,
+        }
+
+    def metric_samples(self):
+        """Samples for LLMMetrics.add_collector"""
+        stats = self.stats()
+        return [
+            ("incremental_evaluation_sessions", "gauge", "Sessions with turns being evaluated or kept", {},
+             stats["sessions"]),
+            ("incremental_evaluation_turns_total", "counter", "Answers scored in the background",
+             {"outcome": "scored"}, stats["turns_scored"]),
+            ("incremental_evaluation_turns_total", "counter", "Answers scored in the background",
+             {"outcome": "failed"}, stats["turns_failed"]),
+            ("incremental_evaluation_finished_total", "counter", "Evaluations finished by the aggregator", {},
+             stats["finished"]),
+        ]
@@ -0,0 +1,343 @@
+"""
+Process-wide chat-model factory with a shared, bounded HTTP connection pool.
+
+Every TechInterviewer used to construct its own ChatGroq, each with its own
+HTTP client, so connections (and TLS handshakes) were never reused across
+interviewers and outbound concurrency had no cap. get_chat_model() returns one
+chat model per (provider, model, temperature) and hands every provider that
+accepts it the same keep-alive httpx pool:
+
+    llm = get_chat_model()                        # $LLM_PROVIDER, default model
+    llm = get_chat_model("groq", temperature=0)   # same object on every call
+    pool_stats()                                  # in-flight / saturation counters
+    llm = get_default_llm()                       # ProviderRouter when LLM_ROUTE is set
+
+Pool size comes from configure() or LLM_MAX_CONNECTIONS / LLM_MAX_KEEPALIVE.
+Requests beyond max_connections wait inside httpx for a free connection; the
+`saturated_requests` counter shows how often that happens. Connections cannot
+be shared between processes, so a forked worker starts with a fresh pool.
+"""
+
+import asyncio
+import os
+import threading
+import weakref
+
+import httpx
+
+import providers
+
+DEFAULT_MAX_CONNECTIONS = 20
+DEFAULT_MAX_KEEPALIVE = 10
+DEFAULT_KEEPALIVE_EXPIRY = 30.0
+
+_lock = threading.Lock()
+_settings = {}
+_pool = None
+_models = {}
+_router = None
+
+
+class PoolStats:
+    """
+    Requests in flight through the pool, from send until the body is closed.
+    `in_flight` above `max_connections` means requests are queued for a connection.
+    """
+
+    def __init__(self, max_connections):
+        self.max_connections = max_connections
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.requests = 0
+        self.saturated_requests = 0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            if self.in_flight >= self.max_connections:
+                # Every connection is busy, so httpx queues this request
+                self.saturated_requests += 1
+            self.in_flight += 1
+            self.requests += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def release(self):
+        with self._lock:
+            self.in_flight -= 1
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                "max_connections": self.max_connections,
+                "in_flight": self.in_flight,
+                "peak_in_flight": self.peak_in_flight,
+                "requests": self.requests,
+                "saturated_requests": self.saturated_requests,
+                "saturation": self.in_flight / self.max_connections if self.max_connections else 0.0,
+            }
+
+
+class _Release:
+    """Calls stats.release() exactly once"""
+
+    def __init__(self, stats):
+        self.stats = stats
+        self.done = False
+
+    def __call__(self):
+        if not self.done:
+            self.done = True
+            self.stats.release()
+
+
+class _ReleasingStream(httpx.SyncByteStream):
+    def __init__(self, stream, release):
+        self._stream = stream
+        self._release = release
+
+    def __iter__(self):
+        yield from self._stream
+
+    def close(self):
+        try:
+            self._stream.close()
+        finally:
+            self._release()
+
+
+class _AsyncReleasingStream(httpx.AsyncByteStream):
+    def __init__(self, stream, release):
+        self._stream = stream
+        self._release = release
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self):
+        try:
+            await self._stream.aclose()
+        finally:
+            self._release()
+
+
+class CountingTransport(httpx.BaseTransport):
+    """httpx.HTTPTransport that reports connection usage to PoolStats"""
+
+    def __init__(self, stats, **transport_options):
+        self.stats = stats
+        self._transport = httpx.HTTPTransport(**transport_options)
+
+    def handle_request(self, request):
+        release = _Release(self.stats)
+        self.stats.acquire()
+        try:
+            response = self._transport.handle_request(request)
+        except BaseException:
+            release()
+            raise
+        response.stream = _ReleasingStream(response.stream, release)
+        return response
+
+    def close(self):
+        self._transport.close()
+
+
+class AsyncCountingTransport(httpx.AsyncBaseTransport):
+    """
+    Async counterpart of CountingTransport.
+
+    httpx connections belong to the event loop that opened them, so each running
+    loop gets its own pool (same limits); a pool goes away with its loop.
+    """
+
+    def __init__(self, stats, **transport_options):
+        self.stats = stats
+        self._transport_options = transport_options
+        self._transports = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def _transport(self):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            transport = self._transports.get(loop)
+            if transport is None:
+                transport = self._transports[loop] = httpx.AsyncHTTPTransport(**self._transport_options)
+        return transport
+
+    async def handle_async_request(self, request):
+        transport = self._transport()
+        release = _Release(self.stats)
+        self.stats.acquire()
+        try:
+            response = await transport.handle_async_request(request)
+        except BaseException:
+            release()
+            raise
+        response.stream = _AsyncReleasingStream(response.stream, release)
+        return response
+
+    async def aclose(self):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            transport = self._transports.pop(loop, None)
+        if transport is not None:
+            await transport.aclose()
+
+
+class ConnectionPool:
+    """One sync and one async httpx client sharing limits and keep-alive settings"""
+
+    def __init__(self, max_connections=DEFAULT_MAX_CONNECTIONS, max_keepalive=DEFAULT_MAX_KEEPALIVE,
+                 keepalive_expiry=DEFAULT_KEEPALIVE_EXPIRY):
+        limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.sync_stats = PoolStats(max_connections)
+        self.async_stats = PoolStats(max_connections)
+        # Timeouts are set per request by the provider SDKs
+        self.http_client = httpx.Client(transport=CountingTransport(self.sync_stats, limits=limits))
+        self.http_async_client = httpx.AsyncClient(transport=AsyncCountingTransport(self.async_stats, limits=limits))
+
+    def stats(self):
+        return {"sync": self.sync_stats.to_dict(), "async": self.async_stats.to_dict()}
+
+    def close(self):
+        self.http_client.close()
+
+
+def configure(max_connections=None, max_keepalive=None, keepalive_expiry=None):
+    """Set pool limits; must be called before the first get_chat_model()"""
+    with _lock:
+        if _pool is not None:
+            raise RuntimeError("LLM connection pool already created; call configure() earlier")
+        for key, value in (("max_connections", max_connections), ("max_keepalive", max_keepalive),
+                           ("keepalive_expiry", keepalive_expiry)):
+            if value is not None:
+                _settings[key] = value
+
+
+def connection_pool():
+    """The process-wide ConnectionPool, created on first use"""
+    global _pool
+    with _lock:
+        if _pool is None:
+            _pool = ConnectionPool(
+                max_connections=_settings.get(
+                    "max_connections", int(os.getenv("LLM_MAX_CONNECTIONS", DEFAULT_MAX_CONNECTIONS))),
+                max_keepalive=_settings.get(
+                    "max_keepalive", int(os.getenv("LLM_MAX_KEEPALIVE", DEFAULT_MAX_KEEPALIVE))),
+                keepalive_expiry=_settings.get("keepalive_expiry", DEFAULT_KEEPALIVE_EXPIRY),
+            )
+            _register_metrics(_pool)
+        return _pool
+
+
+def get_chat_model(provider=None, model=None, temperature=0.3, **kwargs):
+    """
+    Shared chat model for (provider, model, temperature), built on first request.
+
+    Extra keyword arguments go to providers.build_chat_model() and are part of
+    the cache key. Calls are admitted by the provider's llm_scheduler, which
+    keeps them within its rate limits.
+    """
+    provider = provider or providers.selected_provider()
+    model = model or providers.get_spec(provider).default_model
+    key = (provider, model, temperature, tuple(sorted(kwargs.items())))
+    llm = _models.get(key)
+    if llm is not None:
+        return llm
+
+    if providers.get_spec(provider).accepts_http_client:
+        pool = connection_pool()
+        kwargs = {"http_client": pool.http_client, "http_async_client": pool.http_async_client, **kwargs}
+    with _lock:
+        llm = _models.get(key)
+        if llm is None:
+            from llm_scheduler import ScheduledChatModel, scheduler_for
+            llm = _models[key] = ScheduledChatModel(
+                providers.build_chat_model(provider, model, temperature, **kwargs), scheduler_for(provider))
+    return llm
+
+
+def get_default_llm():
+    """
+    The model the agents use: get_chat_model(), or a provider_router.ProviderRouter
+    over the comma-separated providers in LLM_ROUTE (e.g. "groq,openai").
+
+    Routed models make a single attempt each; the router fails over and hedges
+    across providers instead of retrying one of them serially.
+    """
+    global _router
+    route = [name.strip() for name in os.getenv("LLM_ROUTE", "").split(",") if name.strip()]
+    if not route:
+        return get_chat_model()
+    with _lock:
+        router = _router
+    if router is None:
+        from provider_router import ProviderRouter
+        hedge_delay = os.getenv("LLM_HEDGE_DELAY")
+        router = ProviderRouter(
+            [(name, get_chat_model(name, max_attempts=1)) for name in route],
+            hedge=os.getenv("LLM_HEDGE", "1") != "0",
+            hedge_delay=float(hedge_delay) if hedge_delay else None,
+        )
+        with _lock:
+            if _router is None:
+                _router = router
+                _register_router_metrics(router)
+            router = _router
+    return router
+
+
+def pool_stats():
+    """Counters of the shared pool, or None before it is created"""
+    return _pool.stats() if _pool is not None else None
+
+
+def _register_metrics(pool):
+    try:
+        from llm_metrics import metrics
+    except ImportError:
+        return
+
+    def collect():
+        gauges = []
+        for kind, stats in pool.stats().items():
+            labels = {"client": kind}
+            gauges.append(("llm_pool_max_connections", "gauge", "Connection limit of the shared LLM pool",
+                           labels, stats["max_connections"]))
+            gauges.append(("llm_pool_in_flight", "gauge", "Requests using or waiting for a pooled connection",
+                           labels, stats["in_flight"]))
+            gauges.append(("llm_pool_peak_in_flight", "gauge", "Highest in-flight count seen",
+                           labels, stats["peak_in_flight"]))
+            gauges.append(("llm_pool_requests_total", "counter", "Requests sent through the pool",
+                           labels, stats["requests"]))
+            gauges.append(("llm_pool_saturated_requests_total", "counter",
+                           "Requests that had to wait for a free connection", labels, stats["saturated_requests"]))
+        return gauges
+
+    metrics.add_collector("llm_pool", collect)
+
+
+def _register_router_metrics(router):
+    try:
+        from llm_metrics import metrics
+    except ImportError:
+        return
+    metrics.add_collector("llm_router", router.metric_samples)
+
+
+def _reset_after_fork():
+    # Sockets inherited from the parent must not be shared; children build their own pool
+    global _pool, _lock, _router
+    _lock = threading.Lock()
+    _pool = None
+    _router = None
+    _models.clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
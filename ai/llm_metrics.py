@@ -0,0 +1,373 @@
+"""
+Instrumentation for chat-model calls made by the interview agents.
+
+Wrap each logical LLM call (one interview turn, including any retries) in
+`metrics.track(operation, session_id)` and pass the returned tracker as a
+LangChain callback:
+
+    with metrics.track("next_question", session_id) as call:
+        response = llm.invoke(messages, config={"callbacks": [call]})
+
+The tracker records latency (split into rate-limit queue wait and model time,
+see llm_scheduler), time to first token, prompt/completion tokens, retries,
+provider/model and whether the static fallback was served
+(`call.fallback = True`). Calls are aggregated into histograms per
+(operation, provider, model) that can be dumped as Prometheus text or JSON,
+written to a file, or served over HTTP from a local port.
+"""
+
+import asyncio
+import json
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0, 32.0)
+TOKEN_BUCKETS = (16, 32, 64, 128, 256, 512, 1024, 2048, 4096, 8192)
+
+
+class Histogram:
+    """Fixed-bucket histogram (Prometheus semantics) with interpolated quantiles"""
+
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q):
+        """Estimate the q-quantile by linear interpolation inside its bucket"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        lower = 0.0
+        for bound, bucket_count in zip(self.buckets + (float("inf"),), self.counts):
+            if seen + bucket_count >= rank and bucket_count:
+                if bound == float("inf"):
+                    return lower
+                return lower + (bound - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+            lower = bound
+        return lower
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "p50": self.quantile(0.5),
+            "p90": self.quantile(0.9),
+            "p99": self.quantile(0.99),
+        }
+
+
+class CallTracker(BaseCallbackHandler):
+    """One logical LLM call; also the LangChain callback that observes its attempts"""
+
+    def __init__(self, metrics, operation, session_id=None):
+        self.metrics = metrics
+        self.operation = operation
+        self.session_id = session_id
+        self.provider = "unknown"
+        self.model = "unknown"
+        self.attempts = 0
+        self.retries = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.fallback = False
+        self.failed = False
+        self.started_at = None
+        self.first_token_at = None
+        self.latency = None
+        self.queue_wait = 0.0
+        self._pending_error = False
+
+    def __enter__(self):
+        self.started_at = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.latency = time.perf_counter() - self.started_at
+        if exc_type is not None:
+            self.failed = True
+        self.metrics.record(self)
+        return False
+
+    @property
+    def time_to_first_token(self):
+        if self.first_token_at is None:
+            return self.latency
+        return self.first_token_at - self.started_at
+
+    @property
+    def model_latency(self):
+        """Wall time minus time spent queued for rate-limit budget"""
+        return self.latency - self.queue_wait
+
+    def on_queue_wait(self, seconds):
+        # Called by llm_scheduler.ScheduledChatModel once the request is admitted
+        self.queue_wait += seconds
+
+    # LangChain callbacks
+
+    def on_chat_model_start(self, serialized, messages, *, metadata=None, **kwargs):
+        self.attempts += 1
+        if self._pending_error:
+            # A new attempt after a failed one is a retry (ChatGroq/with_retry)
+            self.retries += 1
+            self._pending_error = False
+        metadata = metadata or {}
+        self.provider = metadata.get("ls_provider", self.provider)
+        self.model = metadata.get("ls_model_name", self.model)
+
+    def on_llm_new_token(self, token, **kwargs):
+        if self.first_token_at is None and token:
+            self.first_token_at = time.perf_counter()
+
+    def on_llm_end(self, response, **kwargs):
+        self.failed = False
+        prompt_tokens, completion_tokens = _token_usage(response)
+        self.prompt_tokens += prompt_tokens
+        self.completion_tokens += completion_tokens
+
+    def on_llm_error(self, error, **kwargs):
+        if isinstance(error, asyncio.CancelledError):
+            # A hedged request that lost the race (provider_router), not a failure
+            return
+        self.failed = True
+        self._pending_error = True
+
+    def on_retry(self, retry_state, **kwargs):
+        # Emitted by Runnable.with_retry before the next attempt starts
+        self._pending_error = True
+
+
+def _token_usage(response):
+    """(prompt, completion) tokens from an LLMResult, whichever way the provider reports them"""
+    for generations in response.generations:
+        for generation in generations:
+            usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if usage:
+                return usage.get("input_tokens", 0), usage.get("output_tokens", 0)
+    usage = (response.llm_output or {}).get("token_usage") or {}
+    return usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0)
+
+
+class _Series:
+    __slots__ = ("latency", "queue_wait", "ttft", "prompt_tokens", "completion_tokens", "calls", "errors", "retries",
+                 "fallbacks")
+
+    def __init__(self):
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.queue_wait = Histogram(LATENCY_BUCKETS)
+        self.ttft = Histogram(LATENCY_BUCKETS)
+        self.prompt_tokens = Histogram(TOKEN_BUCKETS)
+        self.completion_tokens = Histogram(TOKEN_BUCKETS)
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.fallbacks = 0
+
+
+class LLMMetrics:
+    """
+    Process-wide registry of LLM call metrics.
+
+    Args:
+        recent_calls (int): Per-call records kept for the JSON dump (with session ids).
+    """
+
+    def __init__(self, recent_calls=1000):
+        self._lock = threading.Lock()
+        self._series = {}
+        self._collectors = {}
+        self.recent = deque(maxlen=recent_calls)
+
+    def track(self, operation, session_id=None):
+        return CallTracker(self, operation, session_id)
+
+    def add_collector(self, name, collect):
+        """
+        Register extra samples read at dump time, e.g. connection pool gauges.
+        `collect()` returns (metric, type, help, labels dict, value) tuples.
+        """
+        with self._lock:
+            self._collectors[name] = collect
+
+    def _collect(self):
+        with self._lock:
+            collectors = dict(self._collectors)
+        return {name: collect() for name, collect in collectors.items()}
+
+    def record(self, call):
+        key = (call.operation, call.provider, call.model)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _Series()
+            series.calls += 1
+            series.errors += call.failed
+            series.retries += call.retries
+            series.fallbacks += call.fallback
+            series.latency.observe(call.model_latency)
+            series.queue_wait.observe(call.queue_wait)
+            series.ttft.observe(call.time_to_first_token)
+            if call.prompt_tokens or call.completion_tokens:
+                series.prompt_tokens.observe(call.prompt_tokens)
+                series.completion_tokens.observe(call.completion_tokens)
+            self.recent.append({
+                "operation": call.operation,
+                "session_id": call.session_id,
+                "provider": call.provider,
+                "model": call.model,
+                "latency": round(call.latency, 6),
+                "queue_wait": round(call.queue_wait, 6),
+                "time_to_first_token": round(call.time_to_first_token, 6),
+                "prompt_tokens": call.prompt_tokens,
+                "completion_tokens": call.completion_tokens,
+                "retries": call.retries,
+                "failed": call.failed,
+                "fallback": call.fallback,
+            })
+
+    def to_dict(self):
+        collected = self._collect()
+        with self._lock:
+            return {
+                "series": [
+                    {
+                        "operation": operation,
+                        "provider": provider,
+                        "model": model,
+                        "calls": series.calls,
+                        "errors": series.errors,
+                        "retries": series.retries,
+                        "fallbacks": series.fallbacks,
+                        "latency_seconds": series.latency.to_dict(),
+                        "queue_wait_seconds": series.queue_wait.to_dict(),
+                        "time_to_first_token_seconds": series.ttft.to_dict(),
+                        "prompt_tokens": series.prompt_tokens.to_dict(),
+                        "completion_tokens": series.completion_tokens.to_dict(),
+                    }
+                    for (operation, provider, model), series in self._series.items()
+                ],
+                "recent_calls": list(self.recent),
+                **{
+                    name: [{"metric": metric, "labels": labels, "value": value}
+                           for metric, _, _, labels, value in samples]
+                    for name, samples in collected.items()
+                },
+            }
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), indent=2)
+
+    def to_prometheus(self):
+        """Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            items = list(self._series.items())
+            for name, kind, help_text in (
+                ("llm_calls_total", "counter", "LLM calls (one interview turn incl. retries)"),
+                ("llm_errors_total", "counter", "LLM calls that ended in an error"),
+                ("llm_retries_total", "counter", "Retried attempts"),
+                ("llm_fallbacks_total", "counter", "Calls answered with a static fallback"),
+            ):
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                attr = name[len("llm_"):-len("_total")]
+                for key, series in items:
+                    lines.append(f"{name}{{{_labels(key)}}} {getattr(series, attr)}")
+
+            for name, attr, help_text in (
+                ("llm_latency_seconds", "latency", "Time of the call excluding rate-limit queueing"),
+                ("llm_queue_wait_seconds", "queue_wait", "Time queued for rate-limit budget"),
+                ("llm_time_to_first_token_seconds", "ttft", "Time until the first token"),
+                ("llm_prompt_tokens", "prompt_tokens", "Prompt tokens per call"),
+                ("llm_completion_tokens", "completion_tokens", "Completion tokens per call"),
+            ):
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} histogram")
+                for key, series in items:
+                    histogram = getattr(series, attr)
+                    labels = _labels(key)
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        cumulative += count
+                        lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+                    lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+                    lines.append(f"{name}_sum{{{labels}}} {histogram.sum}")
+                    lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+
+        # A metric family's samples must be contiguous, whichever collector produced them
+        families = {}
+        for samples in self._collect().values():
+            for metric, kind, help_text, labels, value in samples:
+                families.setdefault(metric, (kind, help_text, []))[2].append((labels, value))
+        for metric, (kind, help_text, samples) in families.items():
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} {kind}")
+            for labels, value in samples:
+                label_text = ",".join(f'{key}="{_escape(label)}"' for key, label in labels.items())
+                lines.append(f"{metric}{{{label_text}}} {value}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        """Dump to a file: JSON for *.json, Prometheus text otherwise"""
+        text = self.to_json() if path.endswith(".json") else self.to_prometheus()
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        return path
+
+    def serve(self, port=9464, host="127.0.0.1"):
+        """Serve /metrics (Prometheus) and /metrics.json from a daemon thread"""
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == "/metrics.json":
+                    body, content_type = metrics.to_json(), "application/json"
+                elif self.path == "/metrics":
+                    body, content_type = metrics.to_prometheus(), "text/plain; version=0.0.4"
+                else:
+                    self.send_error(404)
+                    return
+                data = body.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, name="llm-metrics", daemon=True).start()
+        return server
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"')
+
+
+def _labels(key):
+    operation, provider, model = key
+    return f'operation="{_escape(operation)}",provider="{_escape(provider)}",model="{_escape(model)}"'
+
+
+# Shared by every agent in the process
+metrics = LLMMetrics()
@@ -0,0 +1,457 @@
+"""
+Rate-limit-aware admission of LLM calls.
+
+Every session used to call the model directly, so bursts ran into the
+provider's requests/min and tokens/min limits and then paid retry backoff.
+Calls now go through one LLMScheduler per provider (llm_clients wraps every
+model it builds in ScheduledChatModel):
+
+  * token buckets for requests and estimated tokens per minute; a request
+    waits until both budgets cover it, and the estimate is corrected with the
+    real usage once the response arrives;
+  * a priority queue: interview turns go before evaluation, which goes before
+    batch jobs (question bank builds). Callers pick the priority through the
+    run config, e.g. config={"metadata": {"llm_priority": "evaluation"}};
+  * backpressure: when `max_queue` requests are already waiting, new ones
+    fail fast with SchedulerOverloaded (the agents answer with their fallback
+    question), and `pressure()` reports queue depth and the expected wait so
+    background work can back off before that;
+  * queue wait is reported separately from model latency: per priority in
+    the scheduler's metrics, and per call to llm_metrics.CallTracker.
+
+Budgets come from LLM_RPM / LLM_TPM (or LLM_<PROVIDER>_RPM / _TPM); unset
+means unlimited, in which case requests are admitted without queueing.
+"""
+
+import asyncio
+import heapq
+import itertools
+import os
+import threading
+import time
+
+from langchain_core.runnables import Runnable
+
+from llm_metrics import LATENCY_BUCKETS, Histogram
+
+PRIORITY_KEY = "llm_priority"
+# Lower runs first
+PRIORITIES = {"interview": 0, "evaluation": 1, "batch": 2}
+DEFAULT_PRIORITY = "interview"
+
+DEFAULT_MAX_QUEUE = 1000
+# Completion tokens assumed for a request until the provider reports real usage
+DEFAULT_COMPLETION_TOKENS = 256
+
+_lock = threading.Lock()
+_schedulers = {}
+
+
+class SchedulerOverloaded(RuntimeError):
+    """The queue is full; the caller should degrade or retry later"""
+
+
+class SchedulerTimeout(TimeoutError):
+    """A request waited longer than its max_wait"""
+
+
+class TokenBucket:
+    """
+    `per_minute` units refilled continuously, up to `capacity` (default: one
+    minute's worth). None means unlimited.
+    """
+
+    def __init__(self, per_minute=None, capacity=None, clock=time.monotonic):
+        self.per_minute = per_minute
+        self.capacity = capacity or per_minute
+        self._clock = clock
+        self.level = self.capacity
+        self.updated = clock()
+
+    def _refill(self, now):
+        if self.per_minute:
+            self.level = min(self.capacity, self.level + (now - self.updated) * self.per_minute / 60)
+        self.updated = now
+
+    def wait_time(self, amount, now):
+        """Seconds until `amount` can be taken (0 if now)"""
+        if not self.per_minute:
+            return 0.0
+        self._refill(now)
+        # A request larger than the bucket is admitted once the bucket is full
+        amount = min(amount, self.capacity)
+        return 0.0 if self.level >= amount else (amount - self.level) * 60 / self.per_minute
+
+    def take(self, amount, now):
+        if self.per_minute:
+            self._refill(now)
+            self.level -= min(amount, self.capacity)
+
+    def adjust(self, amount):
+        """Charge (or refund, if negative) units after the fact; the level may go below zero"""
+        if self.per_minute:
+            self.level = min(self.capacity, self.level - amount)
+
+
+class Ticket:
+    __slots__ = ("priority", "tokens", "enqueued", "waited", "granted", "cancelled", "event", "loop", "future")
+
+    def __init__(self, priority, tokens, enqueued):
+        self.priority = priority
+        self.tokens = tokens
+        self.enqueued = enqueued
+        self.waited = 0.0
+        self.granted = False
+        self.cancelled = False
+        self.event = threading.Event()
+        self.loop = None
+        self.future = None
+
+
+class LLMScheduler:
+    """
+    Args:
+        requests_per_minute (float | None): Request budget; None for unlimited.
+        tokens_per_minute (float | None): Prompt + completion token budget; None for unlimited.
+        max_queue (int): Waiting requests beyond which new ones raise SchedulerOverloaded.
+        name (str): Label for metrics (the provider).
+    """
+
+    def __init__(self, requests_per_minute=None, tokens_per_minute=None, max_queue=DEFAULT_MAX_QUEUE,
+                 name="default", clock=time.monotonic):
+        self.name = name
+        self.max_queue = max_queue
+        self._clock = clock
+        self.requests = TokenBucket(requests_per_minute, clock=clock)
+        self.tokens = TokenBucket(tokens_per_minute, clock=clock)
+        self._heap = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._dispatcher = None
+
+        self.admitted = dict.fromkeys(PRIORITIES, 0)
+        self.rejected = dict.fromkeys(PRIORITIES, 0)
+        self.timeouts = dict.fromkeys(PRIORITIES, 0)
+        self.queue_wait = {priority: Histogram(LATENCY_BUCKETS) for priority in PRIORITIES}
+
+    # Admission
+
+    def _wait_time(self, tokens, now):
+        return max(self.requests.wait_time(1, now), self.tokens.wait_time(tokens, now))
+
+    def _grant(self, ticket, now):
+        self.requests.take(1, now)
+        self.tokens.take(ticket.tokens, now)
+        ticket.granted = True
+        ticket.waited = now - ticket.enqueued
+        self.admitted[ticket.priority] += 1
+        self.queue_wait[ticket.priority].observe(ticket.waited)
+        ticket.event.set()
+        if ticket.future is not None:
+            ticket.loop.call_soon_threadsafe(_resolve, ticket.future)
+
+    def _queued(self):
+        return sum(not ticket.cancelled for _, _, ticket in self._heap)
+
+    def _submit(self, tokens, priority, loop=None, future=None):
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority {priority!r}; expected one of {', '.join(PRIORITIES)}")
+        with self._cond:
+            now = self._clock()
+            ticket = Ticket(priority, tokens, now)
+            ticket.loop, ticket.future = loop, future
+            # Nothing queued ahead and budget available: no queueing at all
+            if not self._heap and self._wait_time(tokens, now) == 0:
+                self._grant(ticket, now)
+                return ticket
+            if self._queued() >= self.max_queue:
+                self.rejected[priority] += 1
+                raise SchedulerOverloaded(
+                    f"{self.name}: {self.max_queue} LLM requests already queued")
+            heapq.heappush(self._heap, (PRIORITIES[priority], next(self._seq), ticket))
+            self._ensure_dispatcher()
+            self._cond.notify()
+            return ticket
+
+    def _cancel(self, ticket):
+        with self._cond:
+            if ticket.granted:
+                return False
+            ticket.cancelled = True
+            self.timeouts[ticket.priority] += 1
+            self._cond.notify()
+            return True
+
+    def acquire(self, tokens=1, priority=DEFAULT_PRIORITY, max_wait=None):
+        """Block until the request may be sent; returns its Ticket (ticket.waited is the queue wait)"""
+        ticket = self._submit(tokens, priority)
+        if not ticket.event.wait(max_wait) and self._cancel(ticket):
+            raise SchedulerTimeout(f"{self.name}: waited {max_wait}s for an LLM slot")
+        return ticket
+
+    async def aacquire(self, tokens=1, priority=DEFAULT_PRIORITY, max_wait=None):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        ticket = self._submit(tokens, priority, loop, future)
+        if ticket.granted:
+            return ticket
+        try:
+            await asyncio.wait_for(future, max_wait)
+        except asyncio.TimeoutError:
+            if self._cancel(ticket):
+                raise SchedulerTimeout(f"{self.name}: waited {max_wait}s for an LLM slot") from None
+        except asyncio.CancelledError:
+            if not self._cancel(ticket):
+                # Granted just as the caller gave up: hand the budget back
+                self.settle(ticket, 0, request_used=False)
+            raise
+        return ticket
+
+    def settle(self, ticket, used_tokens, request_used=True):
+        """Correct the token estimate with real usage (None if unknown)"""
+        with self._cond:
+            if used_tokens is not None:
+                self.tokens.adjust(used_tokens - ticket.tokens)
+            if not request_used:
+                self.requests.adjust(-1)
+            self._cond.notify()
+
+    # Dispatch
+
+    def _ensure_dispatcher(self):
+        if self._dispatcher is None or not self._dispatcher.is_alive():
+            self._dispatcher = threading.Thread(target=self._run, name=f"llm-scheduler-{self.name}", daemon=True)
+            self._dispatcher.start()
+
+    def _run(self):
+        with self._cond:
+            while True:
+                timeout = None
+                while self._heap:
+                    _, _, ticket = self._heap[0]
+                    if ticket.cancelled:
+                        heapq.heappop(self._heap)
+                        continue
+                    now = self._clock()
+                    timeout = self._wait_time(ticket.tokens, now)
+                    if timeout > 0:
+                        # Strict priority: the head waits for budget rather than being overtaken
+                        break
+                    heapq.heappop(self._heap)
+                    self._grant(ticket, now)
+                    timeout = None
+                self._cond.wait(timeout)
+
+    # Backpressure and stats
+
+    def pressure(self):
+        """Queue depth and the wait a new request would currently face"""
+        with self._cond:
+            now = self._clock()
+            queued = [ticket for _, _, ticket in self._heap if not ticket.cancelled]
+            tokens = sum(ticket.tokens for ticket in queued)
+            return {
+                "queued": len(queued),
+                "max_queue": self.max_queue,
+                "utilization": len(queued) / self.max_queue if self.max_queue else 0.0,
+                # Everything ahead has to be admitted first
+                "estimated_wait_seconds": max(
+                    self.requests.wait_time(len(queued) + 1, now),
+                    self.tokens.wait_time(tokens + DEFAULT_COMPLETION_TOKENS, now),
+                ),
+            }
+
+    @property
+    def overloaded(self):
+        with self._cond:
+            return self._queued() >= self.max_queue
+
+    def stats(self):
+        with self._cond:
+            queued = dict.fromkeys(PRIORITIES, 0)
+            for _, _, ticket in self._heap:
+                if not ticket.cancelled:
+                    queued[ticket.priority] += 1
+            return {
+                "requests_per_minute": self.requests.per_minute,
+                "tokens_per_minute": self.tokens.per_minute,
+                "queued": queued,
+                "admitted": dict(self.admitted),
+                "rejected": dict(self.rejected),
+                "timeouts": dict(self.timeouts),
+                "queue_wait_seconds": {priority: histogram.to_dict()
+                                       for priority, histogram in self.queue_wait.items()},
+            }
+
+    def metric_samples(self):
+        """Samples for LLMMetrics.add_collector"""
+        stats = self.stats()
+        samples = []
+        for priority in PRIORITIES:
+            labels = {"provider": self.name, "priority": priority}
+            wait = stats["queue_wait_seconds"][priority]
+            samples.extend([
+                ("llm_scheduler_queued", "gauge", "Requests waiting for rate-limit budget", labels,
+                 stats["queued"][priority]),
+                ("llm_scheduler_admitted_total", "counter", "Requests admitted", labels,
+                 stats["admitted"][priority]),
+                ("llm_scheduler_rejected_total", "counter", "Requests rejected because the queue was full",
+                 labels, stats["rejected"][priority]),
+                ("llm_scheduler_timeouts_total", "counter", "Requests that gave up waiting", labels,
+                 stats["timeouts"][priority]),
+                ("llm_scheduler_queue_wait_seconds_sum", "counter", "Total time spent queued", labels,
+                 wait["sum"]),
+                ("llm_scheduler_queue_wait_seconds_p99", "gauge", "Estimated p99 queue wait", labels,
+                 wait["p99"] or 0.0),
+            ])
+        return samples
+
+
+def _resolve(future):
+    if not future.done():
+        future.set_result(None)
+
+
+def estimate_tokens(input, completion_tokens=DEFAULT_COMPLETION_TOKENS):
+    """Rough prompt size (about four characters per token) plus the expected completion"""
+    if hasattr(input, "to_messages"):
+        input = input.to_messages()
+    if isinstance(input, str):
+        chars = len(input)
+    else:
+        chars = 0
+        for message in input:
+            content = getattr(message, "content", message)
+            chars += len(content) if isinstance(content, str) else len(str(content))
+    return chars // 4 + completion_tokens
+
+
+def _usage_tokens(message):
+    usage = getattr(message, "usage_metadata", None)
+    return usage.get("total_tokens") if usage else None
+
+
+def _callback_handlers(config):
+    callbacks = (config or {}).get("callbacks")
+    if callbacks is None:
+        return ()
+    # A list of handlers, or a CallbackManager when called from inside a chain
+    return getattr(callbacks, "handlers", callbacks)
+
+
+def _priority(config):
+    return ((config or {}).get("metadata") or {}).get(PRIORITY_KEY, DEFAULT_PRIORITY)
+
+
+def _report_wait(config, seconds):
+    for handler in _callback_handlers(config):
+        on_queue_wait = getattr(handler, "on_queue_wait", None)
+        if on_queue_wait is not None:
+            on_queue_wait(seconds)
+
+
+class ScheduledChatModel(Runnable):
+    """
+    A chat model (or retry wrapper) whose calls are admitted by an LLMScheduler.
+
+    Args:
+        llm: The wrapped model.
+        scheduler (LLMScheduler): Shared per provider.
+        completion_tokens (int): Expected completion size for the token estimate.
+        max_wait (float | None): Longest queue wait before SchedulerTimeout.
+    """
+
+    def __init__(self, llm, scheduler, completion_tokens=DEFAULT_COMPLETION_TOKENS, max_wait=None):
+        self.llm = llm
+        self.scheduler = scheduler
+        self.completion_tokens = completion_tokens
+        self.max_wait = max_wait
+
+    def _admit(self, input, config):
+        ticket = self.scheduler.acquire(estimate_tokens(input, self.completion_tokens), _priority(config),
+                                        self.max_wait)
+        _report_wait(config, ticket.waited)
+        return ticket
+
+    async def _aadmit(self, input, config):
+        ticket = await self.scheduler.aacquire(estimate_tokens(input, self.completion_tokens), _priority(config),
+                                               self.max_wait)
+        _report_wait(config, ticket.waited)
+        return ticket
+
+    def invoke(self, input, config=None, **kwargs):
+        ticket = self._admit(input, config)
+        used = None
+        try:
+            response = self.llm.invoke(input, config=config, **kwargs)
+            used = _usage_tokens(response)
+            return response
+        finally:
+            self.scheduler.settle(ticket, used)
+
+    async def ainvoke(self, input, config=None, **kwargs):
+        ticket = await self._aadmit(input, config)
+        used = None
+        try:
+            response = await self.llm.ainvoke(input, config=config, **kwargs)
+            used = _usage_tokens(response)
+            return response
+        finally:
+            self.scheduler.settle(ticket, used)
+
+    def stream(self, input, config=None, **kwargs):
+        ticket = self._admit(input, config)
+        used = None
+        try:
+            for chunk in self.llm.stream(input, config=config, **kwargs):
+                used = _usage_tokens(chunk) or used
+                yield chunk
+        finally:
+            self.scheduler.settle(ticket, used)
+
+    async def astream(self, input, config=None, **kwargs):
+        ticket = await self._aadmit(input, config)
+        used = None
+        try:
+            async for chunk in self.llm.astream(input, config=config, **kwargs):
+                used = _usage_tokens(chunk) or used
+                yield chunk
+        finally:
+            self.scheduler.settle(ticket, used)
+
+
+def _env_number(name):
+    value = os.getenv(name)
+    return float(value) if value else None
+
+
+def scheduler_for(provider):
+    """The process-wide scheduler of a provider, configured from the environment"""
+    with _lock:
+        scheduler = _schedulers.get(provider)
+        if scheduler is None:
+            prefix = f"LLM_{provider.upper()}_"
+            scheduler = _schedulers[provider] = LLMScheduler(
+                requests_per_minute=_env_number(prefix + "RPM") or _env_number("LLM_RPM"),
+                tokens_per_minute=_env_number(prefix + "TPM") or _env_number("LLM_TPM"),
+                max_queue=int(os.getenv("LLM_MAX_QUEUE", DEFAULT_MAX_QUEUE)),
+                name=provider,
+            )
+            _register_metrics(scheduler)
+        return scheduler
+
+
+def _register_metrics(scheduler):
+    from llm_metrics import metrics
+    metrics.add_collector(f"llm_scheduler_{scheduler.name}", scheduler.metric_samples)
+
+
+def _reset_after_fork():
+    # The dispatcher threads do not survive a fork
+    global _lock
+    _lock = threading.Lock()
+    _schedulers.clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,340 @@
+"""
+Hedged, circuit-broken routing across chat-model providers.
+
+Retrying serially on one provider (ChatGroq max_retries / with_retry) turns a
+slow or failing upstream into multi-second stalls before anything else is
+tried. ProviderRouter instead:
+
+  * skips providers whose circuit breaker is open (too many recent failures),
+    probing them again after `reset_timeout`;
+  * fails over to the next provider as soon as a request errors;
+  * hedges: if the first provider has not answered after a delay derived from
+    its recent p95 latency, the same request goes to the next provider and
+    the first successful response wins;
+  * cancels the losing request.
+
+It is a LangChain Runnable with invoke/ainvoke/stream/astream, so it drops in
+wherever a chat model is used (TechInterviewer(llm=...), `prompt | llm`):
+
+    router = ProviderRouter([("groq", groq_llm), ("openai", openai_llm)])
+
+or set LLM_ROUTE=groq,openai and let llm_clients.get_default_llm() build it.
+Sync calls run on a private event loop thread so losers can be cancelled and
+keep-alive connections are reused.
+"""
+
+import asyncio
+import queue
+import threading
+import time
+from collections import deque
+
+from langchain_core.runnables import Runnable
+
+
+class NoProviderAvailable(RuntimeError):
+    """Every provider's circuit is open"""
+
+
+class CircuitBreaker:
+    """
+    closed -> open after `failure_threshold` consecutive failures; open ->
+    half-open after `reset_timeout` seconds, letting one trial request through;
+    the trial's outcome closes or re-opens the circuit.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, failure_threshold=3, reset_timeout=30.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == self.OPEN and self._clock() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._trial_in_flight = False
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = self._clock()
+            self._trial_in_flight = False
+
+    def release(self):
+        """A trial request was cancelled without an outcome"""
+        with self._lock:
+            self._trial_in_flight = False
+
+
+class LatencyWindow:
+    """Recent successful latencies of one provider"""
+
+    def __init__(self, size=200, min_samples=20):
+        self.samples = deque(maxlen=size)
+        self.min_samples = min_samples
+        self._lock = threading.Lock()
+
+    def add(self, seconds):
+        with self._lock:
+            self.samples.append(seconds)
+
+    def quantile(self, q):
+        with self._lock:
+            if len(self.samples) < self.min_samples:
+                return None
+            ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class Route:
+    __slots__ = ("name", "llm", "breaker", "latency", "first_chunk", "calls", "failures", "wins",
+                 "hedges", "cancelled")
+
+    def __init__(self, name, llm, breaker):
+        self.name = name
+        self.llm = llm
+        self.breaker = breaker
+        self.latency = LatencyWindow()
+        self.first_chunk = LatencyWindow()
+        self.calls = 0
+        self.failures = 0
+        self.wins = 0
+        self.hedges = 0          # requests started on this route as a hedge
+        self.cancelled = 0       # requests on this route cancelled because another won
+
+
+class ProviderRouter(Runnable):
+    """
+    Args:
+        routes: [(name, chat model), ...] in order of preference.
+        hedge (bool): Fire a second request when the first is slow.
+        hedge_delay (float | None): Fixed hedge delay; otherwise the route's
+            `hedge_quantile` latency, clamped to [min_hedge_delay, max_hedge_delay]
+            (`initial_hedge_delay` until enough samples exist).
+        failure_threshold, reset_timeout: CircuitBreaker settings per route.
+    """
+
+    def __init__(self, routes, hedge=True, hedge_delay=None, hedge_quantile=0.95, initial_hedge_delay=2.0,
+                 min_hedge_delay=0.05, max_hedge_delay=10.0, failure_threshold=3, reset_timeout=30.0,
+                 clock=time.monotonic):
+        if not routes:
+            raise ValueError("ProviderRouter needs at least one route")
+        self.routes = [
+            Route(name, llm, CircuitBreaker(failure_threshold, reset_timeout, clock)) for name, llm in routes
+        ]
+        self.hedge = hedge
+        self.hedge_delay = hedge_delay
+        self.hedge_quantile = hedge_quantile
+        self.initial_hedge_delay = initial_hedge_delay
+        self.min_hedge_delay = min_hedge_delay
+        self.max_hedge_delay = max_hedge_delay
+        self._loop = None
+        self._loop_lock = threading.Lock()
+
+    # Routing helpers
+
+    def _next_available(self, index):
+        """
+        Position of the first route from `index` on whose circuit lets a request
+        through, or None. Only called for a route about to be launched: on a
+        half-open circuit allow() takes the single trial slot.
+        """
+        for position in range(index, len(self.routes)):
+            if self.routes[position].breaker.allow():
+                return position
+        return None
+
+    def _delay(self, route, window):
+        if self.hedge_delay is not None:
+            return self.hedge_delay
+        estimate = window.quantile(self.hedge_quantile)
+        if estimate is None:
+            return self.initial_hedge_delay
+        return min(max(estimate, self.min_hedge_delay), self.max_hedge_delay)
+
+    def _succeeded(self, route, window, seconds):
+        route.breaker.record_success()
+        route.wins += 1
+        window.add(seconds)
+
+    def _failed(self, route):
+        route.breaker.record_failure()
+        route.failures += 1
+
+    async def _race(self, start, window_of):
+        """
+        Run `start(route)` coroutines with failover and hedging; returns
+        (route, result) of the first success. Losers are cancelled.
+        """
+        candidates = self.routes
+        pending = {}
+        next_index = 0
+        last_error = None
+
+        def launch(hedged):
+            nonlocal next_index
+            position = self._next_available(next_index)
+            if position is None:
+                next_index = len(candidates)
+                return False
+            route = candidates[position]
+            next_index = position + 1
+            route.calls += 1
+            if hedged:
+                route.hedges += 1
+            task = asyncio.ensure_future(start(route))
+            pending[task] = (route, time.perf_counter())
+            return True
+
+        if not launch(hedged=False):
+            raise NoProviderAvailable("all provider circuits are open")
+        try:
+            while pending:
+                timeout = None
+                if self.hedge and next_index < len(candidates) and len(pending) == 1:
+                    (route, started), = pending.values()
+                    timeout = max(self._delay(route, window_of(route)) - (time.perf_counter() - started), 0)
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    launch(hedged=True)
+                    continue
+                for task in done:
+                    route, started = pending.pop(task)
+                    error = task.exception()
+                    if error is None:
+                        self._succeeded(route, window_of(route), time.perf_counter() - started)
+                        return route, task.result()
+                    last_error = error
+                    self._failed(route)
+                if not pending and next_index < len(candidates):
+                    # Fail over straight away rather than waiting for the hedge delay
+                    launch(hedged=False)
+            raise last_error
+        finally:
+            for task, (route, _) in pending.items():
+                task.cancel()
+                route.cancelled += 1
+                route.breaker.release()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    # Runnable interface
+
+    async def ainvoke(self, input, config=None, **kwargs):
+        async def start(route):
+            return await route.llm.ainvoke(input, config=config, **kwargs)
+
+        _, result = await self._race(start, lambda route: route.latency)
+        return result
+
+    async def astream(self, input, config=None, **kwargs):
+        streams = {}
+
+        async def start(route):
+            # Race on the first chunk; the winner's stream then continues below
+            stream = route.llm.astream(input, config=config, **kwargs)
+            streams[route.name] = stream
+            try:
+                return await stream.__anext__()
+            except BaseException:
+                await stream.aclose()
+                raise
+
+        route, first = await self._race(start, lambda route: route.first_chunk)
+        for name, stream in streams.items():
+            if name != route.name:
+                await stream.aclose()
+        yield first
+        async for chunk in streams[route.name]:
+            yield chunk
+
+    def invoke(self, input, config=None, **kwargs):
+        return asyncio.run_coroutine_threadsafe(self.ainvoke(input, config, **kwargs), self._event_loop()).result()
+
+    def stream(self, input, config=None, **kwargs):
+        chunks = queue.Queue()
+        done = object()
+
+        async def pump():
+            try:
+                async for chunk in self.astream(input, config, **kwargs):
+                    chunks.put(chunk)
+            except BaseException as e:
+                chunks.put(e)
+            finally:
+                chunks.put(done)
+
+        future = asyncio.run_coroutine_threadsafe(pump(), self._event_loop())
+        try:
+            while True:
+                item = chunks.get()
+                if item is done:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            future.cancel()
+
+    def _event_loop(self):
+        """Private loop thread for sync callers (connections and cancellation stay async)"""
+        with self._loop_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="provider-router", daemon=True).start()
+                self._loop = loop
+            return self._loop
+
+    # Introspection
+
+    def stats(self):
+        return {
+            route.name: {
+                "state": route.breaker.state,
+                "calls": route.calls,
+                "wins": route.wins,
+                "failures": route.failures,
+                "hedges": route.hedges,
+                "cancelled": route.cancelled,
+                "p95_seconds": route.latency.quantile(0.95),
+            }
+            for route in self.routes
+        }
+
+    def metric_samples(self):
+        """Samples for LLMMetrics.add_collector"""
+        samples = []
+        states = {CircuitBreaker.CLOSED: 0, CircuitBreaker.HALF_OPEN: 1, CircuitBreaker.OPEN: 2}
+        for route in self.routes:
+            labels = {"provider": route.name}
+            samples.extend([
+                ("llm_router_circuit_state", "gauge", "0 closed, 1 half-open, 2 open", labels,
+                 states[route.breaker.state]),
+                ("llm_router_requests_total", "counter", "Requests started per provider", labels, route.calls),
+                ("llm_router_wins_total", "counter", "Requests whose response was used", labels, route.wins),
+                ("llm_router_failures_total", "counter", "Requests that failed", labels, route.failures),
+                ("llm_router_hedges_total", "counter", "Hedged requests started", labels, route.hedges),
+                ("llm_router_cancelled_total", "counter", "Losing requests cancelled", labels, route.cancelled),
+            ])
+        return samples
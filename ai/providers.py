@@ -0,0 +1,137 @@
+"""
+Lazy registry of chat-model providers.
+
+Importing a LangChain provider package pulls in its SDK, httpx and pydantic
+models, which dominates start-up of the short-lived CLI and worker processes.
+Nothing here imports a provider until it is first selected, and
+`is_installed()` only checks that a package can be found.
+
+    llm = build_chat_model()                      # LLM_PROVIDER env var, default "groq"
+    llm = build_chat_model("openai", temperature=0)
+    preload()                                     # import the provider in the background
+"""
+
+import importlib
+import importlib.util
+import os
+import threading
+from collections import namedtuple
+
+ProviderSpec = namedtuple(
+    "ProviderSpec",
+    ["module", "class_name", "package", "api_key_env", "default_model", "sdk_module", "retry_errors",
+     "accepts_http_client"],
+)
+
+# Transient errors retried by Runnable.with_retry (so retries show up in llm_metrics);
+# providers without an entry keep the SDK's own retries.
+_TRANSIENT_ERRORS = ("APIConnectionError", "RateLimitError", "InternalServerError")
+
+PROVIDERS = {
+    "groq": ProviderSpec(
+        "langchain_groq", "ChatGroq", "langchain-groq", "GROQ_API_KEY",
+        "moonshotai/kimi-k2-instruct", "groq", _TRANSIENT_ERRORS, True,
+    ),
+    "openai": ProviderSpec(
+        "langchain_openai", "ChatOpenAI", "langchain-openai", "OPENAI_API_KEY",
+        "gpt-3.5-turbo-0125", "openai", _TRANSIENT_ERRORS, True,
+    ),
+    "google": ProviderSpec(
+        "langchain_google_genai", "ChatGoogleGenerativeAI", "langchain-google-genai", "GOOGLE_API_KEY",
+        "gemini-2.5-flash", None, (), False,
+    ),
+}
+
+DEFAULT_PROVIDER = "groq"
+
+_classes = {}
+_lock = threading.Lock()
+
+
+def selected_provider():
+    return os.getenv("LLM_PROVIDER", DEFAULT_PROVIDER)
+
+
+def get_spec(provider=None):
+    provider = provider or selected_provider()
+    try:
+        return PROVIDERS[provider]
+    except KeyError:
+        raise ValueError(f"Unknown LLM provider {provider!r}; choose one of {', '.join(PROVIDERS)}") from None
+
+
+def is_installed(module):
+    """True if a top-level module can be imported, without importing it"""
+    try:
+        return importlib.util.find_spec(module) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def missing_packages(provider=None):
+    """pip names of the packages the provider (and the agents) need but can't find"""
+    spec = get_spec(provider)
+    required = {"python-dotenv": "dotenv", "langchain-core": "langchain_core", spec.package: spec.module}
+    return [package for package, module in required.items() if not is_installed(module)]
+
+
+def chat_model_class(provider=None):
+    """Import (once) and return the LangChain chat model class for a provider"""
+    provider = provider or selected_provider()
+    cls = _classes.get(provider)
+    if cls is None:
+        spec = get_spec(provider)
+        with _lock:
+            cls = _classes.get(provider)
+            if cls is None:
+                cls = _classes[provider] = getattr(importlib.import_module(spec.module), spec.class_name)
+    return cls
+
+
+def retry_errors(provider=None):
+    """Exception classes worth retrying for a provider (imports its SDK)"""
+    spec = get_spec(provider)
+    if not spec.sdk_module:
+        return ()
+    sdk = importlib.import_module(spec.sdk_module)
+    return tuple(getattr(sdk, name) for name in spec.retry_errors if hasattr(sdk, name))
+
+
+def build_chat_model(provider=None, model=None, temperature=0.3, max_attempts=3, **kwargs):
+    """
+    Chat model for a provider, wrapped in with_retry for its transient errors.
+
+    Args:
+        provider (str | None): Key of PROVIDERS; defaults to $LLM_PROVIDER or "groq".
+        model (str | None): Defaults to the provider's default model.
+        max_attempts (int): Total attempts including retries.
+        **kwargs: Passed to the chat model class.
+    """
+    provider = provider or selected_provider()
+    spec = get_spec(provider)
+    cls = chat_model_class(provider)
+    errors = retry_errors(provider)
+    if not errors:
+        return cls(model=model or spec.default_model, temperature=temperature,
+                   max_retries=max_attempts - 1, **kwargs)
+    llm = cls(model=model or spec.default_model, temperature=temperature, max_retries=0, **kwargs)
+    return llm.with_retry(retry_if_exception_type=errors, stop_after_attempt=max_attempts)
+
+
+def preload(provider=None):
+    """
+    Import the provider on a daemon thread, e.g. while the candidate reads the
+    first question. Import errors are left for build_chat_model() to report.
+    """
+    provider = provider or selected_provider()
+
+    def load():
+        try:
+            chat_model_class(provider)
+            retry_errors(provider)
+        except Exception:
+            pass
+
+    thread = threading.Thread(target=load, name=f"preload-{provider}", daemon=True)
+    thread.start()
+    return thread
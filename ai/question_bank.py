@@ -0,0 +1,320 @@
+"""
+Pre-generated interview questions, indexed by technology, difficulty and kind.
+
+When the LLM failed, InterviewAgent used to serve one of five hard-coded
+questions, identical for everyone. The bank is filled offline by a batch job
+and stored in a small SQLite file; at run time it is loaded lazily into memory
+on first use, so picking a question is a dict lookup. It serves:
+
+  * the degraded path: a relevant question for the candidate's stack and level
+    when generation fails, and
+  * the opening question of start_interview ("opening" kind).
+
+Questions already served in a session are not repeated.
+
+Build / inspect:
+    python question_bank.py build --tech "Python, JavaScript, React, Node.js" --count 10
+    python question_bank.py stats
+    python question_bank.py sample --tech Python --difficulty intermediate
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import sqlite3
+import threading
+import zlib
+from collections import OrderedDict
+
+from prompts import QUESTION_BANK_KINDS, QUESTION_BANK_PROMPT
+from session_models import parse_tech_stack
+
+DEFAULT_PATH = os.getenv("QUESTION_BANK_PATH", "interviews/question_bank.db")
+
+LEVELS = ("beginner", "intermediate", "advanced")
+KINDS = ("opening", "followup")
+
+# Any technology that has no questions of its own falls back to these
+GENERAL = "general"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS questions (
+    id INTEGER PRIMARY KEY,
+    technology TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    text TEXT NOT NULL,
+    UNIQUE (technology, difficulty, kind, text)
+);
+CREATE INDEX IF NOT EXISTS idx_questions_lookup ON questions (technology, difficulty, kind);
+"""
+
+# Shipped so a freshly built bank is never empty, even without an LLM
+GENERAL_QUESTIONS = {
+    "beginner": [
+        "Describe a challenging problem you solved recently and how you approached it.",
+        "What best practices do you follow in your development process?",
+        "How do you stay updated with new technologies?",
+        "How do you decide how to structure a new project?",
+    ],
+    "intermediate": [
+        "How would you approach debugging a performance issue?",
+        "How do you decide what to cover with automated tests?",
+        "Describe how you would review a teammate's pull request.",
+    ],
+    "advanced": [
+        "How would you design a system to handle ten times its current traffic?",
+        "Tell me about a technical trade-off you made and how you would revisit it today.",
+        "How would you migrate a critical service to a new architecture without downtime?",
+    ],
+}
+
+
+def normalize_technology(technology):
+    return technology.strip().lower()
+
+
+def level_for(difficulty, question_number, max_questions):
+    """Difficulty level for a question: the session's level, raised as the interview progresses"""
+    base = LEVELS.index(difficulty) if difficulty in LEVELS else 0
+    progressed = question_number * len(LEVELS) // max(max_questions, 1)
+    return LEVELS[min(max(base, progressed), len(LEVELS) - 1)]
+
+
+class QuestionBank:
+    """
+    Read side of the bank: lazy in-memory index plus per-session no-repeat tracking.
+
+    Args:
+        path (str): SQLite file written by `build`. A missing file is an empty bank.
+        max_sessions (int): Sessions whose served questions are remembered (LRU).
+    """
+
+    _shared = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, path=DEFAULT_PATH, max_sessions=10000):
+        self.path = path
+        self.max_sessions = max_sessions
+        self._index = None
+        self._served = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls, path=DEFAULT_PATH):
+        """Process-wide bank for a path, loaded on first pick"""
+        key = os.path.abspath(path)
+        with cls._shared_lock:
+            bank = cls._shared.get(key)
+            if bank is None:
+                bank = cls._shared[key] = cls(path)
+            return bank
+
+    def _load(self):
+        # (technology, difficulty, kind) -> (text, ...)
+        index = {}
+        if os.path.exists(self.path):
+            conn = sqlite3.connect(f"file:{os.path.abspath(self.path)}?mode=ro", uri=True)
+            try:
+                rows = conn.execute(
+                    "SELECT technology, difficulty, kind, text FROM questions ORDER BY id"
+                ).fetchall()
+            finally:
+                conn.close()
+            for technology, difficulty, kind, text in rows:
+                index.setdefault((technology, difficulty, kind), []).append(text)
+        return {key: tuple(questions) for key, questions in index.items()}
+
+    @property
+    def index(self):
+        if self._index is None:
+            with self._lock:
+                if self._index is None:
+                    self._index = self._load()
+        return self._index
+
+    def reload(self):
+        with self._lock:
+            self._index = None
+
+    def __len__(self):
+        return sum(len(questions) for questions in self.index.values())
+
+    def pick(self, session_id, technologies, difficulty="beginner", kind="followup", rotation=0):
+        """
+        An unserved question for the session, or None.
+
+        Technologies are tried in turn starting at `rotation` (e.g. the question
+        number, so the interview moves across the stack), then the nearest other
+        difficulty levels, then the general questions.
+        """
+        index = self.index
+        if not index:
+            return None
+        technologies = [normalize_technology(tech) for tech in technologies] or [GENERAL]
+        start = rotation % len(technologies)
+        ordered = technologies[start:] + technologies[:start] + [GENERAL]
+        level = LEVELS.index(difficulty) if difficulty in LEVELS else 0
+        levels = sorted(LEVELS, key=lambda name: abs(LEVELS.index(name) - level))
+        # Sessions start at different offsets, so concurrent candidates get different questions
+        offset = zlib.crc32(str(session_id).encode("utf-8"))
+
+        with self._lock:
+            served = self._served.get(session_id)
+            if served is None:
+                served = self._served[session_id] = set()
+                while len(self._served) > self.max_sessions:
+                    self._served.popitem(last=False)
+            else:
+                self._served.move_to_end(session_id)
+
+            for technology in ordered:
+                for name in levels:
+                    questions = index.get((technology, name, kind))
+                    if not questions:
+                        continue
+                    for i in range(len(questions)):
+                        text = questions[(offset + i) % len(questions)]
+                        # By text: the same question can be filed under several technologies/levels
+                        if text not in served:
+                            served.add(text)
+                            return text
+        return None
+
+    def forget(self, session_id):
+        with self._lock:
+            self._served.pop(session_id, None)
+
+    def stats(self):
+        counts = {}
+        for (technology, difficulty, kind), questions in self.index.items():
+            counts.setdefault(technology, {}).setdefault(kind, {})[difficulty] = len(questions)
+        return counts
+
+
+# Offline build
+
+def _connect_for_write(path):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def add_questions(path, technology, difficulty, kind, questions):
+    """Insert questions, skipping duplicates; returns how many were new"""
+    technology = normalize_technology(technology)
+    conn = _connect_for_write(path)
+    try:
+        with conn:
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO questions (technology, difficulty, kind, text) VALUES (?, ?, ?, ?)",
+                [(technology, difficulty, kind, text.strip()) for text in questions if text.strip()],
+            )
+            return conn.total_changes - before
+    finally:
+        conn.close()
+
+
+def parse_questions(text):
+    """Questions from a model reply: a JSON array, or one question per line as a fallback"""
+    text = text.strip()
+    match = re.search(r"\[.*\]", text, re.DOTALL)
+    if match:
+        try:
+            items = json.loads(match.group(0))
+            return [str(item).strip() for item in items if str(item).strip()]
+        except ValueError:
+            pass
+    lines = (re.sub(r"^\s*(?:[-*]|\d+[.)])\s*", "", line).strip() for line in text.splitlines())
+    return [line for line in lines if line.endswith("?")]
+
+
+async def _generate(llm, technology, difficulty, kind, count, semaphore):
+    from langchain_core.messages import HumanMessage
+
+    prompt = QUESTION_BANK_PROMPT.format(
+        count=count,
+        difficulty=difficulty,
+        technology=technology,
+        kind_instructions=QUESTION_BANK_KINDS[kind].format(technology=technology),
+    )
+    async with semaphore:
+        response = await llm.ainvoke([HumanMessage(content=prompt)], config={"metadata": {"llm_priority": "batch"}})
+    return technology, difficulty, kind, parse_questions(response.content)
+
+
+async def build(path, technologies, count=10, levels=LEVELS, kinds=KINDS, concurrency=4, llm=None):
+    """Generate `count` questions per technology x level x kind and add them to the bank"""
+    if llm is None:
+        from llm_clients import get_chat_model
+        llm = get_chat_model(temperature=0.7)
+
+    for difficulty, questions in GENERAL_QUESTIONS.items():
+        add_questions(path, GENERAL, difficulty, "followup", questions)
+
+    semaphore = asyncio.Semaphore(concurrency)
+    jobs = [
+        _generate(llm, technology, difficulty, kind, count, semaphore)
+        for technology in technologies
+        for difficulty in levels
+        for kind in kinds
+    ]
+    added = 0
+    for job in asyncio.as_completed(jobs):
+        try:
+            technology, difficulty, kind, questions = await job
+        except Exception as e:
+            print(f"❌ Generation failed: {e}")
+            continue
+        new = add_questions(path, technology, difficulty, kind, questions)
+        added += new
+        print(f"✓ {technology} / {difficulty} / {kind}: {new} new of {len(questions)}")
+    return added
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--path", default=DEFAULT_PATH)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = commands.add_parser("build", help="generate questions with the configured LLM")
+    build_parser.add_argument("--tech", required=True, help="comma-separated technologies")
+    build_parser.add_argument("--count", type=int, default=10, help="questions per technology, level and kind")
+    build_parser.add_argument("--levels", default=",".join(LEVELS))
+    build_parser.add_argument("--concurrency", type=int, default=4)
+
+    commands.add_parser("stats", help="questions per technology, kind and level")
+
+    sample_parser = commands.add_parser("sample", help="pick a few questions like the agent would")
+    sample_parser.add_argument("--tech", required=True)
+    sample_parser.add_argument("--difficulty", default="beginner", choices=LEVELS)
+    sample_parser.add_argument("--kind", default="followup", choices=KINDS)
+    sample_parser.add_argument("-n", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        from dotenv import load_dotenv
+        load_dotenv()
+        added = asyncio.run(build(
+            args.path,
+            parse_tech_stack(args.tech),
+            count=args.count,
+            levels=parse_tech_stack(args.levels),
+            concurrency=args.concurrency,
+        ))
+        print(f"Added {added} questions to {args.path}")
+    elif args.command == "stats":
+        print(json.dumps(QuestionBank(args.path).stats(), indent=2))
+    else:
+        bank = QuestionBank(args.path)
+        technologies = parse_tech_stack(args.tech)
+        for i in range(args.n):
+            print(bank.pick("sample", technologies, args.difficulty, args.kind, rotation=i))
+
+
+if __name__ == "__main__":
+    main()
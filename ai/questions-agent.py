@@ -4,228 +4,128 @@ An agent to create questions based on chosen tech stack.
 
 import os
 import uuid
+import functools
 from dotenv import load_dotenv
 load_dotenv()
 
-os.environ["GROQ_API_KEY"] = os.getenv("GROQ_API_KEY")
-# os.environ["OPENAI_API_KEY"] = os.getenv("OPENAI_API_KEY")
-
-
-from langchain_groq import ChatGroq
-from langchain_core.messages import HumanMessage, AIMessage, BaseMessage
-from langchain_core.runnables.history import RunnableWithMessageHistory
-from langchain_community.chat_message_histories import FileChatMessageHistory
-from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_openai import ChatOpenAI
-
-llm = ChatGroq(
-model="moonshotai/kimi-k2-instruct",
-temperature=0.3,
-max_retries=2
-)
-# llm = ChatOpenAI(
-# model="gpt-3.5-turbo-0125",
-# temperature=0.3,
-# max_retries=2
-# )
-
-# llm = ChatGoogleGenerativeAI(
-#     model="gemini-2.5-flash",
-#     temperature=0.3,
-#     max_retries=2,
-# )
-
-interview_prompt = ChatPromptTemplate.from_messages(
-    [
-        (
-            "system", """
-            You are an experienced technical interviewer conducting a interview for a {position} role.
-
-            You will ask maximum 5 questions around candidate's preferred tech stack : {tech_stack}
-
-            Your role as an interviewer:
-            1. Ask ONE question at a time and wait for candidates response
-            2. Start with Basics and graudally increase difficulty
-            3. Ask follow-up questions based on candidates previous response
-            4. Probe deeper when answerd are imcomplete or need more clarification
-            5. Cover both theorotical knowledge or practicle implementation,
-            6. Ask about real world probllem scenarios and their probable solutions
-            7. Be encouraging through your questionning
-            8. Keep track of covered topics and explore uncovered topics
-
-            Interview Guidelines:
-            - Begin with warm introduction and basic questioning
-            - Progress through: basics → intermediate → advanced (only if they show competency)
-            - If candidate struggles with basics, stay at that level and provide guidance
-            - Adapt questions based on demonstrated knowledge level
-            - When candidate says "I don't know", offer hints or redirect to related simpler topics
-            - Keep questions focused and specific
-            - Maintain an empathetic, professional, and encouraging tone
-            - Always reference their previous response to show you're listening
-
-
-            Examples:
-            -----------------------------------------------------------------------
-            
-            
-            Example One : 
-
-            [System]
-            Hi, thanks for joining today’s interview. Since you have experience with Next.js, Node.js, and PostgreSQL, let’s start with something simple —  
-            Can you explain how Next.js handles server-side rendering (SSR) and how it differs from static site generation (SSG)?
-
-            [Candidate]
-            SSR renders the page on each request at runtime, SSG builds it at build time...
-
-            [System]
-            That’s correct. In SSR, rendering happens per request, while SSG pre-builds pages.  
-            Follow-up: If your SSR endpoint has heavy data fetching, how would you optimize the response time?
+# Provider packages and most of LangChain are imported on first use (see providers.py),
+# so importing this module and showing the first question stay fast
+import providers
+from prompts import STATIC_SYSTEM_TEMPLATE, SESSION_CONTEXT_TEMPLATE, CONVERSATION_SUMMARY_TEMPLATE
+from context_window import ContextWindow, LLMSummarizer
+from session_store import InMemorySessionStore
+from answer_filter import AnswerFilter
 
-            [Candidate]
-            I’d use caching, like Redis...
+def get_llm():
+    """
+    Process-wide chat model; select another backend with LLM_PROVIDER=openai / google,
+    or route across several with LLM_ROUTE=groq,openai
+    """
+    from llm_clients import get_default_llm
+    return get_default_llm()
 
-            [System]
-            Good. Now moving deeper — Suppose you have a high-traffic app with a PostgreSQL database. You notice slow queries.  
-            Walk me through a practical approach to identify and fix the issue.
 
-            [Candidate]
-            I’d start with EXPLAIN ANALYZE...
+@functools.lru_cache(maxsize=1)
+def interview_prompt():
+    from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+    return ChatPromptTemplate.from_messages(
+        [
+            # Byte-identical prefix shared with InterviewAgent.py, then the per-session context
+            ("system", STATIC_SYSTEM_TEMPLATE),
+            ("system", SESSION_CONTEXT_TEMPLATE),
+            ("system", CONVERSATION_SUMMARY_TEMPLATE),
+            MessagesPlaceholder(variable_name="messages"),
+        ]
+    ).partial(max_questions="5")
 
-            [System]
-            Great. Since you’ve shown strong fundamentals, let’s get more advanced:  
-            If your Next.js app needed real-time data updates from PostgreSQL, how would you implement it efficiently?
 
+# "sqlite" (default): one WAL database shared by every session, indexed by session and turn
+# "jsonl": one append-only log per session
+HISTORY_BACKEND = os.getenv("CHAT_HISTORY_BACKEND", "sqlite")
 
-            
-            
-            
-            Example Two:
-
-            [System]
-            Welcome! Let’s start with the basics:  
-            In Node.js, what’s the difference between synchronous and asynchronous operations?
 
-            [Candidate]
-            Async is non-blocking, sync is blocking...
+@functools.lru_cache(maxsize=1)
+def transcript_logs():
+    from transcript_log import TranscriptLogWriter
+    return TranscriptLogWriter("interviews")
 
-            [System]
-            That’s right. Can you give me an example in code where asynchronous processing would be essential?
 
-            [Candidate]
-            Maybe file reading...
+def get_history(session_id):
+    if HISTORY_BACKEND == "jsonl":
+        from transcript_log import JsonlChatMessageHistory
+        return JsonlChatMessageHistory(session_id, transcript_logs())
+    from sqlite_history import SQLiteChatMessageHistory, SQLiteMessageStore
+    return SQLiteChatMessageHistory(session_id, SQLiteMessageStore.shared("interviews/chat_history.db"))
 
-            [System]
-            Good. Let’s move forward — In MongoDB, how would you design a schema for storing user posts and comments?
-
-            [Candidate]
-            I’d use embedded documents for comments...
-
-            [System]
-            That’s a reasonable choice. Why embedded instead of referencing?
-
-            [Candidate]
-            Hmm... I’m not sure.
-
-            [System]
-            That’s okay. Embedding reduces the need for joins, but can increase document size.  
-            Now, suppose you need to fetch posts along with comments but also filter by recent comments. How would you query that in MongoDB?
-
-
-            
-            
-            Example Three:
-
-            [System]
-            Hi, let’s start easy:  
-            What is the difference between a class component and a functional component in React?
-
-            [Candidate]
-            I don’t know...
-
-            [System]
-            No problem — Class components are older, use `this.state`, while functional ones use hooks like `useState`.  
-            Can you tell me what a React hook is?
-
-            [Candidate]
-            Is it like a function?
-
-            [System]
-            Yes, it’s a special function to manage state or lifecycle in functional components.  
-            Here’s an example: `useEffect` runs code after rendering.  
-            Now, can you give me a case where `useEffect` might be used?
-
-            
-            
-            
-            Example Four :
-
-            [System]
-            How would you configure a Kubernetes deployment to auto-scale based on CPU usage?
-
-            [Candidate]
-            I don’t know.
-
-            [System]
-            Alright, here’s a hint — Kubernetes has something called HPA. Do you know what HPA stands for?
-
-            [Candidate]
-            No.
-
-            [System]
-            It’s Horizontal Pod Autoscaler. It automatically adjusts pod count based on CPU/memory usage.  
-            Let’s try something simpler: Can you tell me what a Kubernetes pod is?
-
-            
-            
-            
-            
-            Example Five:
-
-            [System]
-            Can you explain how Spark processes data across a cluster?
-
-            [Candidate]
-            It splits data and processes it in parallel.
-
-            [System]
-            That’s a good start — Can you walk me through what happens after Spark splits the data? For example, how does it track progress or handle failures?
-
-            [Candidate]
-            Not sure.
-
-            [System]
-            No worries — Spark uses DAG scheduling, keeps track of transformations, and can recompute lost partitions from lineage.  
-            Now, if one node fails mid-job, what happens?
-
-
-
-            -----------------------------------------------------------------------
-
-
-            Current interview session : Focus on {tech_stack} technologies
-            Interview Style : Professional, emphathatic, encouraging and thorough  
-
-            Remember : You are evaluating technical competency, problem solving skilss and in depth understaning of chosen tech stack.
-            """
-
-        ),
-        MessagesPlaceholder(variable_name="messages"),
-    ]
-)
-
-
-def get_history(session_id)->FileChatMessageHistory:
-    return FileChatMessageHistory(f"interviews/{session_id}.json")
-
-
-os.makedirs("interviews",exist_ok=True )
 
 class TechInterviewer:
-    def __init__(self):
-        self.llm = llm
-        self.session_data={}
+    def __init__(self, session_store=None, llm=None, context_window=None, metrics=None, answer_filter=None):
+        # Only plain, serializable session data lives here so it can be spilled to disk
+        self.session_data = session_store if session_store is not None else InMemorySessionStore()
+        # Built on first use (see the properties below)
+        self._llm = llm
+        self._context_window = context_window
+        self._metrics = metrics
+        self._interview_chain = None
+        # Non-answers get a templated reply instead of an LLM call (answer_filter.py); False disables
+        self.answer_filter = AnswerFilter() if answer_filter is None else answer_filter or None
+        if metrics is not None:
+            self._register_answer_filter()
+
+    @property
+    def llm(self):
+        if self._llm is None:
+            self._llm = get_llm()
+        return self._llm
+
+    @property
+    def context_window(self):
+        # Stored history is replayed within a token budget; older turns are folded into a cached summary
+        if self._context_window is None:
+            self._context_window = ContextWindow(summarizer=LLMSummarizer(self.llm, metrics=self.metrics))
+        return self._context_window
+
+    @property
+    def metrics(self):
+        if self._metrics is None:
+            from llm_metrics import metrics
+            self._metrics = metrics
+            self._register_answer_filter()
+        return self._metrics
+
+    def _register_answer_filter(self):
+        if self.answer_filter is not None:
+            self._metrics.add_collector("answer_filter", self.answer_filter.metric_samples)
+
+    @property
+    def interview_chain(self):
+        if self._interview_chain is None:
+            from langchain_core.runnables import RunnableLambda
+            from langchain_core.runnables.history import RunnableWithMessageHistory
+
+            # History is looked up per session_id at call time, so one chain serves every session
+            self._interview_chain = RunnableWithMessageHistory(
+                RunnableLambda(self._fit_context, afunc=self._afit_context) | interview_prompt() | self.llm,
+                get_history,
+                input_messages_key="messages",
+                # Separate key: sharing "messages" made the stored history overwrite the new answer
+                history_messages_key="history"
+            )
+        return self._interview_chain
+
+    def _fit_context(self, inputs, config):
+        # Not the chain's config: its callbacks track the question call, the summary update is tracked on its own
+        session_id = config["configurable"]["session_id"]
+        conversation = inputs["history"] + inputs["messages"]
+        summary, recent = self.context_window.fit(session_id, conversation, {"metadata": {"session_id": session_id}})
+        return {**inputs, "messages": recent, "conversation_summary": summary or "(nothing yet)"}
 
+    async def _afit_context(self, inputs, config):
+        session_id = config["configurable"]["session_id"]
+        conversation = inputs["history"] + inputs["messages"]
+        summary, recent = await self.context_window.afit(session_id, conversation,
+                                                         {"metadata": {"session_id": session_id}})
+        return {**inputs, "messages": recent, "conversation_summary": summary or "(nothing yet)"}
 
 
     def start_interview(self,tech_stack:str,position:str='Software Developer'):
@@ -241,16 +141,8 @@ class TechInterviewer:
             "questions_asked":0,
             "difficulty_level": " beginner"
         }
-        interview_chain = interview_prompt | self.llm
-
-        with_message_history = RunnableWithMessageHistory(
-            interview_chain,
-            get_history,
-            input_messages_key="messages",
-            history_messages_key="messages"
-        )
-
-        self.session_data[session_id]["interview_chain"] = with_message_history
+        if HISTORY_BACKEND == "jsonl":
+            transcript_logs().start_session(session_id, {"tech_stack": tech_stack, "position": position})
 
          # Start the interview
         initial_message = f"""Hello! 
@@ -268,7 +160,8 @@ class TechInterviewer:
         print("="*80)
         print(f"\n🎤 Interviewer: {initial_message}")
         
-        return session_id, with_message_history
+        # The chain (and the provider import behind it) is built after the first question is shown
+        return session_id, self.interview_chain
 
 
     def ask_question(self,session_id, with_message_history,answer):
@@ -280,32 +173,71 @@ class TechInterviewer:
         session_info = self.session_data[session_id]
 
 
-        with_message_history = session_info["interview_chain"]
+        with_message_history = self.interview_chain
         
         # Don't proceed if answer is too short or generic
         if not answer or len(answer.strip()) < 2:
             return "I'd love to hear more from you! Please share your thoughts or let me know if you need clarification on the question." 
 
-        try:
-            response = with_message_history.invoke(
-                {
-                    "messages": [HumanMessage(content=answer)],
-                    "tech_stack": session_info["tech_stack"],
-                    "position":session_info["position"]
-                },
-                config={"configurable": {"session_id": session_id}},
-            )
-            session_info["questions_asked"] += 1
-            session_info["current_question_index"] += 1
+        if self.answer_filter is not None:
+            # The opening question is not in session_info["questions"]; the filter then works without it
+            question = session_info["questions"][-1] if session_info["questions"] else ""
+            verdict = self.answer_filter.check(answer, question, session_info["tech_stack"], session_id)
+            if verdict is not None:
+                from langchain_core.messages import AIMessage, HumanMessage
+                # Kept in the history, marked filtered like InterviewAgent's turns; the question stays open
+                get_history(session_id).add_messages([
+                    HumanMessage(content=answer, additional_kwargs={"filtered": True}),
+                    AIMessage(content=verdict.reply, additional_kwargs={"filtered": True}),
+                ])
+                return verdict.reply
+
+        from langchain_core.messages import HumanMessage
+
+        with self.metrics.track("next_question", session_id) as call:
+            try:
+                response = with_message_history.invoke(
+                    {
+                        "messages": [HumanMessage(content=answer)],
+                        "tech_stack": session_info["tech_stack"],
+                        "position":session_info["position"]
+                    },
+                    config={"configurable": {"session_id": session_id}, "callbacks": [call]},
+                )
+            except Exception as e:
+                # No question is served in its place: a failed call, not a fallback
+                call.failed = True
+                return f"An error occurred during interview : {str(e)}"
+
+        session_info["questions_asked"] += 1
+        session_info["current_question_index"] += 1
+
+        session_info["questions"].append(response.content)
+        self.session_data[session_id] = session_info
+
+        if session_info["questions_asked"] >= 5:
+            return "🏁 That's all for now! Type 'summary' to see a recap, or 'exit' to finish."
+        return response.content
+            
+    def save_transcript(self, session_id):
+        """Export the session as interviews/{session_id}.json for InterviewEvaluator"""
+        from langchain_core.messages import message_to_dict
+        from transcript_log import message_to_turn, write_transcript
 
-            session_info["questions"].append(response.content)
+        session_info = self.session_data[session_id]
+        messages = get_history(session_id).messages
+        return write_transcript(
+            {
+                "tech_stack": session_info["tech_stack"],
+                "position": session_info["position"],
+                "question_count": session_info["questions_asked"],
+                "difficulty": session_info["difficulty_level"].strip(),
+                "conversation_history": [message_to_turn(message_to_dict(m)) for m in messages],
+                "is_complete": session_info["questions_asked"] >= 5,
+            },
+            f"interviews/{session_id}.json",
+        )
 
-            if session_info["questions_asked"] >= 5:
-                return "🏁 That's all for now! Type 'summary' to see a recap, or 'exit' to finish."
-            return response.content
-        except Exception as e:
-            return f"An error occurred during interview : {str(e)}"
-            
     def get_session_summary(self,session_id):
         """ Get interview session summary"""
 
@@ -326,7 +258,11 @@ class TechInterviewer:
 
 
 def main():
+    # Import the provider in the background while the candidate fills in the setup
+    providers.preload()
     interviewer = TechInterviewer()
+    if os.getenv("LLM_METRICS_PORT"):
+        interviewer.metrics.serve(int(os.getenv("LLM_METRICS_PORT")))
 
     print("🎯 Welcome to the Tech Stack Interview Simulator!")
     print("This AI will conduct a technical interview based on your chosen tech stack.\n")
@@ -360,6 +296,8 @@ def main():
         if answer.lower() == 'exit':
             print("\n🏁 Interview Ended")
             print(interviewer.get_session_summary(session_id))
+            interviewer.save_transcript(session_id)
+            transcript_logs().close()
             print("\nThank you for participating! Your interview has been saved.")
             break
         elif answer.lower() == 'summary':
@@ -0,0 +1,148 @@
+"""
+Semantic cache for generated interview questions.
+
+Many candidates pick the same stack and give near-identical answers to the
+fixed opening question, yet every turn paid for a full LLM generation. The
+cache is keyed on the interview state that shapes the next question
+(position, tech stack, difficulty, question number). Within a key, the recent
+conversation (last question, candidate answer) is compared part by part by
+cosine similarity of local embeddings (text_features.embed). The stored
+question of the nearest match whose every part clears `threshold` is reused;
+comparing parts separately keeps a long shared question from making "yes" and
+"no" look alike.
+
+Opt in per interviewer:
+
+    interviewer = TechInterviewer(response_cache=SemanticResponseCache())
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from session_models import parse_tech_stack
+from text_features import cosine, embed
+
+
+class _Entry:
+    __slots__ = ("key", "vector", "response", "created")
+
+    def __init__(self, key, vector, response, created):
+        self.key = key
+        self.vector = vector
+        self.response = response
+        self.created = created
+
+
+class SemanticResponseCache:
+    """
+    Args:
+        threshold (float): Minimum cosine similarity of every text part for a hit.
+        max_entries (int): Entries kept overall (least recently used are evicted).
+        ttl_seconds (float): Entries older than this are never served.
+        max_per_key (int): Entries kept per exact key, bounding each nearest-neighbour scan.
+    """
+
+    def __init__(self, threshold=0.85, max_entries=5000, ttl_seconds=3600, max_per_key=64, clock=time.monotonic):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_per_key = max_per_key
+        self._clock = clock
+        self._entries = OrderedDict()      # entry id -> _Entry, least recently used first
+        self._by_key = {}                  # key -> [entry id, ...] oldest first
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def make_key(position, tech_stack, difficulty, question_number):
+        """Order- and case-insensitive for the tech stack, so "React, Python" == "python,react" """
+        stack = tuple(sorted(tech.lower() for tech in parse_tech_stack(tech_stack)))
+        return (position.strip().lower(), stack, difficulty, question_number)
+
+    def lookup(self, key, texts):
+        """Cached response for the most similar texts under `key`, or None"""
+        vector = self._embed(texts)
+        now = self._clock()
+        with self._lock:
+            best_id, best_score = None, self.threshold
+            for entry_id in list(self._by_key.get(key, ())):
+                entry = self._entries[entry_id]
+                if now - entry.created > self.ttl_seconds:
+                    self._remove(entry_id)
+                    self.expirations += 1
+                    continue
+                score = min(cosine(part, stored) for part, stored in zip(vector, entry.vector))
+                if score >= best_score:
+                    best_id, best_score = entry_id, score
+            if best_id is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(best_id)
+            self.hits += 1
+            return self._entries[best_id].response
+
+    def store(self, key, texts, response):
+        vector = self._embed(texts)
+        with self._lock:
+            entry_id = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = _Entry(key, vector, response, self._clock())
+            ids = self._by_key.setdefault(key, [])
+            ids.append(entry_id)
+            if len(ids) > self.max_per_key:
+                self._remove(ids[0])
+                self.evictions += 1
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_key.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "keys": len(self._by_key),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    def metric_samples(self):
+        """Samples for LLMMetrics.add_collector"""
+        stats = self.stats()
+        return [
+            ("response_cache_entries", "gauge", "Cached next questions", {}, stats["entries"]),
+            ("response_cache_hits_total", "counter", "Questions served from the cache", {}, stats["hits"]),
+            ("response_cache_misses_total", "counter", "Lookups that fell through to the LLM", {}, stats["misses"]),
+            ("response_cache_evictions_total", "counter", "Entries evicted for size", {}, stats["evictions"]),
+            ("response_cache_expirations_total", "counter", "Entries dropped after their TTL", {},
+             stats["expirations"]),
+        ]
+
+    @staticmethod
+    def _embed(texts):
+        if isinstance(texts, str):
+            texts = (texts,)
+        return tuple(embed(text) for text in texts)
+
+    def _remove(self, entry_id):
+        entry = self._entries.pop(entry_id)
+        ids = self._by_key[entry.key]
+        ids.remove(entry_id)
+        if not ids:
+            del self._by_key[entry.key]
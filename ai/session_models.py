@@ -0,0 +1,123 @@
+"""
+Compact in-memory records for interview sessions.
+
+A resident session used to be a dict holding a list of {"role", "content"} dicts,
+with the tech stack re-split on every prompt build. InterviewSession and Turn use
+__slots__ (no per-instance __dict__), share the two Role members instead of
+storing role strings, and parse the tech stack once. to_dict()/from_dict() keep
+the JSON shape written by the CLI `save` command and read by InterviewEvaluator.
+"""
+
+import json
+from enum import Enum
+
+
+class Role(str, Enum):
+    interviewer = "interviewer"
+    candidate = "candidate"
+
+
+def parse_tech_stack(tech_stack):
+    """Split a comma-separated tech stack into a tuple of technology names"""
+    return tuple(tech.strip() for tech in tech_stack.split(",") if tech.strip())
+
+
+class Turn:
+    """
+    One message of the interview conversation. `filtered` marks a non-answer
+    caught by the answer filter and the local reply to it: part of the
+    transcript, but not an answered question.
+    """
+
+    __slots__ = ("role", "content", "filtered")
+
+    def __init__(self, role, content, filtered=False):
+        self.role = Role(role)
+        self.content = content
+        self.filtered = filtered
+
+    def to_dict(self):
+        data = {"role": self.role.value, "content": self.content}
+        if self.filtered:
+            data["filtered"] = True
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["role"], data["content"], data.get("filtered", False))
+
+    def __eq__(self, other):
+        return (isinstance(other, Turn) and self.role is other.role and self.content == other.content
+                and self.filtered == other.filtered)
+
+    def __repr__(self):
+        return f"Turn({self.role.value!r}, {self.content[:40]!r})"
+
+
+class InterviewSession:
+    """State of one interview run by TechInterviewer"""
+
+    __slots__ = (
+        "tech_stack",
+        "technologies",
+        "position",
+        "question_count",
+        "difficulty",
+        "conversation_history",
+        "is_complete",
+    )
+
+    def __init__(self, tech_stack, position, question_count=0, difficulty="beginner",
+                 conversation_history=None, is_complete=False):
+        self.tech_stack = tech_stack
+        self.technologies = parse_tech_stack(tech_stack)
+        self.position = position
+        self.question_count = question_count
+        self.difficulty = difficulty
+        self.conversation_history = conversation_history if conversation_history is not None else []
+        self.is_complete = is_complete
+
+    @property
+    def primary_technology(self):
+        """First technology of the stack, used for opening and fallback questions"""
+        return self.technologies[0] if self.technologies else self.tech_stack.strip()
+
+    def add_turn(self, role, content, filtered=False):
+        self.conversation_history.append(Turn(role, content, filtered))
+
+    def open_question(self):
+        """The last question asked, skipping the replies to filtered non-answers"""
+        return next((turn.content for turn in reversed(self.conversation_history)
+                     if turn.role is Role.interviewer and not turn.filtered), "")
+
+    def to_dict(self):
+        """Plain dict in the saved-interview JSON format"""
+        return {
+            "tech_stack": self.tech_stack,
+            "position": self.position,
+            "question_count": self.question_count,
+            "difficulty": self.difficulty,
+            "conversation_history": [turn.to_dict() for turn in self.conversation_history],
+            "is_complete": self.is_complete,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            tech_stack=data["tech_stack"],
+            position=data["position"],
+            question_count=data.get("question_count", 0),
+            difficulty=data.get("difficulty", "beginner"),
+            conversation_history=[Turn.from_dict(turn) for turn in data.get("conversation_history", [])],
+            is_complete=data.get("is_complete", False),
+        )
+
+    @staticmethod
+    def dumps(session):
+        """Serializer for SQLiteSessionStore(dumps=...)"""
+        return json.dumps(session.to_dict())
+
+    @classmethod
+    def loads(cls, data):
+        """Deserializer for SQLiteSessionStore(loads=...)"""
+        return cls.from_dict(json.loads(data))
@@ -0,0 +1,252 @@
+"""
+Bounded storage for interview sessions.
+
+TechInterviewer used to keep every session in a plain dict forever. A SessionStore
+keeps the same mapping interface (`in`, `[]`, `[]=`) but lets a long-running
+worker bound its memory:
+
+- InMemorySessionStore: LRU + idle-TTL eviction. Evicted sessions are dropped, or
+  spilled to another store (e.g. SQLite) and rehydrated on the next access.
+- SQLiteSessionStore: every session serialized to a single SQLite file.
+
+Sessions returned by a store may be copies, so callers write a session back
+(`store[session_id] = session`) after mutating it.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+
+class SessionStore(ABC):
+    """Mapping-like store of interview sessions keyed by session id"""
+
+    @abstractmethod
+    def get(self, session_id, default=None):
+        """Return the session, or default if it is unknown"""
+
+    @abstractmethod
+    def put(self, session_id, session):
+        """Insert or replace a session"""
+
+    @abstractmethod
+    def delete(self, session_id):
+        """Remove a session if present"""
+
+    @abstractmethod
+    def __contains__(self, session_id):
+        ...
+
+    @abstractmethod
+    def __len__(self):
+        ...
+
+    @abstractmethod
+    def stats(self):
+        """Counters describing the store (resident sessions, evictions, ...)"""
+
+    def __getitem__(self, session_id):
+        session = self.get(session_id)
+        if session is None:
+            raise KeyError(session_id)
+        return session
+
+    def __setitem__(self, session_id, session):
+        self.put(session_id, session)
+
+    def __delitem__(self, session_id):
+        self.delete(session_id)
+
+
+class InMemorySessionStore(SessionStore):
+    """
+    In-process LRU store with idle expiry.
+
+    Args:
+        max_sessions (int): Resident sessions kept before the least recently used one is evicted.
+        ttl_seconds (float | None): Idle time after which a session is evicted. None disables expiry.
+        spill_store (SessionStore | None): Where evicted sessions go. When set, an evicted
+            session is rehydrated transparently on its next access; otherwise it is dropped.
+    """
+
+    def __init__(self, max_sessions=1000, ttl_seconds=2 * 60 * 60, spill_store=None, clock=time.monotonic):
+        if max_sessions < 1:
+            raise ValueError("max_sessions must be at least 1")
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self.spill_store = spill_store
+        self._clock = clock
+        self._lock = threading.RLock()
+        # session_id -> [session, last_access]; ordered from least to most recently used
+        self._sessions = OrderedDict()
+
+        self.evictions = 0
+        self.expirations = 0
+        self.rehydrations = 0
+
+    def get(self, session_id, default=None):
+        with self._lock:
+            now = self._clock()
+            self._expire(now)
+
+            entry = self._sessions.get(session_id)
+            if entry is not None:
+                entry[1] = now
+                self._sessions.move_to_end(session_id)
+                return entry[0]
+
+            if self.spill_store is None:
+                return default
+
+            session = self.spill_store.get(session_id)
+            if session is None:
+                return default
+
+            self.spill_store.delete(session_id)
+            self.rehydrations += 1
+            self._insert(session_id, session, now)
+            return session
+
+    def put(self, session_id, session):
+        with self._lock:
+            now = self._clock()
+            self._expire(now)
+            self._insert(session_id, session, now)
+
+    def delete(self, session_id):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+            if self.spill_store is not None:
+                self.spill_store.delete(session_id)
+
+    def __contains__(self, session_id):
+        with self._lock:
+            # Same view as get(): a session past its TTL is not here (unless spilled)
+            self._expire(self._clock())
+            if session_id in self._sessions:
+                return True
+            return self.spill_store is not None and session_id in self.spill_store
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "resident": len(self._sessions),
+                "max_sessions": self.max_sessions,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "rehydrations": self.rehydrations,
+                "spilled": len(self.spill_store) if self.spill_store is not None else 0,
+            }
+
+    def evict_expired(self):
+        """Evict idle sessions now instead of waiting for the next access"""
+        with self._lock:
+            self._expire(self._clock())
+
+    def _insert(self, session_id, session, now):
+        self._sessions[session_id] = [session, now]
+        self._sessions.move_to_end(session_id)
+        while len(self._sessions) > self.max_sessions:
+            oldest_id, (oldest, _) = self._sessions.popitem(last=False)
+            self.evictions += 1
+            self._spill(oldest_id, oldest)
+
+    def _expire(self, now):
+        if self.ttl_seconds is None:
+            return
+        deadline = now - self.ttl_seconds
+        # Access order means the idle sessions are all at the front
+        while self._sessions:
+            session_id, (session, last_access) = next(iter(self._sessions.items()))
+            if last_access > deadline:
+                break
+            del self._sessions[session_id]
+            self.expirations += 1
+            self._spill(session_id, session)
+
+    def _spill(self, session_id, session):
+        if self.spill_store is not None:
+            self.spill_store.put(session_id, session)
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    Sessions persisted as JSON rows in a single SQLite file.
+
+    Every get() decodes a fresh copy, so nothing stays resident in memory.
+
+    Args:
+        path (str): Database file; ":memory:" keeps it in-process.
+        dumps / loads: Session (de)serializers, JSON by default.
+    """
+
+    def __init__(self, path="interviews/sessions.db", dumps=json.dumps, loads=json.loads):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._dumps = dumps
+        self._loads = loads
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                " session_id TEXT PRIMARY KEY,"
+                " data TEXT NOT NULL,"
+                " updated_at REAL NOT NULL)"
+            )
+
+        self.reads = 0
+        self.writes = 0
+
+    def get(self, session_id, default=None):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+            self.reads += 1
+        return self._loads(row[0]) if row is not None else default
+
+    def put(self, session_id, session):
+        data = self._dumps(session)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sessions (session_id, data, updated_at) VALUES (?, ?, ?)",
+                (session_id, data, time.time()),
+            )
+            self.writes += 1
+
+    def delete(self, session_id):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+
+    def purge_older_than(self, seconds):
+        """Delete sessions not written for `seconds`; returns how many were removed"""
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "DELETE FROM sessions WHERE updated_at < ?", (time.time() - seconds,)
+            )
+            return cursor.rowcount
+
+    def __contains__(self, session_id):
+        with self._lock:
+            return self._conn.execute(
+                "SELECT 1 FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone() is not None
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    def stats(self):
+        return {"resident": 0, "stored": len(self), "reads": self.reads, "writes": self.writes}
+
+    def close(self):
+        self._conn.close()
@@ -0,0 +1,182 @@
+"""
+SQLite-backed chat message history for questions-agent.
+
+All sessions of a process share one WAL-mode database and a small connection pool,
+instead of one JSON file per interview. Messages are keyed by (session_id, seq)
+and indexed by (session_id, turn), where a turn starts with each candidate
+(human) message. That lets the agent read only the last K turns of a long
+interview and query across sessions without loading whole conversations.
+"""
+
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from langchain_core.chat_history import BaseChatMessageHistory
+from langchain_core.messages import message_to_dict, messages_from_dict
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    session_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    turn INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    message TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (session_id, seq)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_messages_session_turn ON messages (session_id, turn);
+"""
+
+
+class SQLiteMessageStore:
+    """
+    Message table shared by every session in the process.
+
+    Args:
+        path (str): Database file.
+        pool_size (int): Maximum pooled connections; callers block when all are in use.
+    """
+
+    _shared = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, path="interviews/chat_history.db", pool_size=4):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.pool_size = pool_size
+        self._pool = queue.LifoQueue()
+        self._created = 0
+        self._pool_lock = threading.Lock()
+
+        with self._connection() as conn:
+            conn.executescript(_SCHEMA)
+
+    @classmethod
+    def shared(cls, path="interviews/chat_history.db", pool_size=4):
+        """Process-wide store for a database path, created on first use"""
+        key = os.path.abspath(path)
+        with cls._shared_lock:
+            store = cls._shared.get(key)
+            if store is None:
+                store = cls._shared[key] = cls(path, pool_size)
+            return store
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @contextmanager
+    def _connection(self):
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            with self._pool_lock:
+                create = self._created < self.pool_size
+                if create:
+                    self._created += 1
+            conn = self._connect() if create else self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    def append(self, session_id, messages):
+        """Insert messages for a session in one transaction"""
+        if not messages:
+            return
+        with self._connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                seq, turn = conn.execute(
+                    "SELECT COALESCE(MAX(seq), -1), COALESCE(MAX(turn), 0) FROM messages WHERE session_id = ?",
+                    (session_id,),
+                ).fetchone()
+                now = time.time()
+                rows = []
+                for message in messages:
+                    seq += 1
+                    if message.type == "human":
+                        turn += 1
+                    rows.append((session_id, seq, turn, message.type, json.dumps(message_to_dict(message)), now))
+                conn.executemany(
+                    "INSERT INTO messages (session_id, seq, turn, type, message, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def read(self, session_id, last_turns=None):
+        """Messages of a session in order, optionally only the last `last_turns` turns"""
+        with self._connection() as conn:
+            if last_turns is None:
+                rows = conn.execute(
+                    "SELECT message FROM messages WHERE session_id = ? ORDER BY seq", (session_id,)
+                ).fetchall()
+            else:
+                rows = conn.execute(
+                    "SELECT message FROM messages"
+                    " WHERE session_id = ?"
+                    " AND turn > (SELECT COALESCE(MAX(turn), 0) FROM messages WHERE session_id = ?) - ?"
+                    " ORDER BY seq",
+                    (session_id, session_id, last_turns),
+                ).fetchall()
+        return messages_from_dict([json.loads(row[0]) for row in rows])
+
+    def turn_count(self, session_id):
+        with self._connection() as conn:
+            return conn.execute(
+                "SELECT COALESCE(MAX(turn), 0) FROM messages WHERE session_id = ?", (session_id,)
+            ).fetchone()[0]
+
+    def sessions(self):
+        """Session ids with their message counts"""
+        with self._connection() as conn:
+            return dict(conn.execute("SELECT session_id, COUNT(*) FROM messages GROUP BY session_id").fetchall())
+
+    def delete(self, session_id):
+        with self._connection() as conn:
+            conn.execute("DELETE FROM messages WHERE session_id = ?", (session_id,))
+
+    def close(self):
+        with self._pool_lock:
+            while True:
+                try:
+                    self._pool.get_nowait().close()
+                except queue.Empty:
+                    break
+            self._created = 0
+
+
+class SQLiteChatMessageHistory(BaseChatMessageHistory):
+    """
+    BaseChatMessageHistory over a SQLiteMessageStore.
+
+    Args:
+        session_id (str): Interview session id.
+        store (SQLiteMessageStore | None): Defaults to the process-wide store.
+        last_k_turns (int | None): When set, `messages` only returns the last K turns.
+    """
+
+    def __init__(self, session_id, store=None, last_k_turns=None):
+        self.session_id = session_id
+        self.store = store if store is not None else SQLiteMessageStore.shared()
+        self.last_k_turns = last_k_turns
+
+    @property
+    def messages(self):
+        return self.store.read(self.session_id, self.last_k_turns)
+
+    def add_messages(self, messages):
+        self.store.append(self.session_id, list(messages))
+
+    def clear(self):
+        self.store.delete(self.session_id)
@@ -0,0 +1,60 @@
+"""
+Cheap local text embeddings for similarity lookups (no model, no network).
+
+Texts are mapped to sparse, L2-normalised vectors of hashed word unigrams and
+character trigrams. That is crude next to a sentence-embedding model, but it
+is deterministic, dependency-free and takes microseconds, which is what a
+cache in front of an LLM call needs: near-identical answers ("I don't know",
+"I have 3 years of Python...") land close together, unrelated ones don't.
+"""
+
+import functools
+import math
+import re
+import zlib
+
+DIMENSIONS = 1 << 18
+
+# Words keep inner dots and +/# ("node.js", "c++", "c#") but not sentence punctuation
+_WORD = re.compile(r"[a-z0-9+#]+(?:\.[a-z0-9+#]+)*")
+
+
+def _bucket(feature):
+    # crc32 rather than hash(): stable across processes (PYTHONHASHSEED)
+    return zlib.crc32(feature.encode("utf-8")) % DIMENSIONS
+
+
+def normalize_text(text):
+    # Drop apostrophes first so "don't" and "dont" normalise the same
+    return " ".join(_WORD.findall(text.lower().replace("'", "").replace("\u2019", "")))
+
+
+@functools.lru_cache(maxsize=4096)
+def embed(text, char_ngram=3, word_weight=1.0, char_weight=0.5):
+    """
+    Sparse unit vector {bucket: weight} for a text; {} for empty text.
+
+    Results are memoised (the same question text is embedded on every turn of
+    every session that saw it), so treat the returned dict as read-only.
+    """
+    normalized = normalize_text(text)
+    vector = {}
+    for word in normalized.split():
+        index = _bucket("w:" + word)
+        vector[index] = vector.get(index, 0.0) + word_weight
+    padded = f" {normalized} "
+    for i in range(len(padded) - char_ngram + 1):
+        index = _bucket("c:" + padded[i:i + char_ngram])
+        vector[index] = vector.get(index, 0.0) + char_weight
+
+    norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+    if not norm:
+        return {}
+    return {index: weight / norm for index, weight in vector.items()}
+
+
+def cosine(a, b):
+    """Cosine similarity of two vectors from embed()"""
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(weight * b.get(index, 0.0) for index, weight in a.items())
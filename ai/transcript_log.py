@@ -0,0 +1,262 @@
+"""
+Append-only JSONL transcript logs.
+
+Saving an interview used to mean re-serializing the whole session (CLI `save`) or,
+with FileChatMessageHistory, rewriting interviews/{session_id}.json on every
+message. Here each turn is one appended line, and fsync is batched, so a turn
+costs O(1) I/O however long the interview gets. A log file contains:
+
+    {"type": "session", "tech_stack": ..., "position": ..., ...}   header
+    {"type": "turn", "role": "candidate", "content": ...}            InterviewAgent turn
+                                                  (with "filtered": true for a filtered non-answer)
+    {"type": "message", "message": {...}}                            LangChain message
+    {"type": "state", "question_count": ..., "is_complete": ...}     progress update
+
+compact_transcript() / export_transcript() fold a log back into the saved-interview
+JSON shape that InterviewEvaluator.load_transcripts reads. message_to_turn() and
+write_transcript() produce the same file from LangChain messages stored elsewhere
+(e.g. SQLiteChatMessageHistory).
+"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from langchain_core.chat_history import BaseChatMessageHistory
+from langchain_core.messages import message_to_dict, messages_from_dict
+
+
+class JsonlLog:
+    """
+    Append-only JSONL file with batched fsync.
+
+    Args:
+        path (str): Log file, created if missing.
+        fsync_every (int): Records appended before the file is fsync'ed.
+        fsync_interval (float): Seconds after which the next append fsyncs regardless.
+    """
+
+    def __init__(self, path, fsync_every=16, fsync_interval=1.0):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self._file = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def append(self, *records):
+        """Append records as one write; readers see them immediately. False if the log was closed"""
+        data = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+        with self._lock:
+            if self._file.closed:
+                return False
+            self._file.write(data)
+            self._file.flush()
+            self._unsynced += len(records)
+            if (self._unsynced >= self.fsync_every
+                    or time.monotonic() - self._last_sync >= self.fsync_interval):
+                self._sync()
+        return True
+
+    def sync(self):
+        with self._lock:
+            if self._unsynced:
+                self._sync()
+
+    def close(self):
+        with self._lock:
+            if self._file.closed:
+                return
+            if self._unsynced:
+                self._sync()
+            self._file.close()
+
+    def _sync(self):
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+
+def read_jsonl(path):
+    """Yield records from a JSONL log, skipping a torn final line left by a crash"""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.endswith("\n"):
+                break
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def message_to_turn(message):
+    """Saved-interview turn for a LangChain message (human -> candidate, else interviewer)"""
+    role = "candidate" if message["type"] == "human" else "interviewer"
+    turn = {"role": role, "content": message["data"]["content"]}
+    if (message["data"].get("additional_kwargs") or {}).get("filtered"):
+        turn["filtered"] = True
+    return turn
+
+
+def write_transcript(session, json_path):
+    """
+    Write a saved-interview dict as pretty-printed JSON.
+
+    The file is written to a temp path and renamed, so readers never see a
+    half-written export. Returns the JSON path.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(json_path)), exist_ok=True)
+    tmp_path = json_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(session, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, json_path)
+    return json_path
+
+
+def compact_transcript(path):
+    """Replay a transcript log into the saved-interview dict"""
+    session = {
+        "tech_stack": "",
+        "position": "",
+        "question_count": None,
+        "difficulty": "beginner",
+        "conversation_history": [],
+        "is_complete": False,
+    }
+    history = session["conversation_history"]
+
+    for record in read_jsonl(path):
+        kind = record.get("type")
+        if kind == "turn":
+            history.append({key: value for key, value in record.items() if key != "type"})
+        elif kind == "message":
+            history.append(message_to_turn(record["message"]))
+        elif kind in ("session", "state"):
+            session.update({key: value for key, value in record.items() if key != "type"})
+
+    if session["question_count"] is None:
+        session["question_count"] = sum(1 for turn in history
+                                        if turn["role"] == "candidate" and not turn.get("filtered"))
+    return session
+
+
+def export_transcript(log_path, json_path=None):
+    """Compact a transcript log into a JSON file next to it; returns the JSON path"""
+    json_path = json_path or os.path.splitext(log_path)[0] + ".json"
+    return write_transcript(compact_transcript(log_path), json_path)
+
+
+class TranscriptLogWriter:
+    """
+    Per-session JSONL logs under one directory.
+
+    At most `max_open` log files stay open; the least recently written one is
+    synced and closed when the limit is reached.
+    """
+
+    def __init__(self, directory="interviews", max_open=64, fsync_every=16, fsync_interval=1.0):
+        self.directory = directory
+        self.max_open = max_open
+        self._log_options = {"fsync_every": fsync_every, "fsync_interval": fsync_interval}
+        self._logs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def path(self, session_id):
+        return os.path.join(self.directory, f"{session_id}.jsonl")
+
+    def log(self, session_id):
+        """Open (or reuse) the log for a session"""
+        with self._lock:
+            log = self._logs.get(session_id)
+            if log is not None:
+                self._logs.move_to_end(session_id)
+                return log
+            log = JsonlLog(self.path(session_id), **self._log_options)
+            self._logs[session_id] = log
+            while len(self._logs) > self.max_open:
+                _, oldest = self._logs.popitem(last=False)
+                oldest.close()
+            return log
+
+    def _append(self, session_id, *records):
+        # Another thread may evict (and close) the log between log() and append(); then reopen it
+        while not self.log(session_id).append(*records):
+            pass
+
+    def start_session(self, session_id, session):
+        """Write the header and any turns already in the session"""
+        data = session.to_dict() if hasattr(session, "to_dict") else dict(session)
+        history = data.pop("conversation_history", [])
+        self._append(
+            session_id,
+            {"type": "session", **data},
+            *({"type": "turn", **turn} for turn in history),
+        )
+
+    def append_turn(self, session_id, role, content, session=None, filtered=False):
+        """Append one turn, plus the session's progress counters when given"""
+        records = [{"type": "turn", "role": getattr(role, "value", role), "content": content}]
+        if filtered:
+            records[0]["filtered"] = True
+        if session is not None:
+            records.append({
+                "type": "state",
+                "question_count": session.question_count,
+                "difficulty": session.difficulty,
+                "is_complete": session.is_complete,
+            })
+        self._append(session_id, *records)
+
+    def append_messages(self, session_id, messages):
+        self._append(session_id, *({"type": "message", "message": message_to_dict(m)} for m in messages))
+
+    def export(self, session_id, json_path=None):
+        """Sync the session's log and compact it into interviews/{session_id}.json"""
+        self.log(session_id).sync()
+        return export_transcript(self.path(session_id), json_path)
+
+    def close(self, session_id=None):
+        """Close one session's log, or all of them"""
+        with self._lock:
+            if session_id is not None:
+                log = self._logs.pop(session_id, None)
+                logs = [log] if log is not None else []
+            else:
+                logs = list(self._logs.values())
+                self._logs.clear()
+        for log in logs:
+            log.close()
+
+
+class JsonlChatMessageHistory(BaseChatMessageHistory):
+    """
+    Chat history backed by a session's append-only JSONL log.
+
+    Drop-in replacement for FileChatMessageHistory in RunnableWithMessageHistory:
+    adding messages appends lines instead of rewriting the whole file.
+    """
+
+    def __init__(self, session_id, writer):
+        self.session_id = session_id
+        self.writer = writer
+
+    @property
+    def messages(self):
+        path = self.writer.path(self.session_id)
+        if not os.path.exists(path):
+            return []
+        return messages_from_dict(
+            [record["message"] for record in read_jsonl(path) if record.get("type") == "message"]
+        )
+
+    def add_messages(self, messages):
+        self.writer.append_messages(self.session_id, messages)
+
+    def clear(self):
+        self.writer.close(self.session_id)
+        path = self.writer.path(self.session_id)
+        if os.path.exists(path):
+            os.remove(path)